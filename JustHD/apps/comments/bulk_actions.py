@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import transaction
+
+from apps.shared.utils.bulk_jobs import heartbeat
+from .models import Comment
+
+def comment_tree_levels(root_ids):
+    """Ids of the given comments and all their replies, one list per depth."""
+    batch_size = settings.BULK_JOBS['CHILD_BATCH_SIZE']
+    levels = []
+    level = list(root_ids)
+    while level:
+        levels.append(level)
+        level = [
+            pk
+            for start in range(0, len(level), batch_size)
+            for pk in Comment.objects.filter(
+                parent_id__in=level[start:start + batch_size]
+            ).values_list('pk', flat=True)
+        ]
+    return levels
+
+def delete_comment_levels(levels):
+    """
+    Delete comment ids level by level, deepest first, so every batch only
+    removes rows nothing else points at any more.
+    """
+    batch_size = settings.BULK_JOBS['CHILD_BATCH_SIZE']
+    deleted = 0
+    for level in reversed(levels):
+        for start in range(0, len(level), batch_size):
+            with transaction.atomic():
+                deleted += Comment.objects.filter(
+                    pk__in=level[start:start + batch_size]
+                )._raw_delete(Comment.objects.db)
+            heartbeat()
+    return deleted
+
+def delete_replies(ids):
+    delete_comment_levels(comment_tree_levels(ids)[1:])
+
+def activate(ids):
+    return Comment.objects.filter(id__in=ids).update(is_active=True)
+
+def deactivate(ids):
+    return Comment.objects.filter(id__in=ids).update(is_active=False)
+
+def delete(ids):
+    _, deleted = Comment.objects.filter(id__in=ids).delete()
+    return deleted.get(Comment._meta.label, 0)
+
+ACTIONS = {
+    'activate': activate,
+    'deactivate': deactivate,
+    'delete': delete,
+}
+
+# Replies are removed in their own batches before a chunk is deleted.
+PREPARE = {
+    'delete': delete_replies,
+}
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from apps.comments.models import Comment
+from apps.shared.mixins.dynamic_fields import DynamicFieldsMixin
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     user_avatar = serializers.SerializerMethodField()
     replies = serializers.SerializerMethodField()
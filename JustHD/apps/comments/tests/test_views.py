@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from apps.comments.models import Comment
 from apps.movies.models import Movie, Genre
 from django.urls import reverse
+from apps.shared.models import BulkJob
 
 User = get_user_model()
 
@@ -118,4 +119,39 @@ class CommentViewsTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         self.comment.refresh_from_db()
-        self.assertFalse(self.comment.is_active)
\ No newline at end of file
+        self.assertFalse(self.comment.is_active)
+
+class AdminCommentBulkActionViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.movie = Movie.objects.create(
+            title='Test Movie', slug='test-movie', description='Test description',
+            release_year=2023, duration=120
+        )
+        self.url = reverse('admin_comments:comment-bulk-actions')
+
+    def test_delete_removes_reply_threads(self):
+        root = Comment.objects.create(user=self.admin, movie=self.movie, text='Root')
+        reply = Comment.objects.create(user=self.admin, movie=self.movie, text='Reply', parent=root)
+        Comment.objects.create(user=self.admin, movie=self.movie, text='Nested', parent=reply)
+        kept = Comment.objects.create(user=self.admin, movie=self.movie, text='Kept')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'action': 'delete', 'comment_ids': [root.id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(BulkJob.objects.get(uuid=response.data['data']['uuid']).affected, 1)
+        self.assertEqual(list(Comment.objects.all()), [kept])
+
+    def test_deactivate(self):
+        comment = Comment.objects.create(user=self.admin, movie=self.movie, text='Spam')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {'action': 'deactivate', 'comment_ids': [comment.id]}, format='json')
+
+        comment.refresh_from_db()
+        self.assertFalse(comment.is_active)
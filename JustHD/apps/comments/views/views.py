@@ -4,10 +4,23 @@ from rest_framework.filters import OrderingFilter
 
 from ..models import Comment
 from ..serializers import CommentSerializer, CommentCreateSerializer
+from apps.shared.mixins.dynamic_fields import DynamicFieldsViewMixin
+from apps.shared.mixins.metrics import SerializationMetricsMixin
 from apps.shared.utils.custom_response import CustomResponse
 
-class CommentListView(generics.ListAPIView):
+COMMENT_SELECT_RELATED = {
+    'user': 'user',
+    'user_avatar': 'user',
+    'movie_title': 'movie',
+}
+COMMENT_PREFETCH_RELATED = {
+    'replies': 'replies',
+}
+
+class CommentListView(DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = CommentSerializer
+    field_select_related = COMMENT_SELECT_RELATED
+    field_prefetch_related = COMMENT_PREFETCH_RELATED
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['movie', 'user']
@@ -15,10 +28,10 @@ class CommentListView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return Comment.objects.filter(
+        return self.apply_requested_fields(Comment.objects.filter(
             is_active=True, 
             parent__isnull=True
-        ).select_related('user', 'movie').prefetch_related('replies')
+        ))
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -36,7 +49,7 @@ class CommentListView(generics.ListAPIView):
             data=serializer.data
         )
 
-class CommentCreateView(generics.CreateAPIView):
+class CommentCreateView(SerializationMetricsMixin, generics.CreateAPIView):
     serializer_class = CommentCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -56,7 +69,7 @@ class CommentCreateView(generics.CreateAPIView):
             data=CommentSerializer(comment, context={'request': request}).data
         )
 
-class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CommentDetailView(SerializationMetricsMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
@@ -108,7 +121,7 @@ class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
             data={"message": "Comment deleted successfully"}
         )
     
-class CommentReplyView(generics.CreateAPIView):
+class CommentReplyView(SerializationMetricsMixin, generics.CreateAPIView):
     serializer_class = CommentCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -148,17 +161,19 @@ class CommentReplyView(generics.CreateAPIView):
             data=CommentSerializer(comment, context={'request': request}).data
         )
     
-class MovieCommentsView(generics.ListAPIView):
+class MovieCommentsView(DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = CommentSerializer
+    field_select_related = COMMENT_SELECT_RELATED
+    field_prefetch_related = COMMENT_PREFETCH_RELATED
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
         movie_slug = self.kwargs['movie_slug']
-        return Comment.objects.filter(
+        return self.apply_requested_fields(Comment.objects.filter(
             movie__slug=movie_slug,
             is_active=True,
             parent__isnull=True
-        ).select_related('user', 'movie').prefetch_related('replies')
+        ))
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -1,8 +1,13 @@
 from django.contrib import admin
+from django.db import transaction
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from modeltranslation.admin import TranslationAdmin, TranslationStackedInline, TranslationTabularInline
-from .models import Category, Genre, Movie, Video, MovieView, Episode
+from .models import Category, Genre, Movie, Video, MovieView, MovieViewMonthly, Episode
+from .utils.similarity import schedule_similarity_refresh
+from .utils.autocomplete import record_movie_changes
+from .utils.catalog import catalog_changed
 
 class VideoInline(TranslationTabularInline):
     model = Video
@@ -64,7 +69,7 @@ class MovieAdmin(TranslationAdmin):
     list_filter = ('content_type', 'is_premium', 'is_active', 'is_premier', 'is_featured', 'is_trending', 'genres', 'release_year')
     search_fields = ('title', 'description')
     filter_horizontal = ('categories', 'genres')
-    readonly_fields = ('views_count', 'likes_count', 'created_at', 'updated_at', 'poster_preview')
+    readonly_fields = ('views_count', 'likes_count', 'trending_score', 'trending_rank', 'created_at', 'updated_at', 'poster_preview')
     inlines = [VideoInline, EpisodeInline]
     
     fieldsets = (
@@ -87,7 +92,7 @@ class MovieAdmin(TranslationAdmin):
             'fields': ('is_premium', 'is_active', 'is_featured', 'is_trending')
         }),
         (_('Statistics'), {
-            'fields': ('views_count', 'likes_count'),
+            'fields': ('views_count', 'likes_count', 'trending_score', 'trending_rank'),
             'classes': ('collapse',)
         }),
         (_('Timestamps'), {
@@ -102,31 +107,52 @@ class MovieAdmin(TranslationAdmin):
         return "-"
     poster_preview.short_description = _('Poster Preview')
     
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        schedule_similarity_refresh([form.instance.id])
+        catalog_changed()
+    
     actions = ['make_premium', 'make_free', 'mark_as_featured', 'mark_as_trending', 'mark_as_premier']
+
+    def update_selected(self, request, queryset, message, **fields):
+        # Queryset updates send no signals; bump updated_at for the ETags and drop the derived caches.
+        ids = list(queryset.values_list('id', flat=True))
+        Movie.objects.filter(id__in=ids).update(updated_at=timezone.now(), **fields)
+        record_movie_changes(ids)
+        catalog_changed()
+        self.message_user(request, message)
+
+    def delete_model(self, request, obj):
+        # The refresh reads the lists holding the movie now and runs after the delete commits.
+        with transaction.atomic():
+            schedule_similarity_refresh([obj.id])
+            super().delete_model(request, obj)
+        catalog_changed()
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            schedule_similarity_refresh(queryset.values_list('id', flat=True))
+            super().delete_queryset(request, queryset)
+        catalog_changed()
     
     def make_premium(self, request, queryset):
-        queryset.update(is_premium=True)
-        self.message_user(request, _("Selected movies marked as premium"))
+        self.update_selected(request, queryset, _("Selected movies marked as premium"), is_premium=True)
     make_premium.short_description = _("Mark selected as premium")
     
     def make_free(self, request, queryset):
-        queryset.update(is_premium=False)
-        self.message_user(request, _("Selected movies marked as free"))
+        self.update_selected(request, queryset, _("Selected movies marked as free"), is_premium=False)
     make_free.short_description = _("Mark selected as free")
     
     def mark_as_featured(self, request, queryset):
-        queryset.update(is_featured=True)
-        self.message_user(request, _("Selected movies marked as featured"))
+        self.update_selected(request, queryset, _("Selected movies marked as featured"), is_featured=True)
     mark_as_featured.short_description = _("Mark selected as featured")
     
     def mark_as_trending(self, request, queryset):
-        queryset.update(is_trending=True)
-        self.message_user(request, _("Selected movies marked as trending"))
+        self.update_selected(request, queryset, _("Selected movies marked as trending"), is_trending=True)
     mark_as_trending.short_description = _("Mark selected as trending")
     
     def mark_as_premier(self, request, queryset):
-        queryset.update(is_premier=True)
-        self.message_user(request, _("Selected movies marked as premier"))
+        self.update_selected(request, queryset, _("Selected movies marked as premier"), is_premier=True)
     mark_as_premier.short_description = _("Mark selected as premier")
 
 @admin.register(Video)
@@ -159,6 +185,13 @@ class MovieViewAdmin(admin.ModelAdmin):
     search_fields = ('movie__title', 'user__username', 'ip_address')
     readonly_fields = ('created_at', 'updated_at')
 
+@admin.register(MovieViewMonthly)
+class MovieViewMonthlyAdmin(admin.ModelAdmin):
+    list_display = ('movie', 'month', 'views', 'viewers', 'watched_seconds')
+    list_filter = ('month',)
+    search_fields = ('movie__title',)
+    readonly_fields = ('created_at', 'updated_at')
+
 @admin.register(Episode)
 class EpisodeAdmin(TranslationAdmin):
     list_display = ('tv_show', 'season_number', 'episode_number', 'title', 'duration', 'created_at')
@@ -8,3 +8,4 @@ class MoviesConfig(AppConfig):
     
     def ready(self):
         import apps.movies.translation
+        import apps.movies.signals
@@ -0,0 +1,57 @@
+from django.utils import timezone
+
+from apps.comments.bulk_actions import comment_tree_levels, delete_comment_levels
+from apps.comments.models import Comment
+from apps.ratings.models import Rating
+from apps.shared.utils.bulk_jobs import delete_in_batches
+from .models import Movie, MovieLike, MovieSimilarity, MovieView, WatchlistItem
+from .utils.autocomplete import record_movie_changes
+from .utils.catalog import catalog_changed
+from .utils.similarity import schedule_similarity_refresh
+
+def _update(**fields):
+    def apply(ids):
+        if 'is_active' in fields:
+            # Neighbour lists gain or lose these movies.
+            schedule_similarity_refresh(ids)
+        # Queryset updates skip auto_now; bump updated_at for the conditional GETs.
+        return Movie.objects.filter(id__in=ids).update(updated_at=timezone.now(), **fields)
+    return apply
+
+def purge_children(ids):
+    """
+    Remove the high-volume rows of the movies before they are deleted, in
+    batches with their own transactions, so the movie delete itself only
+    cascades to videos, episodes and the genre/category links.
+    """
+    delete_in_batches(MovieView.objects.filter(movie_id__in=ids))
+    delete_in_batches(Rating.objects.filter(movie_id__in=ids))
+    delete_in_batches(MovieLike.objects.filter(movie_id__in=ids))
+    delete_in_batches(WatchlistItem.objects.filter(movie_id__in=ids))
+    # Rows listing these movies go with the delete, once delete() has queued their lists.
+    delete_in_batches(MovieSimilarity.objects.filter(movie_id__in=ids))
+    roots = Comment.objects.filter(movie_id__in=ids, parent__isnull=True).values_list('pk', flat=True)
+    delete_comment_levels(comment_tree_levels(roots))
+
+def delete(ids):
+    schedule_similarity_refresh(ids)
+    _, deleted = Movie.objects.filter(id__in=ids).delete()
+    return deleted.get(Movie._meta.label, 0)
+
+def finish(job):
+    # Queryset updates and deletes send no model signals.
+    record_movie_changes(job.object_ids)
+    catalog_changed()
+
+ACTIONS = {
+    'activate': _update(is_active=True),
+    'deactivate': _update(is_active=False),
+    'mark_premium': _update(is_premium=True),
+    'mark_free': _update(is_premium=False),
+    'mark_premier': _update(is_premier=True),
+    'delete': delete,
+}
+
+PREPARE = {
+    'delete': purge_children,
+}
@@ -1,4 +1,5 @@
 import django_filters
+from rest_framework.filters import OrderingFilter
 from .models import Movie
 
 class MovieFilter(django_filters.FilterSet):
@@ -8,4 +9,28 @@ class MovieFilter(django_filters.FilterSet):
     
     class Meta:
         model = Movie
-        fields = ['genre', 'category', 'content_type', 'is_premium', 'release_year']
\ No newline at end of file
+        fields = ['genre', 'category', 'content_type', 'is_premium', 'release_year']
+
+class MovieListFilter(django_filters.FilterSet):
+    """MovieListView's filters; the movie facets count under exactly the same parameters."""
+    genre = django_filters.CharFilter(field_name='genres__slug', lookup_expr='exact')
+
+    class Meta:
+        model = Movie
+        fields = ['genre', 'categories', 'genres', 'content_type', 'is_premium', 'release_year']
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Several ``genres`` match any of them, and then the last one on its own as well.
+        genre_id = self.data.get('genres')
+        if genre_id:
+            queryset = queryset.filter(genres__id=genre_id)
+        return queryset
+
+class MovieOrderingFilter(OrderingFilter):
+    """OrderingFilter that also takes the named orderings in the view's ``ordering_aliases``."""
+
+    def remove_invalid_fields(self, queryset, fields, view, request):
+        aliases = getattr(view, 'ordering_aliases', {})
+        fields = [term for field in fields for term in aliases.get(field, [field])]
+        return super().remove_invalid_fields(queryset, fields, view, request)
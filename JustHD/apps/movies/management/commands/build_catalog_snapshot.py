@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.movies.utils.catalog_snapshot import build_snapshot
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the memory-mapped catalog snapshot used by the movie list '
+        '(after deploys, or with --loop as a long-running service)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=settings.CATALOG_SNAPSHOT['PATH'], help='Where to write the snapshot')
+        parser.add_argument('--loop', action='store_true', help='Keep rebuilding every --interval seconds')
+        parser.add_argument(
+            '--interval', type=float, default=settings.CATALOG_SNAPSHOT['REBUILD_INTERVAL'],
+            help='Seconds between rebuilds with --loop'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count, seconds = build_snapshot(options['path'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Catalog snapshot of {count} movies written to {options["path"]} in {seconds:.2f}s'
+            ))
+            if not options['loop']:
+                return
+
+            time.sleep(max(options['interval'] - seconds, 0))
+            close_old_connections()
@@ -0,0 +1,22 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.movies.utils.similarity import TOP_N, rebuild_all_similarities
+
+class Command(BaseCommand):
+    help = 'Rebuild content-based "more like this" neighbours for every movie'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=TOP_N,
+            help='Number of neighbours to keep per movie and language',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        stored = rebuild_all_similarities(top_n=options['top'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {stored} similarity rows in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,21 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.movies.utils.trending import HALF_LIFE_HOURS, TOP_N, WINDOW_DAYS, compute_trending_scores
+
+class Command(BaseCommand):
+    help = 'Recompute time-decayed trending scores and ranks (run from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--half-life', type=float, default=HALF_LIFE_HOURS, help='Decay half-life in hours')
+        parser.add_argument('--window', type=int, default=WINDOW_DAYS, help='Days of activity to consider')
+        parser.add_argument('--top', type=int, default=TOP_N, help='Number of movies to rank')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        ranked = compute_trending_scores(
+            half_life_hours=options['half_life'],
+            window_days=options['window'],
+            top_n=options['top'],
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Ranked {ranked} trending movies in {elapsed:.2f}s'))
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from apps.movies.utils.top_rated import MIN_VOTES, compute_weighted_ratings
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the global mean score and every weighted rating '
+        '(from cron, or with --loop as a long-running service)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-votes', type=int, default=MIN_VOTES, help='Votes before a title\'s own mean outweighs the global mean')
+        parser.add_argument('--loop', action='store_true', help='Keep recomputing every --interval seconds')
+        parser.add_argument('--interval', type=float, default=60 * 60, help='Seconds between runs with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            updated = compute_weighted_ratings(min_votes=options['min_votes'])
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(f'Updated the weighted rating of {updated} movies in {elapsed:.2f}s'))
+            if not options['loop']:
+                return
+
+            time.sleep(max(options['interval'] - elapsed, 0))
+            close_old_connections()
@@ -0,0 +1,12 @@
+import time
+from django.core.management.base import BaseCommand
+from apps.movies.utils.likes import flush_like_counts
+
+class Command(BaseCommand):
+    help = 'Fold the sharded like counters into Movie.likes_count (run from cron every minute)'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        updated = flush_like_counts()
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Updated the likes count of {updated} movies in {elapsed:.2f}s'))
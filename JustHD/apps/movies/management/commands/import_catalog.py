@@ -0,0 +1,51 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.movies.utils.catalog_import import BATCH_SIZE, FORMATS, detect_format, import_catalog
+from apps.movies.utils.autocomplete import invalidate_autocomplete
+from apps.movies.utils.catalog import catalog_changed
+from apps.movies.utils.similarity import rebuild_all_similarities
+
+class Command(BaseCommand):
+    help = 'Stream a CSV or JSONL catalog (movies, translations, taxonomy, episodes, videos) into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for stdin')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows per transaction')
+        parser.add_argument('--rebuild-similarities', action='store_true', help='Recompute similar movies afterwards')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+
+        def progress(report):
+            self.stdout.write(
+                f'  {report.rows} rows: {report.created} created, {report.updated} updated, '
+                f'{report.failed} failed'
+            )
+
+        try:
+            if path == '-':
+                report = import_catalog(sys.stdin, fmt, options['batch_size'], progress)
+            else:
+                with open(path, newline='', encoding='utf-8') as stream:
+                    report = import_catalog(stream, fmt, options['batch_size'], progress)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        catalog_changed()
+        invalidate_autocomplete()
+        if options['rebuild_similarities'] and report.created + report.updated:
+            rebuild_all_similarities()
+
+        for error in report.errors:
+            self.stdout.write(self.style.ERROR(f'  line {error["line"]}: {json.dumps(error["errors"], ensure_ascii=False)}'))
+        if report.failed > len(report.errors):
+            self.stdout.write(self.style.ERROR(f'  ... and {report.failed - len(report.errors)} more'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report.created + report.updated} of {report.rows} rows '
+            f'({report.created} created, {report.updated} updated, {report.episodes} episodes, '
+            f'{report.videos} videos) in {report.elapsed:.2f}s, {report.rows_per_second} rows/s'
+        ))
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.movies.utils.view_partitions import apply_retention, ensure_partitions, expired_months, is_partitioned
+
+class Command(BaseCommand):
+    help = 'Create upcoming movie_views partitions and retire expired months (run from cron)'
+
+    def add_arguments(self, parser):
+        options = settings.MOVIE_VIEW_PARTITIONS
+        parser.add_argument('--ahead', type=int, default=options['MONTHS_AHEAD'], help='Months of partitions to create ahead')
+        parser.add_argument('--retain', type=int, default=options['RETENTION_MONTHS'], help='Months of raw views to keep')
+        parser.add_argument('--detach-only', action='store_true', help='Detach expired partitions instead of dropping them')
+        parser.add_argument('--dry-run', action='store_true', help='Only list the months that would be retired')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            for month in expired_months(options['retain']):
+                self.stdout.write(f'  would retire {month:%Y-%m}')
+            return
+
+        if is_partitioned():
+            for name in ensure_partitions(ahead=options['ahead']):
+                self.stdout.write(f'  created {name}')
+        else:
+            self.stdout.write(self.style.WARNING('movie_views is not partitioned, expired views are deleted in batches'))
+
+        for month, movies, views in apply_retention(options['retain'], detach_only=options['detach_only']):
+            self.stdout.write(f'  {month:%Y-%m}: {views} views rolled up into {movies} movie totals')
+        self.stdout.write(self.style.SUCCESS('movie_views partitions are up to date'))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from apps.movies.utils.premieres import LISTING_MODES, refresh_listing
+
+class Command(BaseCommand):
+    help = 'Rebuild the premier listings at every premiere and expiry as it happens (long-running)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-sleep', type=float, default=60, help='Seconds between refreshes when no boundary is closer')
+        parser.add_argument('--once', action='store_true', help='Refresh once and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            now = timezone.now()
+            listings = {mode: refresh_listing(mode, now) for mode in LISTING_MODES}
+            boundary = listings['active']['valid_until']
+            next_change = f'{boundary:%Y-%m-%d %H:%M:%S}' if boundary else 'nothing scheduled'
+            self.stdout.write(f'{len(listings["active"]["ids"])} premier titles live, next change: {next_change}')
+            if options['once']:
+                return
+
+            wait = options['max_sleep']
+            if boundary is not None:
+                wait = min(wait, (boundary - timezone.now()).total_seconds())
+            time.sleep(max(wait, 0))
+            close_old_connections()
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.3 on 2026-10-19 14:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_category_episode_alter_video_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('language', models.CharField(max_length=10, verbose_name='language')),
+                ('score', models.FloatField(verbose_name='score')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='rank')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarities', to='movies.movie', verbose_name='movie')),
+                ('similar_movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie', verbose_name='similar movie')),
+            ],
+            options={
+                'verbose_name': 'Movie Similarity',
+                'verbose_name_plural': 'Movie Similarities',
+                'db_table': 'movie_similarities',
+                'ordering': ['rank'],
+                'indexes': [models.Index(fields=['movie', 'language', 'rank'], name='movie_simil_movie_i_6b81a6_idx')],
+                'unique_together': {('movie', 'similar_movie', 'language')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.3 on 2026-10-19 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_moviesimilarity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='trending_rank',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='trending rank'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='trending_score',
+            field=models.FloatField(default=0, verbose_name='trending score'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['trending_rank'], name='movies_trendin_0cff1e_idx'),
+        ),
+    ]
@@ -0,0 +1,139 @@
+# Generated by Django 4.2.3 on 2026-10-19 15:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+from datetime import datetime, timezone
+
+
+MONTHS_AHEAD = 3
+
+
+def _months(first, last):
+    month = datetime(first.year, first.month, 1, tzinfo=timezone.utc)
+    while month <= last:
+        following = datetime(month.year + month.month // 12, month.month % 12 + 1, 1, tzinfo=timezone.utc)
+        yield month, following
+        month = following
+
+
+def _definitions(cursor):
+    """Secondary indexes and foreign keys of movie_views, to recreate after the swap."""
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = 'movie_views' AND indexname <> 'movie_views_pkey'"
+    )
+    statements = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = 'movie_views'::regclass AND contype = 'f'"
+    )
+    statements += [
+        f'ALTER TABLE movie_views ADD CONSTRAINT {name} {definition}'
+        for name, definition in cursor.fetchall()
+    ]
+    return statements
+
+
+def partition_movie_views(apps, schema_editor):
+    """
+    Rebuild movie_views as a table range-partitioned by month on created_at,
+    with a default partition and partitions from the oldest view to a few
+    months ahead. Partitioned tables need the partition key in the primary
+    key, so it becomes (id, created_at) with id fed by a plain sequence.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        definitions = _definitions(cursor)
+        cursor.execute("SELECT min(created_at), max(id), now() FROM movie_views")
+        oldest, max_id, now = cursor.fetchone()
+        last = datetime(now.year + (now.month + MONTHS_AHEAD - 1) // 12, (now.month + MONTHS_AHEAD - 1) % 12 + 1, 1, tzinfo=timezone.utc)
+
+        cursor.execute("ALTER TABLE movie_views RENAME TO movie_views_unpartitioned")
+        # Neither the identity nor a sequence default (left by unpartition_movie_views) is carried over.
+        cursor.execute("ALTER TABLE movie_views_unpartitioned ALTER COLUMN id DROP IDENTITY IF EXISTS")
+        cursor.execute("ALTER TABLE movie_views_unpartitioned ALTER COLUMN id DROP DEFAULT")
+        cursor.execute(
+            "CREATE TABLE movie_views (LIKE movie_views_unpartitioned INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute("CREATE TABLE movie_views_default PARTITION OF movie_views DEFAULT")
+        for lower, upper in _months(oldest or now, last):
+            cursor.execute(
+                f"CREATE TABLE movie_views_y{lower.year}m{lower.month:02d} PARTITION OF movie_views "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [lower, upper]
+            )
+        cursor.execute("INSERT INTO movie_views SELECT * FROM movie_views_unpartitioned")
+        cursor.execute("DROP TABLE movie_views_unpartitioned")
+        cursor.execute("ALTER TABLE movie_views ADD PRIMARY KEY (id, created_at)")
+
+        cursor.execute("CREATE SEQUENCE movie_views_id_seq OWNED BY movie_views.id")
+        cursor.execute("SELECT setval('movie_views_id_seq', %s, %s)", [max_id or 1, max_id is not None])
+        cursor.execute("ALTER TABLE movie_views ALTER COLUMN id SET DEFAULT nextval('movie_views_id_seq')")
+        for statement in definitions:
+            cursor.execute(statement)
+
+
+def unpartition_movie_views(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        definitions = _definitions(cursor)
+        cursor.execute("ALTER TABLE movie_views RENAME TO movie_views_partitioned")
+        cursor.execute("ALTER SEQUENCE movie_views_id_seq OWNED BY NONE")
+        cursor.execute("CREATE TABLE movie_views (LIKE movie_views_partitioned INCLUDING DEFAULTS)")
+        cursor.execute("INSERT INTO movie_views SELECT * FROM movie_views_partitioned")
+        cursor.execute("DROP TABLE movie_views_partitioned")
+        cursor.execute("ALTER TABLE movie_views ADD PRIMARY KEY (id)")
+        cursor.execute("ALTER SEQUENCE movie_views_id_seq OWNED BY movie_views.id")
+        for statement in definitions:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_movie_trending_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieViewMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.DateField(verbose_name='month')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='views')),
+                ('viewers', models.PositiveIntegerField(default=0, help_text='Distinct signed-in viewers', verbose_name='viewers')),
+                ('watched_seconds', models.BigIntegerField(default=0, verbose_name='watched seconds')),
+            ],
+            options={
+                'verbose_name': 'Monthly Movie Views',
+                'verbose_name_plural': 'Monthly Movie Views',
+                'db_table': 'movie_view_monthly',
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='movieview',
+            name='uuid',
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='movieview',
+            index=models.Index(fields=['created_at'], name='movie_views_created_a7f27f_idx'),
+        ),
+        migrations.AddField(
+            model_name='movieviewmonthly',
+            name='movie',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_views', to='movies.movie', verbose_name='movie'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='movieviewmonthly',
+            unique_together={('movie', 'month')},
+        ),
+        migrations.RunPython(partition_movie_views, unpartition_movie_views),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.3 on 2026-10-19 15:56
+
+from django.db import migrations, models
+from django.db.models import Avg, Count
+
+
+MIN_VOTES = 25
+
+
+def populate_ratings(apps, schema_editor):
+    """Fill the stored rating columns from the existing ratings."""
+    Movie = apps.get_model('movies', 'Movie')
+    Rating = apps.get_model('ratings', 'Rating')
+    stats = list(
+        Rating.objects.values('movie_id').annotate(count=Count('id'), average=Avg('score')).order_by()
+    )
+    votes = sum(row['count'] for row in stats)
+    if not votes:
+        return
+    mean = sum(row['average'] * row['count'] for row in stats) / votes
+    movies = [
+        Movie(
+            id=row['movie_id'],
+            ratings_count=row['count'],
+            ratings_average=row['average'],
+            weighted_rating=(row['count'] * row['average'] + MIN_VOTES * mean) / (row['count'] + MIN_VOTES),
+        )
+        for row in stats
+    ]
+    Movie.objects.bulk_update(movies, ['ratings_count', 'ratings_average', 'weighted_rating'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0006_movie_view_partitions'),
+        ('ratings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='ratings_average',
+            field=models.FloatField(default=0, verbose_name='ratings average'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='ratings_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='ratings count'),
+        ),
+        migrations.AddField(
+            model_name='movie',
+            name='weighted_rating',
+            field=models.FloatField(default=0, verbose_name='weighted rating'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['weighted_rating'], name='movies_weighte_b2bd2f_idx'),
+        ),
+        migrations.RunPython(populate_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.3 on 2026-10-19 16:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('movies', '0007_movie_weighted_rating'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WatchlistItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='watchlist_items', to='movies.movie', verbose_name='movie')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='watchlist', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'Watchlist Item',
+                'verbose_name_plural': 'Watchlist Items',
+                'db_table': 'watchlist_items',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieLikeShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField(verbose_name='shard')),
+                ('delta', models.IntegerField(default=0, verbose_name='delta')),
+                ('movie', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='like_shards', to='movies.movie', verbose_name='movie')),
+            ],
+            options={
+                'verbose_name': 'Movie Like Shard',
+                'verbose_name_plural': 'Movie Like Shards',
+                'db_table': 'movie_like_shards',
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='movies.movie', verbose_name='movie')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='movie_likes', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'Movie Like',
+                'verbose_name_plural': 'Movie Likes',
+                'db_table': 'movie_likes',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='watchlistitem',
+            constraint=models.UniqueConstraint(fields=('user', 'movie'), name='watchlist_items_user_movie_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='movielikeshard',
+            constraint=models.UniqueConstraint(fields=('movie', 'shard'), name='movie_like_shards_movie_shard_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='movielike',
+            constraint=models.UniqueConstraint(fields=('user', 'movie'), name='movie_likes_user_movie_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.3 on 2026-10-19 16:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_movie_likes_watchlist'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='movie',
+            name='poster',
+            field=models.ImageField(blank=True, help_text='Poster image file', null=True, upload_to='movie_posters/%Y/%m/%d/', verbose_name='poster'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
@@ -97,6 +99,11 @@ class Movie(BaseModel):
     
     views_count = models.PositiveIntegerField(_('views count'), default=0)
     likes_count = models.PositiveIntegerField(_('likes count'), default=0)
+    trending_score = models.FloatField(_('trending score'), default=0)
+    trending_rank = models.PositiveIntegerField(_('trending rank'), blank=True, null=True)
+    ratings_count = models.PositiveIntegerField(_('ratings count'), default=0)
+    ratings_average = models.FloatField(_('ratings average'), default=0)
+    weighted_rating = models.FloatField(_('weighted rating'), default=0)
     
     categories = models.ManyToManyField(Category, related_name='movies', verbose_name=_('categories'), blank=True)
     genres = models.ManyToManyField(Genre, related_name='movies', verbose_name=_('genres'))
@@ -117,6 +124,8 @@ class Movie(BaseModel):
             models.Index(fields=['is_premier', 'premier_date']),
             models.Index(fields=['is_featured']),
             models.Index(fields=['is_trending']),
+            models.Index(fields=['trending_rank']),
+            models.Index(fields=['weighted_rating']),
         ]
     
     def __str__(self):
@@ -129,11 +138,9 @@ class Movie(BaseModel):
     
     @property
     def average_rating(self):
-        from apps.ratings.models import Rating
-        ratings = self.ratings.all()
-        if ratings:
-            avg = sum(rating.score for rating in ratings) / len(ratings)
-            return round(avg, 1)
+        # Kept up to date by apps.movies.utils.top_rated, so no ratings are loaded.
+        if self.ratings_count:
+            return round(self.ratings_average, 1)
         return 0
 
 class Video(BaseModel):
@@ -180,6 +187,9 @@ class Video(BaseModel):
         return f"{self.movie.title} - {self.quality} ({self.language})"
     
 class MovieView(BaseModel):
+    # Stored in monthly partitions on PostgreSQL (see utils.view_partitions);
+    # the uuid is kept but not indexed, views are never looked up by it.
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False)
     movie = models.ForeignKey(
         Movie, 
         on_delete=models.CASCADE, 
@@ -200,10 +210,36 @@ class MovieView(BaseModel):
         db_table = 'movie_views'
         verbose_name = _('Movie View')
         verbose_name_plural = _('Movie Views')
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
     
     def __str__(self):
         return f"View: {self.movie.title}"
 
+class MovieViewMonthly(BaseModel):
+    """Per-movie totals of a month whose raw views have been retired."""
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='monthly_views',
+        verbose_name=_('movie')
+    )
+    month = models.DateField(_('month'))
+    views = models.PositiveIntegerField(_('views'), default=0)
+    viewers = models.PositiveIntegerField(_('viewers'), default=0, help_text=_("Distinct signed-in viewers"))
+    watched_seconds = models.BigIntegerField(_('watched seconds'), default=0)
+
+    class Meta:
+        db_table = 'movie_view_monthly'
+        verbose_name = _('Monthly Movie Views')
+        verbose_name_plural = _('Monthly Movie Views')
+        unique_together = ['movie', 'month']
+        ordering = ['-month']
+
+    def __str__(self):
+        return f"{self.movie_id} {self.month:%Y-%m}: {self.views}"
+
 class Episode(BaseModel):
     tv_show = models.ForeignKey(
         Movie,
@@ -226,4 +262,114 @@ class Episode(BaseModel):
         ordering = ['season_number', 'episode_number']
     
     def __str__(self):
-        return f"S{self.season_number:02d}E{self.episode_number:02d} - {self.title}"
\ No newline at end of file
+        return f"S{self.season_number:02d}E{self.episode_number:02d} - {self.title}"
+
+class MovieSimilarity(BaseModel):
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='similarities',
+        verbose_name=_('movie')
+    )
+    similar_movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('similar movie')
+    )
+    language = models.CharField(_('language'), max_length=10)
+    score = models.FloatField(_('score'))
+    rank = models.PositiveSmallIntegerField(_('rank'))
+
+    class Meta:
+        db_table = 'movie_similarities'
+        verbose_name = _('Movie Similarity')
+        verbose_name_plural = _('Movie Similarities')
+        unique_together = ['movie', 'similar_movie', 'language']
+        ordering = ['rank']
+        indexes = [
+            models.Index(fields=['movie', 'language', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} -> {self.similar_movie_id} ({self.language}): {self.score:.3f}"
+
+class MovieLike(models.Model):
+    # One narrow row per like: no uuid or updated_at, and the unique index
+    # doubles as the user's lookup index.
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='movie_likes',
+        db_index=False,
+        verbose_name=_('user')
+    )
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='likes',
+        verbose_name=_('movie')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'movie_likes'
+        verbose_name = _('Movie Like')
+        verbose_name_plural = _('Movie Likes')
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'movie'], name='movie_likes_user_movie_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} likes {self.movie_id}"
+
+class WatchlistItem(models.Model):
+    user = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='watchlist',
+        db_index=False,
+        verbose_name=_('user')
+    )
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='watchlist_items',
+        verbose_name=_('movie')
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'watchlist_items'
+        verbose_name = _('Watchlist Item')
+        verbose_name_plural = _('Watchlist Items')
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'movie'], name='watchlist_items_user_movie_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} saved {self.movie_id}"
+
+class MovieLikeShard(models.Model):
+    """Pending likes_count changes of a movie, spread over shards (see utils.likes)."""
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name='like_shards',
+        db_index=False,
+        verbose_name=_('movie')
+    )
+    shard = models.PositiveSmallIntegerField(_('shard'))
+    delta = models.IntegerField(_('delta'), default=0)
+
+    class Meta:
+        db_table = 'movie_like_shards'
+        verbose_name = _('Movie Like Shard')
+        verbose_name_plural = _('Movie Like Shards')
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'shard'], name='movie_like_shards_movie_shard_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id}[{self.shard}]: {self.delta:+d}"
@@ -36,6 +36,7 @@ class AdminMovieSerializer(serializers.ModelSerializer):
     class Meta:
         model = Movie
         fields = '__all__'
+        read_only_fields = ('ratings_count', 'ratings_average', 'weighted_rating')
         extra_kwargs = {
             'poster': {'required': False},
             'trailer_url': {'required': False},
@@ -47,4 +48,48 @@ class AdminMovieSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         if 'poster' not in attrs:
             attrs['poster'] = None
-        return attrs
\ No newline at end of file
+        return attrs
+
+class CatalogImportEpisodeSerializer(serializers.Serializer):
+    season_number = serializers.IntegerField(min_value=1, default=1)
+    episode_number = serializers.IntegerField(min_value=1)
+    title = serializers.CharField(max_length=255)
+    title_uz = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    title_ru = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    description_uz = serializers.CharField(required=False, allow_blank=True)
+    description_ru = serializers.CharField(required=False, allow_blank=True)
+    duration = serializers.IntegerField(min_value=1)
+
+class CatalogImportVideoSerializer(serializers.Serializer):
+    quality = serializers.ChoiceField(choices=Video.QUALITY_CHOICES, default='HD')
+    language = serializers.ChoiceField(choices=Video.LANGUAGE_CHOICES, default='en')
+    subtitle_language = serializers.ChoiceField(choices=Video.LANGUAGE_CHOICES, required=False, allow_null=True)
+    video_file = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+    duration = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+class CatalogImportRowSerializer(serializers.Serializer):
+    """
+    One movie of a catalog import file. Taxonomy is given by name (or slug) in
+    any language and resolved in bulk by the importer.
+    """
+    slug = serializers.SlugField(max_length=50, required=False, allow_blank=True)
+    title = serializers.CharField(max_length=255)
+    title_uz = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    title_ru = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    description = serializers.CharField()
+    description_uz = serializers.CharField(required=False, allow_blank=True)
+    description_ru = serializers.CharField(required=False, allow_blank=True)
+    release_year = serializers.IntegerField(min_value=1900, max_value=2100)
+    duration = serializers.IntegerField(min_value=1)
+    content_type = serializers.ChoiceField(choices=Movie.CONTENT_TYPES, default='movie')
+    age_rating = serializers.ChoiceField(choices=Movie.AGE_RATINGS, default='PG-13')
+    trailer_url = serializers.URLField(required=False, allow_blank=True, allow_null=True)
+    imdb_rating = serializers.DecimalField(max_digits=3, decimal_places=1, required=False, allow_null=True)
+    is_premium = serializers.BooleanField(default=False)
+    is_active = serializers.BooleanField(default=True)
+    genres = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    categories = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+    episodes = CatalogImportEpisodeSerializer(many=True, required=False, default=list)
+    videos = CatalogImportVideoSerializer(many=True, required=False, default=list)
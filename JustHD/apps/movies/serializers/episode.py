@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from apps.movies.models import Episode
+from apps.shared.mixins.dynamic_fields import DynamicFieldsMixin
 
-class EpisodeSerializer(serializers.ModelSerializer):
+class EpisodeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     
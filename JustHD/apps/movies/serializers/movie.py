@@ -1,11 +1,12 @@
 from rest_framework import serializers
 from apps.movies.models import Movie
+from apps.shared.mixins.dynamic_fields import DynamicFieldsMixin
 from .category import CategorySerializer
 from .genre import GenreSerializer
 from .video import VideoSerializer
-from .episode import EpisodeSerializer
 
-class MovieListSerializer(serializers.ModelSerializer):
+class MovieListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = ('categories', 'genres')
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     categories = CategorySerializer(many=True, read_only=True)
@@ -46,13 +47,14 @@ class MovieListSerializer(serializers.ModelSerializer):
             return value if value else getattr(obj, field)
         return getattr(obj, field)
 
-class MovieDetailSerializer(serializers.ModelSerializer):
+class MovieDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = ('categories', 'genres', 'videos')
     title = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     categories = CategorySerializer(many=True, read_only=True)
     genres = GenreSerializer(many=True, read_only=True)
     videos = VideoSerializer(many=True, read_only=True)
-    episodes = EpisodeSerializer(many=True, read_only=True)
+    seasons = serializers.SerializerMethodField()
     average_rating = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
     is_watched = serializers.SerializerMethodField()
@@ -64,7 +66,7 @@ class MovieDetailSerializer(serializers.ModelSerializer):
             'release_year', 'duration', 'content_type', 'age_rating',
             'trailer_url', 'is_premium', 'is_premier', 'premier_date',
             'available_until', 'is_featured', 'is_trending',
-            'categories', 'genres', 'videos', 'episodes', 
+            'categories', 'genres', 'videos', 'seasons',
             'views_count', 'likes_count', 'imdb_rating',
             'average_rating', 'comments_count', 'is_watched',
             'created_at', 'updated_at'
@@ -80,6 +82,11 @@ class MovieDetailSerializer(serializers.ModelSerializer):
     def get_average_rating(self, obj):
         return obj.average_rating
     
+    def get_seasons(self, obj):
+        # Episodes are paged per season from the season endpoints.
+        from apps.movies.utils.seasons import get_season_index
+        return get_season_index(obj.pk)
+    
     def get_comments_count(self, obj):
         from apps.comments.models import Comment
         return Comment.objects.filter(movie=obj, is_active=True).count()
@@ -0,0 +1,27 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Episode, Movie
+from .utils.top_rated import RATING_FIELDS
+from .utils.autocomplete import record_movie_changes
+from .utils.seasons import invalidate_season_index
+
+COUNTER_FIELDS = frozenset(['views_count', 'likes_count', *RATING_FIELDS])
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def movie_changed(sender, instance, **kwargs):
+    """Re-read the movie into the autocomplete index once the change is committed"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields and COUNTER_FIELDS.issuperset(update_fields):
+        # Counters reach the index with its periodic rebuild.
+        return
+    movie_id = instance.pk
+    transaction.on_commit(lambda: record_movie_changes([movie_id]))
+
+@receiver(post_save, sender=Episode)
+@receiver(post_delete, sender=Episode)
+def episode_changed(sender, instance, **kwargs):
+    """Drop the cached season index of the show"""
+    show_id = instance.tv_show_id
+    transaction.on_commit(lambda: invalidate_season_index([show_id]))
@@ -0,0 +1,486 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import skipUnless
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.movies.models import Category, Genre, Movie, MovieSimilarity, MovieView, MovieViewMonthly
+from apps.movies.utils import autocomplete, view_partitions
+from apps.movies.utils.catalog_import import import_catalog
+from apps.movies.utils.similarity import rebuild_all_similarities, refresh_movie_similarities
+from apps.movies.utils.trending import compute_trending_scores
+
+class MovieSimilarityTest(TestCase):
+    def setUp(self):
+        self.action = Genre.objects.create(name='Action')
+        self.drama = Genre.objects.create(name='Drama')
+
+        self.space_war = Movie.objects.create(
+            title='Space War',
+            slug='space-war',
+            description='Starships battle across the galaxy',
+            release_year=2020,
+            duration=120
+        )
+        self.space_war.genres.add(self.action)
+
+        self.galaxy_battle = Movie.objects.create(
+            title='Galaxy Battle',
+            slug='galaxy-battle',
+            description='Starships battle for the galaxy throne',
+            release_year=2021,
+            duration=110
+        )
+        self.galaxy_battle.genres.add(self.action)
+
+        self.quiet_village = Movie.objects.create(
+            title='Quiet Village',
+            slug='quiet-village',
+            description='A family drama in a small village',
+            release_year=2019,
+            duration=95
+        )
+        self.quiet_village.genres.add(self.drama)
+
+    def _neighbours(self, movie, lang='en'):
+        return list(
+            MovieSimilarity.objects.filter(movie=movie, language=lang)
+            .order_by('rank').values_list('similar_movie_id', flat=True)
+        )
+
+    def test_rebuild_ranks_closest_movie_first(self):
+        rebuild_all_similarities()
+        self.assertEqual(self._neighbours(self.space_war)[0], self.galaxy_battle.id)
+        self.assertNotIn(self.space_war.id, self._neighbours(self.space_war))
+
+    def test_rebuild_stores_every_language(self):
+        rebuild_all_similarities()
+        languages = set(MovieSimilarity.objects.values_list('language', flat=True))
+        self.assertEqual(languages, {'en', 'uz', 'ru'})
+
+    def test_refresh_adds_new_movie_to_neighbour_lists(self):
+        rebuild_all_similarities()
+        sequel = Movie.objects.create(
+            title='Space War Returns',
+            slug='space-war-returns',
+            description='Starships battle again across the galaxy',
+            release_year=2023,
+            duration=125
+        )
+        sequel.genres.add(self.action)
+
+        refresh_movie_similarities([sequel.id])
+
+        self.assertEqual(self._neighbours(sequel)[0], self.space_war.id)
+        self.assertIn(sequel.id, self._neighbours(self.space_war))
+
+    def test_refresh_drops_deactivated_movie(self):
+        rebuild_all_similarities()
+        self.galaxy_battle.is_active = False
+        self.galaxy_battle.save()
+
+        refresh_movie_similarities([self.galaxy_battle.id])
+
+        self.assertEqual(self._neighbours(self.galaxy_battle), [])
+        self.assertNotIn(self.galaxy_battle.id, self._neighbours(self.space_war))
+
+    def test_refresh_reaches_lists_the_new_movie_ranks_into(self):
+        mountain = Movie.objects.create(
+            title='Mountain Drama', slug='mountain-drama', description='Winter on the mountain',
+            release_year=2018, duration=100
+        )
+        mountain.genres.add(self.drama)
+        rebuild_all_similarities(top_n=1)
+        self.assertEqual(self._neighbours(self.quiet_village), [mountain.id])
+        # Closest to Space War, but also the best match left for Quiet Village.
+        crossover = Movie.objects.create(
+            title='Space War Village', slug='space-war-village',
+            description='Starships battle across the galaxy over a small family village',
+            release_year=2024, duration=120
+        )
+        crossover.genres.add(self.action)
+
+        refresh_movie_similarities([crossover.id], top_n=1)
+
+        self.assertEqual(self._neighbours(crossover), [self.space_war.id])
+        refreshed = set(MovieSimilarity.objects.values_list('movie_id', 'similar_movie_id', 'language'))
+        rebuild_all_similarities(top_n=1)
+        self.assertEqual(refreshed, set(MovieSimilarity.objects.values_list('movie_id', 'similar_movie_id', 'language')))
+        self.assertEqual(self._neighbours(self.quiet_village), [crossover.id])
+
+    def test_refreshes_queue_one_durable_job(self):
+        from unittest import mock
+        from django.conf import settings
+        from apps.shared.models import BulkJob
+        from apps.shared.utils.bulk_jobs import resume_stale_jobs
+        from apps.movies.utils.similarity import schedule_similarity_refresh
+
+        options = {**settings.MOVIE_SIMILARITIES, 'REFRESH_IN_BACKGROUND': True}
+        # The timer never fires, as if the worker was recycled before it did.
+        with self.settings(MOVIE_SIMILARITIES=options), mock.patch('threading.Timer'):
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_similarity_refresh([self.space_war.id])
+            with self.captureOnCommitCallbacks(execute=True):
+                schedule_similarity_refresh([self.galaxy_battle.id])
+
+        job = BulkJob.objects.get(target='movie_similarities')
+        self.assertEqual((job.status, sorted(job.object_ids)), ('pending', sorted([self.space_war.id, self.galaxy_battle.id])))
+
+        [job] = resume_stale_jobs()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(self._neighbours(self.space_war)[0], self.galaxy_battle.id)
+
+    def test_refresh_overwrites_a_list_written_concurrently(self):
+        from unittest import mock
+        from django.db.models import QuerySet
+
+        rebuild_all_similarities()
+        delete = QuerySet.delete
+
+        def delete_then_race(queryset):
+            result = delete(queryset)
+            # Another refresh writes the same list between our delete and insert.
+            MovieSimilarity.objects.get_or_create(
+                movie=self.space_war, similar_movie=self.galaxy_battle, language='en',
+                defaults={'score': 0, 'rank': 99}
+            )
+            return result
+
+        with mock.patch.object(QuerySet, 'delete', delete_then_race):
+            refresh_movie_similarities([self.space_war.id])
+
+        self.assertEqual(self._neighbours(self.space_war)[0], self.galaxy_battle.id)
+        self.assertFalse(MovieSimilarity.objects.filter(rank=99).exists())
+
+class TrendingScoreTest(TestCase):
+    def setUp(self):
+        self.popular = Movie.objects.create(
+            title='Popular', slug='popular', description='d', release_year=2020, duration=90
+        )
+        self.quiet = Movie.objects.create(
+            title='Quiet', slug='quiet', description='d', release_year=2020, duration=90
+        )
+        self.stale = Movie.objects.create(
+            title='Stale', slug='stale', description='d', release_year=2020, duration=90
+        )
+
+    def _add_views(self, movie, count, age=None):
+        views = [MovieView(movie=movie, ip_address='127.0.0.1') for _ in range(count)]
+        MovieView.objects.bulk_create(views)
+        if age is not None:
+            MovieView.objects.filter(movie=movie).update(created_at=timezone.now() - age)
+
+    def test_scores_rank_recent_activity(self):
+        self._add_views(self.popular, 5)
+        self._add_views(self.quiet, 1)
+
+        compute_trending_scores()
+
+        self.popular.refresh_from_db()
+        self.quiet.refresh_from_db()
+        self.stale.refresh_from_db()
+        self.assertEqual(self.popular.trending_rank, 1)
+        self.assertEqual(self.quiet.trending_rank, 2)
+        self.assertIsNone(self.stale.trending_rank)
+        self.assertGreater(self.popular.trending_score, self.quiet.trending_score)
+
+    def test_old_views_decay(self):
+        self._add_views(self.stale, 10, age=timedelta(days=6))
+        self._add_views(self.quiet, 2)
+
+        compute_trending_scores(half_life_hours=24)
+
+        self.quiet.refresh_from_db()
+        self.stale.refresh_from_db()
+        self.assertEqual(self.quiet.trending_rank, 1)
+        self.assertEqual(self.stale.trending_rank, 2)
+
+    def test_previous_ranks_are_cleared(self):
+        self._add_views(self.popular, 1)
+        compute_trending_scores()
+        MovieView.objects.all().delete()
+
+        compute_trending_scores()
+
+        self.popular.refresh_from_db()
+        self.assertIsNone(self.popular.trending_rank)
+        self.assertEqual(self.popular.trending_score, 0)
+
+class WeightedRatingTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth import get_user_model
+        from apps.ratings.models import Rating
+
+        User = get_user_model()
+        User.objects.bulk_create([User(username=f'voter{index}', email=f'voter{index}@example.com') for index in range(30)])
+        self.users = list(User.objects.order_by('id'))
+
+        def movie(slug, scores):
+            instance = Movie.objects.create(title=slug, slug=slug, description='d', release_year=2020, duration=90)
+            Rating.objects.bulk_create([
+                Rating(user=user, movie=instance, score=score) for user, score in zip(self.users, scores)
+            ])
+            return instance
+
+        self.single_ten = movie('single-ten', [10])
+        self.many_nines = movie('many-nines', [9] * 30)
+        self.many_threes = movie('many-threes', [3] * 30)
+        self.unrated = movie('unrated', [])
+
+    def test_many_votes_outrank_a_single_perfect_score(self):
+        from apps.movies.utils.top_rated import compute_weighted_ratings, top_rated_queryset
+
+        self.assertEqual(compute_weighted_ratings(), 3)
+
+        self.many_nines.refresh_from_db()
+        self.assertEqual((self.many_nines.ratings_count, self.many_nines.average_rating), (30, 9.0))
+        ranked = list(top_rated_queryset(Movie.objects.all()).values_list('slug', flat=True))
+        self.assertEqual(ranked, ['many-nines', 'single-ten', 'many-threes'])
+        # Nothing changed, nothing is written.
+        self.assertEqual(compute_weighted_ratings(), 0)
+
+    def test_rating_writes_refresh_their_movie(self):
+        from apps.movies.utils.top_rated import compute_weighted_ratings
+        from apps.ratings.models import Rating
+
+        compute_weighted_ratings()
+        with self.captureOnCommitCallbacks(execute=True):
+            Rating.objects.create(user=self.users[0], movie=self.unrated, score=8)
+        self.unrated.refresh_from_db()
+        self.assertEqual((self.unrated.ratings_count, self.unrated.ratings_average), (1, 8))
+        self.assertGreater(self.unrated.weighted_rating, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Rating.objects.filter(movie=self.unrated).get().delete()
+        self.unrated.refresh_from_db()
+        self.assertEqual((self.unrated.ratings_count, self.unrated.weighted_rating), (0, 0))
+
+    def test_refresh_computes_in_sql_what_the_formula_gives(self):
+        from apps.movies.utils.top_rated import compute_weighted_ratings, global_mean, refresh_movie_ratings, weighted_rating
+
+        compute_weighted_ratings()
+        movies = [self.single_ten, self.many_nines, self.unrated]
+        # Stale columns, as left by a refresh that read the ratings earlier.
+        Movie.objects.filter(id__in=[movie.id for movie in movies]).update(
+            ratings_count=1, ratings_average=1, weighted_rating=1
+        )
+        mean = global_mean()
+        with CaptureQueriesContext(connection) as queries:
+            refresh_movie_ratings([movie.id for movie in movies])
+        self.assertEqual(sum(query['sql'].startswith('UPDATE') for query in queries), 1)
+
+        for movie, (count, average) in zip(movies, [(1, 10), (30, 9), (0, 0)]):
+            movie.refresh_from_db()
+            self.assertEqual((movie.ratings_count, movie.ratings_average), (count, average))
+            self.assertAlmostEqual(movie.weighted_rating, weighted_rating(count, average, mean))
+
+class LikeShardTest(TestCase):
+    def test_flush_folds_every_shard_of_every_movie(self):
+        from django.contrib.auth import get_user_model
+        from apps.movies.models import MovieLikeShard
+        from apps.movies.utils.likes import flush_like_counts, like, pending_likes, unlike
+
+        User = get_user_model()
+        users = [User.objects.create(username=f'fan{index}', email=f'fan{index}@example.com') for index in range(40)]
+        popular = Movie.objects.create(title='Popular', slug='popular', description='d', release_year=2020, duration=90)
+        quiet = Movie.objects.create(title='Quiet', slug='quiet', description='d', release_year=2020, duration=90, likes_count=5)
+        for user in users:
+            like(user, popular.id)
+        like(users[0], quiet.id)
+        unlike(users[1], popular.id)
+        unlike(users[2], quiet.id)
+
+        self.assertGreater(MovieLikeShard.objects.filter(movie=popular).count(), 1)
+        self.assertEqual(pending_likes([popular.id, quiet.id]), {popular.id: 39, quiet.id: 1})
+
+        self.assertEqual(flush_like_counts(), 2)
+        self.assertEqual(dict(Movie.objects.values_list('slug', 'likes_count')), {'popular': 39, 'quiet': 6})
+        self.assertEqual(flush_like_counts(), 0)
+
+CATALOG_CSV = """title,title_uz,title_ru,description,release_year,duration,content_type,genres,categories,videos
+Dune,Dyuna,Дюна,Desert planet,2021,155,movie,Sci-Fi|Drama,Movies,"[{""quality"": ""HD"", ""video_file"": ""videos/dune.mp4""}]"
+Dune,Dyuna,Дюна,Desert planet,1984,137,movie,Ilmiy Fantastika,filmlar,
+Broken,,,,2020,90,movie,Drama,Movies,
+Unknown,,,Text,2020,90,movie,Western,Movies,
+"""
+
+class CatalogImportTest(TestCase):
+    def setUp(self):
+        self.scifi = Genre.objects.create(name='Sci-Fi', name_uz='Ilmiy Fantastika', name_ru='Фантастика')
+        self.drama = Genre.objects.create(name='Drama')
+        self.movies = Category.objects.create(name='Movies', name_uz='Filmlar', name_ru='Фильмы')
+        Movie.objects.create(title='Taken', slug='dune', description='d', release_year=1999, duration=90)
+
+    def test_csv_import_resolves_taxonomy_and_reports_row_errors(self):
+        report = import_catalog(io.StringIO(CATALOG_CSV), 'csv')
+
+        self.assertEqual((report.rows, report.created, report.failed), (4, 2, 2))
+        self.assertEqual([error['line'] for error in report.errors], [4, 5])
+        self.assertIn('description', report.errors[0]['errors'])
+        self.assertEqual(report.errors[1]['errors']['genres'], ['Unknown genre: Western'])
+
+        # Slugs are allocated around the existing "dune".
+        new = Movie.objects.filter(title_en='Dune').order_by('release_year')
+        self.assertEqual([movie.slug for movie in new], ['dune-3', 'dune-2'])
+        self.assertEqual(new[1].title_ru, 'Дюна')
+        self.assertEqual(set(new[1].genres.all()), {self.scifi, self.drama})
+        self.assertEqual(list(new[0].categories.all()), [self.movies])
+        self.assertEqual(new[1].videos.get().video_file, 'videos/dune.mp4')
+
+    def test_reimport_updates_instead_of_duplicating(self):
+        import_catalog(io.StringIO(CATALOG_CSV), 'csv')
+        report = import_catalog(io.StringIO(CATALOG_CSV.replace('155', '156')), 'csv')
+
+        self.assertEqual((report.created, report.updated), (0, 2))
+        self.assertEqual(Movie.objects.filter(title_en='Dune').count(), 2)
+        self.assertEqual(Movie.objects.get(title_en='Dune', release_year=2021).duration, 156)
+
+    def test_jsonl_import_upserts_episodes(self):
+        show = {
+            'slug': 'shogun', 'title': 'Shogun', 'description': 'Japan', 'release_year': 2024,
+            'duration': 55, 'content_type': 'tv_show', 'genres': ['Drama'],
+            'episodes': [
+                {'season_number': 1, 'episode_number': 1, 'title': 'Anjin', 'duration': 60},
+                {'season_number': 1, 'episode_number': 2, 'title': 'Servants', 'duration': 58},
+            ],
+        }
+        lines = [json.dumps(show), '{not json']
+        report = import_catalog(io.StringIO('\n'.join(lines)), 'jsonl')
+        self.assertEqual((report.created, report.episodes, report.failed), (1, 2, 1))
+
+        show['episodes'][0]['title'] = 'Anjin (recut)'
+        import_catalog(io.StringIO(json.dumps(show)), 'jsonl')
+        episodes = Movie.objects.get(slug='shogun').episodes.order_by('episode_number')
+        self.assertEqual([episode.title_en for episode in episodes], ['Anjin (recut)', 'Servants'])
+        self.assertEqual(episodes[0].title_ru, 'Anjin (recut)')
+
+class ViewPartitionsTest(TestCase):
+    def setUp(self):
+        self.movie = Movie.objects.create(
+            title='Popular', slug='popular', description='d', release_year=2020, duration=90
+        )
+        self.now = datetime(2026, 10, 15, tzinfo=dt_timezone.utc)
+
+    def _add_views(self, created_at, count, user=None):
+        views = MovieView.objects.bulk_create([
+            MovieView(movie=self.movie, ip_address='127.0.0.1', user=user, duration_watched=60)
+            for _ in range(count)
+        ])
+        MovieView.objects.filter(pk__in=[view.pk for view in views]).update(created_at=created_at)
+
+    def test_month_arithmetic(self):
+        month = view_partitions.month_start(self.now)
+        self.assertEqual(month, datetime(2026, 10, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(view_partitions.add_months(month, 3), datetime(2027, 1, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(view_partitions.add_months(month, -10), datetime(2025, 12, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(view_partitions.partition_name(month), 'movie_views_y2026m10')
+
+    def test_retention_rolls_up_before_dropping(self):
+        from apps.users.models import User
+
+        user = User.objects.create_user(username='viewer', email='viewer@example.com', password='x')
+        self._add_views(datetime(2025, 3, 10, tzinfo=dt_timezone.utc), 3, user=user)
+        self._add_views(datetime(2025, 3, 20, tzinfo=dt_timezone.utc), 2)
+        self._add_views(datetime(2026, 9, 1, tzinfo=dt_timezone.utc), 4)
+
+        results = view_partitions.apply_retention(retain_months=6, now=self.now)
+
+        self.assertEqual([(month.date(), movies, views) for month, movies, views in results if views], [
+            (datetime(2025, 3, 1).date(), 1, 5),
+        ])
+        monthly = MovieViewMonthly.objects.get(movie=self.movie)
+        self.assertEqual((monthly.views, monthly.viewers, monthly.watched_seconds), (5, 1, 300))
+        self.assertEqual(MovieView.objects.count(), 4)
+        # Nothing left to retire, and a repeated rollup keeps the totals.
+        self.assertEqual(view_partitions.apply_retention(retain_months=6, now=self.now), [])
+        view_partitions.rollup_month(datetime(2025, 3, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(MovieViewMonthly.objects.get(movie=self.movie).views, 5)
+
+    @skipUnless(connection.vendor == 'postgresql', 'partitioning needs PostgreSQL')
+    def test_partitions_are_created_and_dropped(self):
+        self.assertTrue(view_partitions.is_partitioned())
+        old_month = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+        self._add_views(datetime(2020, 1, 5, tzinfo=dt_timezone.utc), 2)
+
+        created = view_partitions.ensure_partitions(ahead=1, now=self.now)
+
+        self.assertIn('movie_views_y2020m01', created)
+        self.assertIn(old_month, view_partitions.partition_months())
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM movie_views_y2020m01')
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+        view_partitions.apply_retention(retain_months=24, now=self.now)
+        self.assertNotIn(old_month, view_partitions.partition_months())
+        self.assertEqual(MovieViewMonthly.objects.get(movie=self.movie, month=old_month.date()).views, 2)
+
+class AutocompleteIndexTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        autocomplete._index = None
+        autocomplete._synced_at = 0.0
+        self.addCleanup(setattr, autocomplete, '_index', None)
+
+        def movie(slug, titles, views=0, is_premium=False):
+            return Movie.objects.create(
+                slug=slug, title_en=titles[0], title_uz=titles[1], title_ru=titles[2],
+                description='Description', release_year=2000, duration=90,
+                views_count=views, is_premium=is_premium
+            )
+
+        self.days = movie('otkan-kunlar', ("Bygone Days", "O‘tkan kunlar", 'Минувшие дни'), views=50)
+        self.knight = movie('dark-knight', ('The Dark Knight', 'Qorong\'u ritsar', 'Тёмный рыцарь'), views=900)
+        self.darkest = movie('darkest-hour', ('Darkest Hour', 'Eng qorong\'u soat', 'Тёмные времена'), views=300, is_premium=True)
+
+    def complete(self, query, lang='en', is_premium=True, limit=10):
+        return autocomplete.get_index().complete(query, lang, is_premium, limit)
+
+    def test_fold_transliterates_and_strips_accents(self):
+        self.assertEqual(autocomplete.fold('Ўткан кунлар'), 'otkan kunlar')
+        self.assertEqual(autocomplete.fold("O‘tkan  KUNLAR!"), 'otkan kunlar')
+        self.assertEqual(autocomplete.fold('Amélie — Café'), 'amelie cafe')
+        self.assertEqual(autocomplete.fold('Шахар ғами'), 'shaxar gami')
+
+    def test_prefixes_match_any_word_ranked_by_views(self):
+        self.assertEqual(self.complete('dark'), [self.knight.id, self.darkest.id])
+        self.assertEqual(self.complete('kni'), [self.knight.id])
+        self.assertEqual(self.complete('dark', limit=1), [self.knight.id])
+        self.assertEqual(self.complete('dark', is_premium=False), [self.knight.id])
+        self.assertEqual(self.complete('zzz'), [])
+
+    def test_either_script_matches_uzbek_titles(self):
+        self.assertEqual(self.complete('ўткан', lang='uz'), [self.days.id])
+        self.assertEqual(self.complete("o'tk", lang='uz'), [self.days.id])
+        self.assertEqual(self.complete('қоронгу', lang='uz'), [self.knight.id, self.darkest.id])
+        self.assertEqual(self.complete('tyomn', lang='ru'), [self.knight.id, self.darkest.id])
+
+    def test_logged_changes_are_applied_incrementally(self):
+        index = autocomplete.get_index()
+        knight_id = self.knight.id
+        self.assertEqual(self.complete('dark'), [self.knight.id, self.darkest.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Movie.objects.filter(pk=self.darkest.pk).update(views_count=5000)
+            self.darkest.refresh_from_db()
+            self.darkest.title_en = 'Darkest Hours'
+            self.darkest.save()
+            self.knight.delete()
+
+        self.assertEqual(self.complete('darkest hours'), [self.darkest.id])
+        self.assertEqual(self.complete('dark'), [self.darkest.id])
+        # Applied to a copy rather than rebuilt; requests still holding the old index are unaffected.
+        self.assertEqual(autocomplete.get_index().built_at, index.built_at)
+        self.assertEqual(index.complete('dark', 'en', True, 10), [knight_id, self.darkest.id])
+        self.assertEqual(index.results([knight_id], 'en'), [(knight_id, 'dark-knight', 'The Dark Knight', '')])
+
+    def test_catalog_wide_changes_rebuild_the_index(self):
+        index = autocomplete.get_index()
+        Movie.objects.filter(pk=self.knight.pk).update(is_active=False)
+        autocomplete.invalidate_autocomplete()
+
+        self.assertEqual(self.complete('dark'), [self.darkest.id])
+        self.assertIsNot(autocomplete.get_index(), index)
@@ -1,8 +1,11 @@
+from django.conf import settings
+from django.http import QueryDict
 from django.test import TestCase
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from apps.movies.models import Movie, Genre
+from apps.movies.models import Movie, Genre, MovieSimilarity, MovieView
+from apps.shared.models import BulkJob
 from django.urls import reverse
 
 User = get_user_model()
@@ -153,4 +156,888 @@ class MovieViewsTest(TestCase):
         self.client.force_authenticate(user=self.premium_user)
         url = reverse('movies:movie-watch', kwargs={'slug': self.premium_movie.slug})
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_similar_movies_respects_premium(self):
+        from apps.movies.utils.similarity import rebuild_all_similarities
+        rebuild_all_similarities()
+        url = reverse('movies:similar-movies', kwargs={'slug': self.regular_movie.slug})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._get_response_data(response), [])
+
+        self.client.force_authenticate(user=self.premium_user)
+        response = self.client.get(url)
+        slugs = [movie['slug'] for movie in self._get_response_data(response)]
+        self.assertEqual(slugs, ['premium-movie'])
+
+    def test_trending_orders_pins_before_ranks(self):
+        ranked = Movie.objects.create(
+            title='Ranked Movie',
+            slug='ranked-movie',
+            description='Ranked description',
+            release_year=2023,
+            duration=100,
+            trending_rank=1,
+            trending_score=5.0
+        )
+        self.regular_movie.is_trending = True
+        self.regular_movie.save()
+        self.premium_movie.trending_rank = 2
+        self.premium_movie.save()
+
+        response = self.client.get(reverse('movies:trending-movies'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        slugs = [movie['slug'] for movie in self._get_response_data(response)]
+        self.assertEqual(slugs, [self.regular_movie.slug, ranked.slug])
+
+    def test_home_feed_assembles_rails(self):
+        from django.core.cache import cache
+        from apps.movies.models import Category
+        cache.clear()
+        category = Category.objects.create(name='Movies', slug='movies')
+        self.regular_movie.categories.add(category)
+        self.premium_movie.categories.add(category)
+        self.regular_movie.is_featured = True
+        self.regular_movie.is_trending = True
+        self.regular_movie.save()
+
+        response = self.client.get(reverse('movies:home-feed'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = self._get_response_data(response)
+        self.assertEqual([m['slug'] for m in data['featured']], ['test-movie'])
+        self.assertEqual([m['slug'] for m in data['trending']], ['test-movie'])
+        self.assertEqual(data['categories'][0]['slug'], 'movies')
+        self.assertEqual([m['slug'] for m in data['categories'][0]['movies']], ['test-movie'])
+
+        self.client.force_authenticate(user=self.premium_user)
+        response = self.client.get(reverse('movies:home-feed'))
+        data = self._get_response_data(response)
+        self.assertEqual(len(data['categories'][0]['movies']), 2)
+
+    def test_movie_batch_keeps_order_and_reports_missing(self):
+        url = reverse('movies:movie-batch')
+        ids = f'{self.premium_movie.id},{self.regular_movie.id},999999'
+        response = self.client.get(url, {'ids': ids, 'slugs': 'test-movie,unknown'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = self._get_response_data(response)
+        self.assertEqual([m['slug'] for m in data['results']], ['test-movie', 'test-movie'])
+        self.assertEqual(data['missing']['ids'], [self.premium_movie.id, 999999])
+        self.assertEqual(data['missing']['slugs'], ['unknown'])
+
+        self.client.force_authenticate(user=self.premium_user)
+        response = self.client.get(url, {'ids': ids})
+        data = self._get_response_data(response)
+        self.assertEqual([m['slug'] for m in data['results']], ['premium-movie', 'test-movie'])
+
+    def test_movie_batch_sparse_fields_without_id(self):
+        url = reverse('movies:movie-batch')
+
+        response = self.client.get(url, {'ids': str(self.regular_movie.id), 'fields': 'title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._get_response_data(response)['results'], [{'title': self.regular_movie.title}])
+
+        response = self.client.get(url, {'slugs': 'test-movie', 'fields': 'slug'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._get_response_data(response)['results'], [{'slug': 'test-movie'}])
+
+    def test_movie_batch_validation(self):
+        url = reverse('movies:movie-batch')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'ids': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = ','.join(str(i) for i in range(51))
+        self.assertEqual(self.client.get(url, {'ids': too_many}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_movie_list_sparse_fields(self):
+        url = reverse('movies:movie-list')
+        response = self.client.get(url, {'fields': 'id,title,slug,poster,release_year'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        movie = self._get_response_data(response)['results'][0]
+        self.assertEqual(set(movie), {'id', 'title', 'slug', 'poster', 'release_year'})
+
+    def test_movie_list_fields_and_expand(self):
+        url = reverse('movies:movie-list')
+        response = self.client.get(url, {'fields': 'id,genres'})
+        movie = self._get_response_data(response)['results'][0]
+        self.assertEqual(movie['genres'], [self.genre.id])
+
+        response = self.client.get(url, {'fields': 'id', 'expand': 'genres'})
+        movie = self._get_response_data(response)['results'][0]
+        self.assertEqual(movie['genres'][0]['slug'], 'action')
+
+    def test_movie_list_sparse_fields_skip_prefetches(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        url = reverse('movies:movie-list')
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as sparse:
+            self.client.get(url, {'fields': 'id,title,slug'})
+        # categories and genres; average_rating is a stored column, not a ratings prefetch.
+        self.assertEqual(len(full) - len(sparse), 2)
+
+    def test_movie_list_conditional_get(self):
+        url = reverse('movies:movie-list')
+        response = self.client.get(url)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('Accept-Language', response['Vary'])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_deletes_are_never_answered_with_304(self):
+        from django.utils.http import http_date
+        from apps.movies.models import Video
+
+        # A client revalidating by date alone is never told a list is unchanged.
+        self.premium_movie.delete()
+        response = self.client.get(reverse('movies:movie-list'), HTTP_IF_MODIFIED_SINCE=http_date(2 ** 31))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        detail = reverse('movies:movie-detail', kwargs={'slug': self.regular_movie.slug})
+        old_video = Video.objects.create(movie=self.regular_movie, quality='480p', language='en')
+        Video.objects.filter(pk=old_video.pk).update(updated_at=self.regular_movie.updated_at.replace(year=2000))
+        Video.objects.create(movie=self.regular_movie, quality='720p', language='en')
+        etag = self.client.get(detail)['ETag']
+        old_video.delete()
+        response = self.client.get(detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_movie_list_etag_changes_after_edit(self):
+        url = reverse('movies:movie-list')
+        etag = self.client.get(url)['ETag']
+
+        self.regular_movie.title = 'Renamed Movie'
+        self.regular_movie.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_movie_list_etag_changes_after_counter_writes(self):
+        from apps.movies.utils.likes import flush_like_counts, like
+        from apps.ratings.utils import upsert_ratings
+        url = reverse('movies:movie-list')
+
+        etag = self.client.get(url)['ETag']
+        like(self.regular_user, self.regular_movie.id)
+        flush_like_counts()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            upsert_ratings(self.regular_user, [{'movie_id': self.regular_movie.id, 'score': 8}])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_movie_detail_conditional_get_still_counts_view(self):
+        url = reverse('movies:movie-detail', kwargs={'slug': self.regular_movie.slug})
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.regular_movie.refresh_from_db()
+        self.assertEqual(self.regular_movie.views_count, 2)
+
+        from apps.movies.models import Episode
+        Episode.objects.create(
+            tv_show=self.regular_movie, episode_number=1,
+            title='Pilot', description='First', duration=40
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+class AsyncMovieViewsTest(TestCase):
+    def setUp(self):
+        self.premium_user = User.objects.create_user(
+            username='premiumuser',
+            email='premium@example.com',
+            password='testpass123',
+            is_premium=True
+        )
+        self.regular_movie = Movie.objects.create(
+            title='Test Movie',
+            slug='test-movie',
+            description='Test description',
+            release_year=2023,
+            duration=120
+        )
+        self.premium_movie = Movie.objects.create(
+            title='Premium Movie',
+            slug='premium-movie',
+            description='Premium description',
+            release_year=2023,
+            duration=120,
+            is_premium=True
+        )
+
+    def _auth_header(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        return {'AUTHORIZATION': f'Bearer {AccessToken.for_user(self.premium_user)}'}
+
+    async def test_async_movie_list_premium_rules(self):
+        url = reverse('movies_async:movie-list')
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([m['slug'] for m in data['results']], ['test-movie'])
+        self.assertEqual(data['pagination']['total_items'], 1)
+
+        response = await self.async_client.get(url, headers=self._auth_header())
+        self.assertEqual(response.json()['pagination']['total_items'], 2)
+
+    def test_async_movie_list_matches_the_sync_list(self):
+        from apps.movies.models import Category
+
+        category = Category.objects.create(name='Drama', slug='drama')
+        self.regular_movie.categories.add(category)
+        headers = self._auth_header()
+        for params in ({'categories': category.id}, {'search': 'premium description'}, {}):
+            sync = self.client.get(reverse('movies:movie-list'), params, headers=headers)
+            async_ = self.client.get(reverse('movies_async:movie-list'), params, headers=headers)
+            self.assertEqual(async_.json(), sync.json())
+
+        response = self.client.get(reverse('movies_async:movie-list'), {'categories': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('categories', response.json()['errors'])
+
+    async def test_async_movie_detail_records_view(self):
+        url = reverse('movies_async:movie-detail', kwargs={'slug': 'test-movie'})
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['views_count'], 1)
+        self.assertEqual(await MovieView.objects.filter(movie=self.regular_movie).acount(), 1)
+
+        response = await self.async_client.get(
+            reverse('movies_async:movie-detail', kwargs={'slug': 'missing'})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_async_search(self):
+        response = await self.async_client.get(reverse('movies_async:movie-search'), {'q': 'Test'})
+        data = response.json()['data']
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['query'], 'Test')
+
+    async def test_async_invalid_token(self):
+        response = await self.async_client.get(
+            reverse('movies_async:trending-movies'),
+            headers={'AUTHORIZATION': 'Bearer invalid'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+class AdminCatalogImportViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        Genre.objects.create(name='Drama')
+
+    def test_upload_returns_import_report(self):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        upload = SimpleUploadedFile(
+            'catalog.csv',
+            b'title,description,release_year,duration,genres\nArrival,Aliens,2016,116,Drama\nBad,,x,1,\n',
+            content_type='text/csv'
+        )
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('admin_movies:movie-import'), {'file': upload}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual((data['rows'], data['created'], data['failed']), (2, 1, 1))
+        self.assertTrue(Movie.objects.filter(slug='arrival').exists())
+
+    def test_requires_file(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('admin_movies:movie-import'), {}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class AdminBulkActionViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.movies = [
+            Movie.objects.create(
+                title=f'Movie {number}', slug=f'movie-{number}', description='Description',
+                release_year=2020, duration=100
+            )
+            for number in range(3)
+        ]
+        self.url = reverse('admin_movies:movie-bulk-actions')
+
+    def post(self, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, data, format='json')
+
+    def test_action_runs_as_chunked_job(self):
+        with self.settings(BULK_JOBS={**settings.BULK_JOBS, 'CHUNK_SIZE': 2}):
+            response = self.post({'action': 'mark_premium', 'movie_ids': [movie.id for movie in self.movies]})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = BulkJob.objects.get(uuid=response.data['data']['uuid'])
+        self.assertEqual((job.status, job.processed, job.affected, job.chunk_size), ('succeeded', 3, 3, 2))
+        self.assertEqual(Movie.objects.filter(is_premium=True).count(), 3)
+
+        status_response = self.client.get(response.data['data']['status_url'])
+        self.assertEqual(status_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(status_response.data['data']['progress'], 100.0)
+
+    def test_delete_purges_views_ratings_and_comment_threads(self):
+        from apps.comments.models import Comment
+        from apps.ratings.models import Rating
+
+        movie, other = self.movies[0], self.movies[1]
+        MovieView.objects.create(movie=movie, ip_address='127.0.0.1')
+        Rating.objects.create(user=self.admin, movie=movie, score=8)
+        MovieSimilarity.objects.create(movie=other, similar_movie=movie, language='en', score=0.5, rank=1)
+        thread = Comment.objects.create(user=self.admin, movie=movie, text='Root')
+        reply = Comment.objects.create(user=self.admin, movie=movie, text='Reply', parent=thread)
+        Comment.objects.create(user=self.admin, movie=movie, text='Nested', parent=reply)
+        kept = Comment.objects.create(user=self.admin, movie=other, text='Other')
+
+        response = self.post({'action': 'delete', 'movie_ids': [movie.id]})
+
+        job = BulkJob.objects.get(uuid=response.data['data']['uuid'])
+        self.assertEqual((job.status, job.affected), ('succeeded', 1))
+        self.assertFalse(Movie.objects.filter(id=movie.id).exists())
+        self.assertFalse(MovieView.objects.exists())
+        self.assertFalse(Rating.objects.exists())
+        self.assertFalse(MovieSimilarity.objects.filter(similar_movie_id=movie.id).exists())
+        self.assertEqual(list(Comment.objects.all()), [kept])
+
+    def test_delete_and_deactivate_refresh_the_lists_holding_the_movies(self):
+        from apps.movies.utils.similarity import rebuild_all_similarities
+
+        rebuild_all_similarities(top_n=1)
+        first, second, third = self.movies
+        # Equal scores rank by id, so both other lists hold the first movie.
+        holders = set(MovieSimilarity.objects.filter(similar_movie=first).values_list('movie_id', 'language'))
+        self.assertEqual({movie_id for movie_id, _ in holders}, {second.id, third.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('admin_movies:movie-detail', kwargs={'pk': first.id}))
+        # The lists that held it fill the freed slot.
+        for movie_id, lang in holders:
+            self.assertTrue(MovieSimilarity.objects.filter(movie_id=movie_id, language=lang).exists())
+
+        self.post({'action': 'deactivate', 'movie_ids': [second.id]})
+        # Only the third movie is left visible, its list empties.
+        self.assertFalse(MovieSimilarity.objects.exists())
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.post({'action': 'explode', 'movie_ids': [1]}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post({'action': 'activate'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post({'action': 'activate', 'movie_ids': ['x']}).status_code, status.HTTP_400_BAD_REQUEST)
+
+class MovieFacetsViewTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('movies:movie-facets')
+        self.action = Genre.objects.create(name='Action', slug='action')
+        self.drama = Genre.objects.create(name='Drama', slug='drama')
+
+        def movie(slug, year, genres, content_type='movie', is_premium=False):
+            instance = Movie.objects.create(
+                title=slug.title(), slug=slug, description='Description', release_year=year,
+                duration=100, content_type=content_type, is_premium=is_premium
+            )
+            instance.genres.set(genres)
+            return instance
+
+        movie('heat', 1995, [self.action, self.drama])
+        movie('speed', 1994, [self.action])
+        movie('fargo', 1996, [self.drama], content_type='tv_show')
+        movie('locked', 1995, [self.action], is_premium=True)
+
+    def facets(self, params=None, **extra):
+        response = self.client.get(self.url, params or {}, **extra)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['data']
+
+    def counts(self, facet, data, key='slug'):
+        return {item[key]: item['count'] for item in data['facets'][facet]}
+
+    def test_facets_ignore_their_own_filter(self):
+        data = self.facets({'genre': 'action'})
+
+        self.assertEqual(data['total'], 2)
+        # Genres are counted without the genre filter, everything else with it.
+        self.assertEqual(self.counts('genres', data), {'action': 2, 'drama': 2})
+        self.assertEqual(self.counts('release_years', data, 'value'), {1995: 1, 1994: 1})
+        self.assertEqual(self.counts('content_types', data, 'value'), {'movie': 2})
+        self.assertEqual(self.counts('is_premium', data, 'value'), {False: 2})
+
+    def test_premium_titles_only_count_for_premium_users(self):
+        premium = User.objects.create_user(
+            username='premium', email='premium@example.com', password='testpass123', is_premium=True
+        )
+        self.client.force_authenticate(user=premium)
+
+        data = self.facets({'genre': 'action'})
+
+        self.assertEqual(data['total'], 3)
+        self.assertEqual(self.counts('is_premium', data, 'value'), {False: 2, True: 1})
+
+    def test_results_are_cached_per_signature_until_the_catalog_changes(self):
+        from apps.movies.utils.catalog import catalog_changed
+
+        self.facets({'genre': 'drama'})
+        with self.assertNumQueries(0):
+            self.facets({'genre': 'drama'})
+
+        Movie.objects.filter(slug='fargo').update(is_active=False)
+        self.assertEqual(self.facets({'genre': 'drama'})['total'], 2)
+        catalog_changed()
+        self.assertEqual(self.facets({'genre': 'drama'})['total'], 1)
+
+    def test_names_follow_the_language(self):
+        Genre.objects.filter(slug='drama').update(name_ru='Драма')
+        data = self.facets(HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertIn('Драма', {item['name'] for item in data['facets']['genres']})
+
+    def test_invalid_filter(self):
+        response = self.client.get(self.url, {'release_year': 'soon'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_totals_match_the_movie_list(self):
+        from apps.movies.models import Category
+
+        kids = Category.objects.create(name='Kids', slug='kids')
+        Movie.objects.get(slug='speed').categories.add(kids)
+
+        for query in (
+            'category=kids',
+            f'categories={kids.id}',
+            'genre=drama',
+            f'genres={self.action.id}&genres={self.drama.id}',
+            f'genre=action&categories={kids.id}&content_type=movie',
+            'search=hea,description',
+            'is_premium=false&release_year=1995',
+        ):
+            listed = self.client.get(f"{reverse('movies:movie-list')}?{query}").data['pagination']['total_items']
+            self.assertEqual(self.client.get(f'{self.url}?{query}').data['data']['total'], listed, query)
+
+class CatalogSnapshotListTest(TestCase):
+    def setUp(self):
+        import tempfile
+        from django.test import override_settings
+        from apps.movies.utils import catalog_snapshot
+
+        self.snapshot = catalog_snapshot
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        options = dict(settings.CATALOG_SNAPSHOT, ENABLED=True, PATH=f'{self.directory.name}/catalog.snap', RELOAD_INTERVAL=0)
+        overrides = override_settings(CATALOG_SNAPSHOT=options)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.reset()
+        self.addCleanup(self.reset)
+
+        self.client = APIClient()
+        self.url = reverse('movies:movie-list')
+        self.action = Genre.objects.create(name='Action', slug='action')
+        self.drama = Genre.objects.create(name='Drama', slug='drama')
+        for index in range(12):
+            movie = Movie.objects.create(
+                title=f'Movie {index}', slug=f'movie-{index}', description='Description',
+                release_year=1990 + index, duration=100, views_count=index * 5 % 12,
+                content_type='tv_show' if index % 5 == 0 else 'movie',
+                is_premium=index % 6 == 0, is_active=index != 7
+            )
+            movie.genres.set([self.action] if index % 2 else [self.action, self.drama])
+
+    def reset(self):
+        self.snapshot._current = None
+        self.snapshot._checked_at = 0.0
+
+    def ids(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [movie['id'] for movie in response.data['results']], response.data['pagination']['total_items']
+
+    def test_snapshot_pages_match_the_database(self):
+        cases = [
+            {},
+            {'ordering': 'views_count'},
+            {'ordering': '-release_year', 'page_size': 5, 'page': 2},
+            {'genre': 'drama', 'ordering': 'created_at'},
+            {'genres': self.drama.id, 'content_type': 'movie'},
+            {'is_premium': 'false', 'release_year': 1991},
+        ]
+        # Values are distinct per column: the database breaks ties arbitrarily, the snapshot by id.
+        expected = [self.ids(params) for params in cases]
+
+        self.snapshot.build_snapshot()
+        self.assertIsNotNone(self.snapshot.get_snapshot())
+        for params, result in zip(cases, expected):
+            self.assertEqual(self.ids(params), result, params)
+
+    def test_unsupported_requests_fall_back_to_the_orm(self):
+        self.snapshot.build_snapshot()
+        snapshot = self.snapshot.get_snapshot()
+
+        self.assertIsNone(snapshot.search(QueryDict(), False, 'title'))
+        self.assertIsNone(snapshot.search(QueryDict('search=movie'), False, '-created_at'))
+        self.assertEqual(self.ids({'ordering': 'title'})[1], 9)
+        self.assertEqual(self.ids({'search': 'Movie 1'})[1], 3)
+
+    def test_replaced_snapshot_is_picked_up(self):
+        self.snapshot.build_snapshot()
+        self.assertEqual(self.ids({})[1], 9)
+
+        Movie.objects.create(title='New', slug='new', description='Description', release_year=2000, duration=90)
+        # Until the rebuild the old columns answer, and the new row is not listed.
+        self.assertEqual(self.ids({})[1], 9)
+        self.snapshot.build_snapshot()
+        ids, total = self.ids({})
+        self.assertEqual(total, 10)
+        self.assertEqual(ids[0], Movie.objects.get(slug='new').id)
+
+    def test_loop_rebuild_picks_up_counter_changes(self):
+        import io
+        from unittest import mock
+        from django.core.management import call_command
+
+        self.snapshot.build_snapshot()
+        top = self.ids({'ordering': '-views_count'})[0][0]
+        bottom = self.ids({'ordering': 'views_count'})[0][0]
+        Movie.objects.filter(pk=bottom).update(views_count=1000)
+
+        command = 'apps.movies.management.commands.build_catalog_snapshot'
+        # The loop is stopped at its second wait, after two rebuilds; the test's
+        # transaction keeps its connection.
+        with mock.patch(f'{command}.close_old_connections'), \
+                mock.patch('time.sleep', side_effect=[None, KeyboardInterrupt]) as sleep, \
+                self.assertRaises(KeyboardInterrupt):
+            call_command('build_catalog_snapshot', '--loop', '--interval', '0', stdout=io.StringIO())
+
+        self.assertEqual(sleep.call_count, 2)
+        self.assertNotEqual(top, bottom)
+        self.assertEqual(self.ids({'ordering': '-views_count'})[0][0], bottom)
+
+class MovieAutocompleteViewTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.movies.utils import autocomplete
+
+        cache.clear()
+        autocomplete._index = None
+        self.addCleanup(setattr, autocomplete, '_index', None)
+        self.client = APIClient()
+        self.url = reverse('movies:movie-autocomplete')
+        self.movie = Movie.objects.create(
+            slug='shum-bola', title_en='The Naughty Boy', title_uz='Shum bola', title_ru='Шум бола',
+            description='Description', release_year=1977, duration=90, poster='movie_posters/shum.jpg'
+        )
+
+    def test_returns_compact_results_in_the_request_language(self):
+        response = self.client.get(self.url, {'q': 'шум'}, HTTP_ACCEPT_LANGUAGE='uz')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        [result] = response.data['data']['results']
+        self.assertEqual(set(result), {'id', 'slug', 'title', 'poster'})
+        self.assertEqual(result['title'], 'Shum bola')
+        self.assertTrue(result['poster'].endswith('movie_posters/shum.jpg'))
+
+    def test_blank_query_returns_nothing(self):
+        response = self.client.get(self.url, {'q': ' !'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['results'], [])
+
+    def test_detail_views_log_no_change(self):
+        from django.core.cache import cache
+        from apps.movies.utils.autocomplete import SEQUENCE_KEY
+
+        sequence = cache.get(SEQUENCE_KEY, 0)
+        url = reverse('movies:movie-detail', kwargs={'slug': self.movie.slug})
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                self.client.get(url)
+            self.movie.refresh_from_db()
+            self.movie.save(update_fields=['views_count'])
+
+        self.assertEqual(self.movie.views_count, 3)
+        self.assertEqual(cache.get(SEQUENCE_KEY, 0), sequence)
+
+class SeasonViewsTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.movies.models import Episode
+
+        cache.clear()
+        self.client = APIClient()
+        self.show = Movie.objects.create(
+            title='Long Show', slug='long-show', description='Description',
+            release_year=2010, duration=45, content_type='tv_show'
+        )
+        for season, episodes in ((1, 3), (2, 25)):
+            for number in range(1, episodes + 1):
+                Episode.objects.create(
+                    tv_show=self.show, season_number=season, episode_number=number,
+                    title=f'S{season}E{number}', description='Episode', duration=40 + season
+                )
+
+    def test_detail_embeds_the_season_index_instead_of_episodes(self):
+        response = self.client.get(reverse('movies:movie-detail', kwargs={'slug': self.show.slug}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertNotIn('episodes', data)
+        self.assertEqual(data['seasons'], [
+            {'season_number': 1, 'episodes_count': 3, 'total_duration': 123},
+            {'season_number': 2, 'episodes_count': 25, 'total_duration': 1050},
+        ])
+
+    def test_season_episodes_are_paginated_by_show_id(self):
+        url = reverse('movies:tv-show-season-episodes', kwargs={'pk': self.show.pk, 'season_number': 2})
+        response = self.client.get(url, {'page': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['pagination']['total_items'], 25)
+        self.assertEqual([episode['episode_number'] for episode in response.data['results']], [21, 22, 23, 24, 25])
+
+    def test_episode_edits_invalidate_the_cached_index(self):
+        from apps.movies.models import Episode
+
+        url = reverse('movies:tv-show-seasons', kwargs={'pk': self.show.pk})
+        self.assertEqual(len(self.client.get(url).data['data']), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Episode.objects.create(
+                tv_show=self.show, season_number=3, episode_number=1,
+                title='S3E1', description='Episode', duration=50
+            )
+        self.assertEqual(self.client.get(url).data['data'][-1], {
+            'season_number': 3, 'episodes_count': 1, 'total_duration': 50
+        })
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Episode.objects.filter(season_number=3).delete()
+        self.assertEqual(len(self.client.get(url).data['data']), 2)
+
+    def test_inactive_show_is_not_found(self):
+        Movie.objects.filter(pk=self.show.pk).update(is_active=False)
+
+        response = self.client.get(reverse('movies:tv-show-seasons', kwargs={'pk': self.show.pk}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            reverse('movies:tv-show-season-episodes', kwargs={'pk': self.show.pk, 'season_number': 1})
+        )
+        self.assertEqual(response.data['pagination']['total_items'], 0)
+
+class PremiereBoundaryTest(TestCase):
+    def setUp(self):
+        from datetime import timedelta
+        from django.core.cache import cache
+        from django.utils import timezone
+
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('movies:premier-movies')
+        now = timezone.now()
+        self.live = Movie.objects.create(
+            title='Live', slug='live', description='Description', release_year=2024, duration=100,
+            is_premier=True, premier_date=now - timedelta(days=1), available_until=now + timedelta(hours=2)
+        )
+        self.upcoming = Movie.objects.create(
+            title='Upcoming', slug='upcoming', description='Description', release_year=2024, duration=100,
+            is_premier=True, premier_date=now + timedelta(hours=1)
+        )
+
+    def listed(self, url=None, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [movie['slug'] for movie in response.data['results']]
+
+    def test_cached_listing_flips_exactly_at_the_boundaries(self):
+        from unittest import mock
+
+        self.assertEqual(self.listed(available_until='active'), ['live'])
+        with self.assertNumQueries(5):
+            # The listing is cached: ETag versions of genres/categories, then the page and its prefetches.
+            self.assertEqual(self.listed(available_until='active'), ['live'])
+
+        with mock.patch('django.utils.timezone.now', return_value=self.upcoming.premier_date):
+            self.assertEqual(self.listed(available_until='active'), ['upcoming', 'live'])
+        with mock.patch('django.utils.timezone.now', return_value=self.live.available_until):
+            self.assertEqual(self.listed(available_until='active'), ['upcoming'])
+            self.assertEqual(self.listed(), ['upcoming', 'live'])
+
+    def test_etag_changes_when_one_title_replaces_another(self):
+        from unittest import mock
+
+        Movie.objects.update(updated_at=self.live.updated_at)
+        etag = self.client.get(self.url, {'available_until': 'active'})['ETag']
+        # At the upcoming premiere the live one closes: same count, same newest updated_at.
+        Movie.objects.filter(pk=self.live.pk).update(available_until=self.upcoming.premier_date)
+        with mock.patch('django.utils.timezone.now', return_value=self.upcoming.premier_date):
+            response = self.client.get(self.url, {'available_until': 'active'}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([movie['slug'] for movie in response.data['results']], ['upcoming'])
+
+    def test_home_feed_premier_rail_respects_the_boundary(self):
+        from unittest import mock
+
+        url = reverse('movies:home-feed')
+        rail = lambda: [movie['slug'] for movie in self.client.get(url).data['data']['premier']]
+        self.assertEqual(rail(), ['live'])
+
+        with mock.patch('django.utils.timezone.now', return_value=self.upcoming.premier_date):
+            self.assertEqual(rail(), ['upcoming', 'live'])
+
+    def test_scheduler_refreshes_the_listings(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from apps.movies.utils.premieres import get_listing
+
+        output = StringIO()
+        call_command('run_premiere_scheduler', '--once', stdout=output)
+
+        self.assertIn('1 premier titles live', output.getvalue())
+        listing = get_listing('active')
+        self.assertEqual(listing['ids'], [self.live.id])
+        self.assertEqual(listing['valid_until'], self.upcoming.premier_date)
+
+    def test_admin_actions_and_deletes_drop_the_cached_listing(self):
+        from django.utils import timezone
+
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='testpass123')
+        self.client.force_login(admin)
+        changelist = reverse('admin:movies_movie_changelist')
+        fresh = Movie.objects.create(
+            title='Fresh', slug='fresh', description='Description', release_year=2024, duration=100,
+            premier_date=timezone.now()
+        )
+        self.assertEqual(self.listed(), ['live'])
+
+        self.client.post(changelist, {'action': 'mark_as_premier', '_selected_action': [fresh.pk]})
+        self.assertEqual(self.listed(), ['fresh', 'live'])
+
+        self.client.post(reverse('admin:movies_movie_delete', args=[fresh.pk]), {'post': 'yes'})
+        self.assertEqual(self.listed(), ['live'])
+
+class TopRatedViewsTest(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        for slug, count, average, score in (
+            ('best', 500, 9.1, 9.0), ('good', 40, 8.0, 7.5), ('premium', 900, 9.5, 9.4), ('unrated', 0, 0, 0)
+        ):
+            Movie.objects.create(
+                title=slug, slug=slug, description='d', release_year=2020, duration=90, is_premium=slug == 'premium',
+                ratings_count=count, ratings_average=average, weighted_rating=score
+            )
+
+    def slugs(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [movie['slug'] for movie in response.data['results']]
+
+    def test_list_orders_by_weighted_rating(self):
+        response = self.client.get(reverse('movies:movie-list'), {'ordering': 'top_rated'})
+
+        self.assertEqual(self.slugs(response)[:2], ['best', 'good'])
+        self.assertEqual(response.data['results'][0]['average_rating'], 9.1)
+
+    def test_top_rated_list_is_cached_and_skips_unrated_titles(self):
+        url = reverse('movies:top-rated-movies')
+        self.assertEqual(self.slugs(self.client.get(url)), ['best', 'good'])
+
+        Movie.objects.filter(slug='good').update(weighted_rating=9.9)
+        self.assertEqual(self.slugs(self.client.get(url)), ['best', 'good'])
+
+        premium = User.objects.create_user(
+            username='premium', email='premium@example.com', password='testpass123', is_premium=True
+        )
+        self.client.force_authenticate(user=premium)
+        self.assertEqual(self.slugs(self.client.get(url)), ['good', 'premium', 'best'])
+
+class LikeWatchlistViewsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='fan', email='fan@example.com', password='testpass123')
+        self.movie = Movie.objects.create(title='Liked', slug='liked', description='d', release_year=2020, duration=90)
+        self.other = Movie.objects.create(title='Other', slug='other', description='d', release_year=2021, duration=90)
+        self.client.force_authenticate(user=self.user)
+
+    def test_like_is_idempotent_and_counted_through_shards(self):
+        from apps.movies.models import MovieLikeShard
+        from apps.movies.utils.likes import flush_like_counts
+
+        url = reverse('movies:movie-like', kwargs={'pk': self.movie.pk})
+        for _ in range(2):
+            response = self.client.post(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual((response.data['data']['liked'], response.data['data']['likes_count']), (True, 1))
+        # The movie row itself only changes when the shards are flushed.
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.likes_count, 0)
+
+        self.assertEqual(flush_like_counts(), 1)
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.likes_count, 1)
+        self.assertFalse(MovieLikeShard.objects.exists())
+
+        for _ in range(2):
+            response = self.client.delete(url)
+            self.assertEqual((response.data['data']['liked'], response.data['data']['likes_count']), (False, 0))
+        flush_like_counts()
+        self.movie.refresh_from_db()
+        self.assertEqual(self.movie.likes_count, 0)
+
+    def test_watchlist_add_list_and_remove(self):
+        for movie in (self.other, self.movie, self.movie):
+            response = self.client.post(reverse('movies:watchlist-item', kwargs={'pk': movie.pk}))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertTrue(response.data['data']['saved'])
+
+        response = self.client.get(reverse('movies:watchlist'))
+        self.assertEqual([movie['slug'] for movie in response.data['results']], ['liked', 'other'])
+
+        response = self.client.delete(reverse('movies:watchlist-item', kwargs={'pk': self.other.pk}))
+        self.assertFalse(response.data['data']['saved'])
+        response = self.client.get(reverse('movies:watchlist'))
+        self.assertEqual([movie['slug'] for movie in response.data['results']], ['liked'])
+
+    def test_library_state_marks_a_page_of_movies(self):
+        self.client.post(reverse('movies:movie-like', kwargs={'pk': self.movie.pk}))
+        self.client.post(reverse('movies:watchlist-item', kwargs={'pk': self.other.pk}))
+        url = reverse('movies:movie-library-state')
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'ids': f'{self.movie.pk},{self.other.pk},999999'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], {'liked': [self.movie.pk], 'saved': [self.other.pk]})
+        self.assertEqual(self.client.get(url, {'ids': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication_and_an_active_movie(self):
+        Movie.objects.filter(pk=self.other.pk).update(is_active=False)
+        self.assertEqual(
+            self.client.post(reverse('movies:movie-like', kwargs={'pk': self.other.pk})).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(
+            self.client.post(reverse('movies:movie-like', kwargs={'pk': self.movie.pk})).status_code,
+            status.HTTP_401_UNAUTHORIZED
+        )
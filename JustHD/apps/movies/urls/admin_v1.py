@@ -5,7 +5,8 @@ from ..views.admin_views import (
     AdminMovieListCreateView, AdminMovieDetailView,
     AdminVideoListCreateView, AdminVideoDetailView,
     AdminEpisodeListCreateView, AdminEpisodeDetailView,
-    AdminDashboardView, AdminBulkActionView, AdminMovieAnalyticsView
+    AdminDashboardView, AdminBulkActionView, AdminMovieAnalyticsView,
+    AdminCatalogImportView
 )
 
 app_name = 'admin_movies'
@@ -22,6 +23,7 @@ urlpatterns = [
     path('movies/', AdminMovieListCreateView.as_view(), name='movie-list'),
     path('movies/<int:pk>/', AdminMovieDetailView.as_view(), name='movie-detail'),
     path('movies/bulk-actions/', AdminBulkActionView.as_view(), name='movie-bulk-actions'),
+    path('movies/import/', AdminCatalogImportView.as_view(), name='movie-import'),
     path('movies/analytics/', AdminMovieAnalyticsView.as_view(), name='movie-analytics'),
     path('movies/analytics/<int:movie_id>/', AdminMovieAnalyticsView.as_view(), name='movie-analytics-detail'),
     
@@ -0,0 +1,12 @@
+from django.urls import path
+from ..views import async_views
+
+app_name = 'movies_async'
+
+urlpatterns = [
+    path('', async_views.movie_list, name='movie-list'),
+    path('home/', async_views.home_feed, name='home-feed'),
+    path('search/', async_views.search_movies, name='movie-search'),
+    path('trending/', async_views.trending_movies, name='trending-movies'),
+    path('<slug:slug>/', async_views.movie_detail, name='movie-detail'),
+]
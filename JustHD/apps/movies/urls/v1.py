@@ -8,13 +8,29 @@ urlpatterns = [
     path('categories/', views.CategoryListView.as_view(), name='category-list'),
     path('genres/', views.GenreListView.as_view(), name='genre-list'),
     path('', views.MovieListView.as_view(), name='movie-list'),
+    path('home/', views.HomeFeedView.as_view(), name='home-feed'),
+    path('facets/', views.MovieFacetsView.as_view(), name='movie-facets'),
+    path('batch/', views.MovieBatchView.as_view(), name='movie-batch'),
     path('search/', views.SearchMoviesView.as_view(), name='movie-search'),
+    path('autocomplete/', views.MovieAutocompleteView.as_view(), name='movie-autocomplete'),
     path('featured/', views.FeaturedMoviesView.as_view(), name='featured-movies'),
     path('trending/', views.TrendingMoviesView.as_view(), name='trending-movies'),
+    path('top-rated/', views.TopRatedMoviesView.as_view(), name='top-rated-movies'),
     path('premier/', views.PremierMoviesView.as_view(), name='premier-movies'),
+    path('watchlist/', views.WatchlistView.as_view(), name='watchlist'),
+    path('library/', views.MovieLibraryStateView.as_view(), name='movie-library-state'),
     path('<slug:slug>/', views.MovieDetailView.as_view(), name='movie-detail'),
     path('<slug:slug>/watch/', views.MovieWatchView.as_view(), name='movie-watch'),
+    path('<slug:slug>/similar/', views.SimilarMoviesView.as_view(), name='similar-movies'),
     path('<slug:slug>/episodes/', views.TVShowEpisodesView.as_view(), name='tv-show-episodes'),
+    path('<int:pk>/seasons/', views.SeasonListView.as_view(), name='tv-show-seasons'),
+    path(
+        '<int:pk>/seasons/<int:season_number>/episodes/',
+        views.SeasonEpisodesView.as_view(),
+        name='tv-show-season-episodes'
+    ),
+    path('<int:pk>/like/', views.MovieLikeView.as_view(), name='movie-like'),
+    path('<int:pk>/watchlist/', views.WatchlistItemView.as_view(), name='watchlist-item'),
     # Admin endpoints for frontend admin panel
     path('create/', AdminMovieListCreateView.as_view(), name='movie-create'),
     path('<int:pk>/update/', AdminMovieDetailView.as_view(), name='movie-update'),
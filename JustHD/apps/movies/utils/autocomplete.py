@@ -0,0 +1,247 @@
+"""
+In-memory title autocomplete.
+
+Every worker keeps a sorted list of ``(key, movie_id)`` entries per
+language, where the keys are the folded title starting at each of its
+words. A prefix is answered with two bisects and the most viewed titles in
+that range; answers are memoized until the next change.
+
+Folding lowercases, transliterates Cyrillic (Uzbek and Russian letters) to
+Uzbek Latin, strips accents and apostrophes and collapses everything else
+into single spaces, so "Ўткан кунлар", "O'tkan kunlar" and "otkan" all
+meet on the same key.
+
+Movie saves record their id in a change log in the cache; workers replay
+it on their next sync and only re-read those movies, into a copy of the
+index that then replaces the shared one, so requests reading it on other
+threads never see a half-applied change. A gap in the log or a
+catalog-wide change means a full rebuild, and the index is rebuilt in the
+background every REBUILD_INTERVAL to pick up new view counts.
+"""
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+SEQUENCE_KEY = 'movie_autocomplete:sequence'
+CHANGE_KEY = 'movie_autocomplete:change'
+CHANGE_TIMEOUT = 60 * 60 * 24
+FULL_REBUILD = 0
+MAX_KEY_WORDS = 8
+MEMO_SIZE = 4096
+
+CYRILLIC = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu',
+    'я': 'ya', 'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h', 'і': 'i', 'є': 'ye', 'ї': 'yi',
+}
+TRANSLITERATION = str.maketrans({
+    **CYRILLIC,
+    # o' and g' are spelled with any of these; the letter alone is the key.
+    "'": '', 'ʻ': '', 'ʼ': '', '‘': '', '’': '', '`': '',
+})
+SEPARATORS = re.compile(r'[\W_]+')
+
+_lock = threading.Lock()
+_index = None
+_synced_at = 0.0
+_rebuilding = False
+
+def fold(text):
+    """The search form of ``text``: lowercase Latin letters and digits separated by single spaces."""
+    # Transliterate before decomposing, NFKD would split й and ў into a base letter and a breve.
+    text = (text or '').casefold().translate(TRANSLITERATION)
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return SEPARATORS.sub(' ', text).strip()
+
+def title_keys(title):
+    """The folded title starting at each word, so inner words are prefixes too."""
+    words = fold(title).split()
+    return {' '.join(words[start:]) for start in range(min(len(words), MAX_KEY_WORDS))}
+
+def _languages():
+    return settings.MODELTRANSLATION_LANGUAGES
+
+def _title(row, lang):
+    # Same order modeltranslation falls back in when a translation is empty.
+    for code in (lang, *settings.MODELTRANSLATION_FALLBACK_LANGUAGES):
+        if row.get(f'title_{code}'):
+            return row[f'title_{code}']
+    return row.get('title') or ''
+
+def _rows(ids=None):
+    from apps.movies.models import Movie
+
+    queryset = Movie.objects.filter(is_active=True)
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    fields = ['id', 'slug', 'poster', 'views_count', 'is_premium', 'title']
+    fields += [f'title_{lang}' for lang in _languages()]
+    return queryset.values(*fields).iterator(chunk_size=2000)
+
+class AutocompleteIndex:
+    def __init__(self, sequence=0):
+        self.sequence = sequence
+        self.built_at = time.monotonic()
+        self.entries = {lang: [] for lang in _languages()}
+        self.keys = {}
+        self.movies = {}
+        self._memo = {}
+
+    @classmethod
+    def build(cls, sequence=0):
+        index = cls(sequence)
+        for row in _rows():
+            index._store(row)
+            for lang, keys in index.keys[row['id']].items():
+                index.entries[lang].extend((key, row['id']) for key in keys)
+        for entries in index.entries.values():
+            entries.sort()
+        return index
+
+    def _store(self, row):
+        movie_id = row['id']
+        titles = {lang: _title(row, lang) for lang in _languages()}
+        self.movies[movie_id] = (
+            row['slug'], titles, row['poster'] or '', row['views_count'], row['is_premium']
+        )
+        self.keys[movie_id] = {lang: title_keys(title) for lang, title in titles.items()}
+
+    def refreshed(self, ids, sequence):
+        """A copy with ``ids`` re-read from the database; this index is left as it is."""
+        index = AutocompleteIndex(sequence)
+        index.built_at = self.built_at
+        index.entries = {lang: list(entries) for lang, entries in self.entries.items()}
+        index.keys = dict(self.keys)
+        index.movies = dict(self.movies)
+        index.refresh(ids)
+        return index
+
+    # remove() and refresh() modify the index in place; only for copies not yet shared.
+    def remove(self, movie_id):
+        for lang, keys in self.keys.pop(movie_id, {}).items():
+            entries = self.entries[lang]
+            for key in keys:
+                position = bisect.bisect_left(entries, (key, movie_id))
+                if position < len(entries) and entries[position] == (key, movie_id):
+                    del entries[position]
+        self.movies.pop(movie_id, None)
+        self._memo.clear()
+
+    def refresh(self, ids):
+        """Re-read ``ids`` from the database; inactive or deleted movies drop out."""
+        for movie_id in ids:
+            self.remove(movie_id)
+        for row in _rows(ids):
+            self._store(row)
+            for lang, keys in self.keys[row['id']].items():
+                for key in keys:
+                    bisect.insort(self.entries[lang], (key, row['id']))
+        self._memo.clear()
+
+    def complete(self, query, lang, is_premium, limit):
+        """Ids of the ``limit`` most viewed titles with a word starting with ``query``."""
+        prefix = fold(query)
+        if not prefix:
+            return []
+        memo_key = (prefix, lang, bool(is_premium), limit)
+        ids = self._memo.get(memo_key)
+        if ids is None:
+            entries = self.entries.get(lang) or self.entries[_languages()[0]]
+            low = bisect.bisect_left(entries, (prefix,))
+            high = bisect.bisect_left(entries, (prefix + '\uffff',), low)
+            candidates = {movie_id for _, movie_id in entries[low:high]}
+            if not is_premium:
+                candidates = [movie_id for movie_id in candidates if not self.movies[movie_id][4]]
+            ids = heapq.nlargest(limit, candidates, key=lambda movie_id: (self.movies[movie_id][3], movie_id))
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            self._memo[memo_key] = ids
+        return ids
+
+    def results(self, ids, lang):
+        """``(id, slug, title, poster)`` tuples for ``ids``, titles in ``lang``."""
+        return [
+            (movie_id, self.movies[movie_id][0], self.movies[movie_id][1].get(lang, ''), self.movies[movie_id][2])
+            for movie_id in ids
+        ]
+
+def record_movie_changes(ids):
+    """Log changed movies so every worker re-reads them on its next sync."""
+    global _synced_at
+    ids = list(ids)
+    if len(ids) > settings.MOVIE_AUTOCOMPLETE['MAX_REPLAY']:
+        ids = [FULL_REBUILD]
+    for movie_id in ids:
+        try:
+            sequence = cache.incr(SEQUENCE_KEY)
+        except ValueError:
+            cache.add(SEQUENCE_KEY, 0, None)
+            sequence = cache.incr(SEQUENCE_KEY)
+        cache.set(f'{CHANGE_KEY}:{sequence}', movie_id, CHANGE_TIMEOUT)
+    # This worker sees its own changes on the next request.
+    _synced_at = 0.0
+
+def invalidate_autocomplete():
+    """For catalog-wide changes that bypass model signals (imports, queryset updates)."""
+    record_movie_changes([FULL_REBUILD])
+
+def _changes(since, until):
+    """Ids changed after ``since``, or None when the log cannot tell (expired entries, full rebuild)."""
+    # A sequence that went backwards means the cache was flushed.
+    if until < since or until - since > settings.MOVIE_AUTOCOMPLETE['MAX_REPLAY']:
+        return None
+    keys = [f'{CHANGE_KEY}:{sequence}' for sequence in range(since + 1, until + 1)]
+    logged = cache.get_many(keys)
+    if len(logged) != len(keys) or FULL_REBUILD in logged.values():
+        return None
+    return set(logged.values())
+
+def _rebuild_in_background():
+    global _index, _rebuilding
+    try:
+        index = AutocompleteIndex.build(cache.get(SEQUENCE_KEY, 0))
+        with _lock:
+            # Changes logged while building are replayed by the next sync.
+            _index = index
+    except Exception:
+        logger.exception('Autocomplete index rebuild failed')
+    finally:
+        _rebuilding = False
+        connections.close_all()
+
+def get_index():
+    """This worker's index, synced with the change log at most every SYNC_INTERVAL."""
+    global _index, _synced_at, _rebuilding
+    options = settings.MOVIE_AUTOCOMPLETE
+    now = time.monotonic()
+    if _index is not None and now - _synced_at < options['SYNC_INTERVAL']:
+        return _index
+    with _lock:
+        _synced_at = now
+        sequence = cache.get(SEQUENCE_KEY, 0)
+        if _index is None:
+            _index = AutocompleteIndex.build(sequence)
+            return _index
+        if sequence != _index.sequence:
+            changed = _changes(_index.sequence, sequence)
+            if changed is None:
+                _index = AutocompleteIndex.build(sequence)
+                return _index
+            _index = _index.refreshed(changed, sequence)
+        if now - _index.built_at > options['REBUILD_INTERVAL'] and not _rebuilding:
+            # Only view counts go stale here, keep answering from the current index meanwhile.
+            _rebuilding = True
+            threading.Thread(target=_rebuild_in_background, daemon=True).start()
+    return _index
@@ -0,0 +1,20 @@
+"""
+The catalog-changed hook.
+
+Every cache derived from movie rows is dropped from here, so code that
+changes movies without model signals (queryset updates, imports, admin
+actions and deletes) only has one function to call.
+"""
+from .catalog_snapshot import schedule_snapshot_rebuild
+from .facets import invalidate_movie_facets
+from .home_feed import invalidate_home_feed
+from .premieres import invalidate_premier_listings
+from .top_rated import invalidate_top_rated
+
+def catalog_changed():
+    """Drop the home feed, facet counts, premier and top-rated listings and rebuild the snapshot."""
+    invalidate_home_feed()
+    invalidate_movie_facets()
+    invalidate_premier_listings()
+    invalidate_top_rated()
+    schedule_snapshot_rebuild()
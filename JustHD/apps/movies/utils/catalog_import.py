@@ -0,0 +1,375 @@
+"""
+Streaming catalog import. Records are read lazily from CSV or JSONL and
+written in batches: taxonomy names are resolved with one query per batch,
+slugs are allocated set-wise, movies, episodes and videos are upserted with
+``bulk_create(update_conflicts=True)`` and M2M links are replaced in bulk.
+Invalid rows are reported and skipped; the rest of the batch is still saved.
+"""
+import csv
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import translation
+from django.utils.text import slugify
+from rest_framework.exceptions import ValidationError
+
+from apps.movies.models import Category, Episode, Genre, Movie, Video
+from apps.movies.serializers.admin import CatalogImportRowSerializer
+from apps.movies.utils.seasons import invalidate_season_index
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+LIST_SEPARATOR = '|'
+FORMATS = ('csv', 'jsonl')
+
+MOVIE_UPDATE_FIELDS = [
+    'release_year', 'duration', 'content_type', 'age_rating', 'trailer_url',
+    'imdb_rating', 'is_premium', 'is_active', 'updated_at',
+]
+EPISODE_UPDATE_FIELDS = ['duration', 'updated_at']
+VIDEO_UPDATE_FIELDS = ['subtitle_language', 'video_file', 'size', 'duration', 'updated_at']
+
+def _languages():
+    return settings.MODELTRANSLATION_LANGUAGES
+
+def _translated_fields(*names):
+    fields = []
+    for name in names:
+        fields.append(name)
+        fields.extend(f'{name}_{lang}' for lang in _languages())
+    return fields
+
+def detect_format(filename, default='csv'):
+    for fmt in FORMATS:
+        if filename and filename.lower().endswith(f'.{fmt}'):
+            return fmt
+    if filename and filename.lower().endswith('.json'):
+        return 'jsonl'
+    return default
+
+def _normalise(record):
+    """Map a raw CSV/JSON record onto ``CatalogImportRowSerializer`` input."""
+    data = {}
+    for key, value in record.items():
+        if key is None or value is None or value == '':
+            continue
+        key = key.strip()
+        # The default language may be given explicitly.
+        if key in ('title_en', 'description_en'):
+            key = key[:-3]
+        if key in ('genres', 'categories') and isinstance(value, str):
+            value = [name.strip() for name in value.split(LIST_SEPARATOR) if name.strip()]
+        elif key in ('episodes', 'videos') and isinstance(value, str):
+            value = json.loads(value)
+        data[key] = value
+    return data
+
+def read_records(stream, fmt):
+    """
+    Yield ``(line, data, error)`` for every record of ``stream``. Records are
+    parsed one at a time, so arbitrarily large files run in constant memory.
+    """
+    if fmt == 'jsonl':
+        for line, text in enumerate(stream, start=1):
+            text = text.strip()
+            if not text:
+                continue
+            try:
+                record = json.loads(text)
+                if not isinstance(record, dict):
+                    raise ValueError('Expected a JSON object')
+                yield line, _normalise(record), None
+            except ValueError as exc:
+                yield line, None, {'non_field_errors': [str(exc)]}
+    elif fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            try:
+                yield reader.line_num, _normalise(record), None
+            except ValueError as exc:
+                yield reader.line_num, None, {'non_field_errors': [str(exc)]}
+    else:
+        raise ValueError(f'Unsupported import format: {fmt}')
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    episodes: int = 0
+    videos: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return round(self.rows / self.elapsed, 1) if self.elapsed else 0.0
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'failed': self.failed,
+            'episodes': self.episodes,
+            'videos': self.videos,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'rows_per_second': self.rows_per_second,
+            'errors': self.errors,
+        }
+
+class TaxonomyResolver:
+    """Resolve genre or category names in any language, or slugs, to ids, one query per batch."""
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = {}
+
+    def _keys(self, obj):
+        keys = {obj.slug}
+        for name in _translated_fields('name'):
+            value = getattr(obj, name, None)
+            if value:
+                keys.add(value.casefold())
+        return keys
+
+    def resolve(self, names):
+        missing = {name for name in names if name.casefold() not in self.ids}
+        if missing:
+            lookups = [Q(slug__in={slugify(name) for name in missing})]
+            lookups += [Q(**{f'{name}__in': missing}) for name in _translated_fields('name')]
+            for obj in self.model.objects.filter(reduce(or_, lookups)):
+                for key in self._keys(obj):
+                    self.ids.setdefault(key, obj.id)
+            for name in missing:
+                if name.casefold() not in self.ids and slugify(name) in self.ids:
+                    self.ids[name.casefold()] = self.ids[slugify(name)]
+        return {name: self.ids.get(name.casefold()) for name in names}
+
+class CatalogImporter:
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.genres = TaxonomyResolver(Genre)
+        self.categories = TaxonomyResolver(Category)
+        self.report = ImportReport()
+        # One bound serializer validates every row, so its fields are only built once.
+        self.serializer = CatalogImportRowSerializer()
+
+    def run(self, records, progress=None):
+        """Import ``(line, data, error)`` records as produced by ``read_records``."""
+        started = time.perf_counter()
+        batch = []
+        # Writes name every translation column explicitly, independent of the request language.
+        with translation.override(settings.MODELTRANSLATION_DEFAULT_LANGUAGE):
+            for line, data, error in records:
+                self.report.rows += 1
+                if error:
+                    self.report.add_error(line, error)
+                    continue
+                batch.append((line, data))
+                if len(batch) >= self.batch_size:
+                    self.import_batch(batch)
+                    batch = []
+                    if progress:
+                        progress(self.report)
+            if batch:
+                self.import_batch(batch)
+        self.report.elapsed = time.perf_counter() - started
+        if progress:
+            progress(self.report)
+        return self.report
+
+    def import_batch(self, batch):
+        rows = self.validate(batch)
+        if not rows:
+            return
+        try:
+            with transaction.atomic():
+                self.write(rows)
+        except DatabaseError:
+            # Isolate the offending rows instead of losing the whole batch.
+            for row in rows:
+                try:
+                    with transaction.atomic():
+                        self.write([row])
+                except DatabaseError as exc:
+                    self.report.add_error(row['line'], {'non_field_errors': [str(exc).strip()]})
+
+    def validate(self, batch):
+        rows = []
+        for line, data in batch:
+            try:
+                rows.append({'line': line, **self.serializer.run_validation(data)})
+            except ValidationError as exc:
+                self.report.add_error(line, exc.detail)
+
+        genre_ids = self.genres.resolve({name for row in rows for name in row['genres']})
+        category_ids = self.categories.resolve({name for row in rows for name in row['categories']})
+        valid = []
+        for row in rows:
+            errors = {}
+            unknown_genres = [name for name in row['genres'] if genre_ids[name] is None]
+            if unknown_genres:
+                errors['genres'] = [f'Unknown genre: {name}' for name in unknown_genres]
+            unknown_categories = [name for name in row['categories'] if category_ids[name] is None]
+            if unknown_categories:
+                errors['categories'] = [f'Unknown category: {name}' for name in unknown_categories]
+            if errors:
+                self.report.add_error(row['line'], errors)
+                continue
+            row['genre_ids'] = {genre_ids[name] for name in row['genres']}
+            row['category_ids'] = {category_ids[name] for name in row['categories']}
+            valid.append(row)
+        return self.assign_slugs(valid)
+
+    def assign_slugs(self, rows):
+        """
+        Give every row a unique slug with two queries per batch. Rows without a
+        slug reuse the slug of an existing movie with the same title and year,
+        so importing a file twice updates instead of duplicating.
+        """
+        unslugged = [row for row in rows if not row.get('slug')]
+        existing = {}
+        if unslugged:
+            matches = Movie.objects.filter(
+                title_en__in={row['title'] for row in unslugged},
+                release_year__in={row['release_year'] for row in unslugged},
+            ).order_by('id').values_list('title_en', 'release_year', 'slug')
+            for title, year, slug in matches:
+                existing.setdefault((title, year), slug)
+
+        fresh = []
+        for row in unslugged:
+            slug = existing.get((row['title'], row['release_year']))
+            if slug:
+                row['slug'] = slug
+            else:
+                row['base_slug'] = (slugify(row['title']) or 'movie')[:40]
+                fresh.append(row)
+
+        # Exact base slugs are checked through the index; only bases that are
+        # taken or repeated need a prefix scan for their numbered variants.
+        taken = {row['slug'] for row in rows if row.get('slug')}
+        if fresh:
+            bases = Counter(row['base_slug'] for row in fresh)
+            taken.update(Movie.objects.filter(slug__in=bases).values_list('slug', flat=True))
+            crowded = [base for base, count in bases.items() if count > 1 or base in taken]
+            if crowded:
+                taken.update(Movie.objects.filter(
+                    reduce(or_, [Q(slug__startswith=f'{base}-') for base in crowded])
+                ).values_list('slug', flat=True))
+
+        seen = set()
+        unique_rows = []
+        for row in rows:
+            if 'base_slug' in row:
+                slug, suffix = row['base_slug'], 2
+                while slug in taken:
+                    slug = f'{row["base_slug"]}-{suffix}'
+                    suffix += 1
+                row['slug'] = slug
+                taken.add(slug)
+            if row['slug'] in seen:
+                self.report.add_error(row['line'], {'slug': [f'Duplicate slug in this batch: {row["slug"]}']})
+                continue
+            seen.add(row['slug'])
+            unique_rows.append(row)
+        return unique_rows
+
+    def write(self, rows):
+        slugs = [row['slug'] for row in rows]
+        existing = set(Movie.objects.filter(slug__in=slugs).values_list('slug', flat=True))
+
+        movies = [self.build_movie(row) for row in rows]
+        Movie.objects.bulk_create(
+            movies,
+            update_conflicts=True,
+            unique_fields=['slug'],
+            update_fields=_translated_fields('title', 'description') + MOVIE_UPDATE_FIELDS,
+        )
+        movie_ids = dict(Movie.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+
+        self.replace_links(Movie.genres.through, 'genre_id', rows, movie_ids, 'genre_ids')
+        self.replace_links(Movie.categories.through, 'category_id', rows, movie_ids, 'category_ids')
+
+        episodes = [
+            self.build_episode(movie_ids[row['slug']], episode)
+            for row in rows for episode in row['episodes']
+        ]
+        Episode.objects.bulk_create(
+            episodes,
+            update_conflicts=True,
+            unique_fields=['tv_show', 'season_number', 'episode_number'],
+            update_fields=_translated_fields('title', 'description') + EPISODE_UPDATE_FIELDS,
+        )
+        # bulk_create sends no signals, so the season indexes are dropped here.
+        show_ids = {episode.tv_show_id for episode in episodes}
+        if show_ids:
+            transaction.on_commit(lambda: invalidate_season_index(show_ids))
+        videos = [
+            Video(movie_id=movie_ids[row['slug']], **video)
+            for row in rows for video in row['videos']
+        ]
+        Video.objects.bulk_create(
+            videos,
+            update_conflicts=True,
+            unique_fields=['movie', 'quality', 'language'],
+            update_fields=VIDEO_UPDATE_FIELDS,
+        )
+
+        self.report.created += len(rows) - len(existing)
+        self.report.updated += len(existing)
+        self.report.episodes += len(episodes)
+        self.report.videos += len(videos)
+
+    def replace_links(self, through, target, rows, movie_ids, key):
+        ids = [movie_ids[row['slug']] for row in rows]
+        through.objects.filter(movie_id__in=ids).delete()
+        through.objects.bulk_create([
+            through(movie_id=movie_ids[row['slug']], **{target: target_id})
+            for row in rows for target_id in row[key]
+        ])
+
+    def _translations(self, data, name):
+        # Required in every language; missing translations fall back to the default one.
+        values = {name: data.get(name, '')}
+        for lang in _languages():
+            values[f'{name}_{lang}'] = data.get(f'{name}_{lang}') or values[name]
+        return values
+
+    def build_movie(self, row):
+        fields = {
+            name: row.get(name) for name in MOVIE_UPDATE_FIELDS if name != 'updated_at'
+        }
+        return Movie(
+            slug=row['slug'],
+            **self._translations(row, 'title'),
+            **self._translations(row, 'description'),
+            **fields,
+        )
+
+    def build_episode(self, movie_id, episode):
+        return Episode(
+            tv_show_id=movie_id,
+            season_number=episode['season_number'],
+            episode_number=episode['episode_number'],
+            duration=episode['duration'],
+            **self._translations(episode, 'title'),
+            **self._translations(episode, 'description'),
+        )
+
+def import_catalog(stream, fmt, batch_size=BATCH_SIZE, progress=None):
+    return CatalogImporter(batch_size=batch_size).run(read_records(stream, fmt), progress=progress)
@@ -0,0 +1,324 @@
+"""
+Columnar snapshot of the catalog for answering MovieListView filters and
+orderings without the database.
+
+The snapshot is a single file: a JSON header followed by NumPy columns (ids,
+flag bits, years, content type codes, counters, genre/category bitsets and
+precomputed sort permutations). Every worker memory-maps it read-only, so
+the pages are shared through the OS page cache. Rebuilds write a new file
+and ``os.replace`` it over the old one; readers notice the new inode on
+their next check and remap, while mappings of the old file stay valid.
+
+Catalog changes schedule a rebuild in the worker that made them. Counters
+(views, likes, ratings) change without one, so ``build_catalog_snapshot
+--loop`` rebuilds every REBUILD_INTERVAL as well (the catalog-snapshot
+service in docker-compose.prod.yml); a snapshot older than MAX_AGE is not
+used at all.
+
+A request computes its page of ids from the columns and only those rows
+are loaded from the database. Anything the snapshot cannot answer exactly
+(search, title ordering, values the filters would reject) returns None and
+the caller uses the ORM.
+
+NumPy is imported on first use, it is not needed at worker boot.
+"""
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'JHDCAT01'
+ALIGNMENT = 64
+FLAG_ACTIVE = 1
+FLAG_PREMIUM = 2
+ORDERINGS = ('created_at', 'release_year', 'views_count', 'likes_count', 'weighted_rating')
+# What the is_premium filter's NullBooleanSelect accepts; anything else leaves it unfiltered.
+BOOLEANS = {'True': True, 'true': True, '2': True, 'False': False, 'false': False, '3': False}
+
+_lock = threading.Lock()
+_current = None
+_checked_at = 0.0
+_rebuild_timer = None
+
+def _options():
+    return settings.CATALOG_SNAPSHOT
+
+def _database_name():
+    return str(settings.DATABASES['default']['NAME'])
+
+def _bitset(np, rows, bits, count, width):
+    words = max((width + 63) // 64, 1)
+    bitset = np.zeros((count, words), dtype=np.uint64)
+    if len(rows):
+        np.bitwise_or.at(
+            bitset,
+            (rows, bits // 64),
+            np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64))
+        )
+    return bitset
+
+def build_columns():
+    """Read the catalog into columns; returns (header, {name: array})."""
+    import numpy as np
+    from apps.movies.models import Category, Genre, Movie
+
+    content_types = [value for value, _ in Movie.CONTENT_TYPES]
+    rows = list(Movie.objects.order_by('id').values_list(
+        'id', 'is_active', 'is_premium', 'release_year', 'content_type',
+        'views_count', 'likes_count', 'created_at', 'weighted_rating'
+    ))
+    count = len(rows)
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+    flags = np.fromiter(
+        ((FLAG_ACTIVE if row[1] else 0) | (FLAG_PREMIUM if row[2] else 0) for row in rows),
+        dtype=np.uint8, count=count
+    )
+    columns = {
+        'id': ids,
+        'flags': flags,
+        'release_year': np.fromiter((row[3] for row in rows), dtype=np.int32, count=count),
+        'content_type': np.fromiter(
+            (content_types.index(row[4]) if row[4] in content_types else 255 for row in rows),
+            dtype=np.uint8, count=count
+        ),
+        'views_count': np.fromiter((row[5] for row in rows), dtype=np.int64, count=count),
+        'likes_count': np.fromiter((row[6] for row in rows), dtype=np.int64, count=count),
+        'created_at': np.fromiter((int(row[7].timestamp() * 1_000_000) for row in rows), dtype=np.int64, count=count),
+        'weighted_rating': np.fromiter((row[8] for row in rows), dtype=np.float64, count=count),
+    }
+
+    genres = list(Genre.objects.order_by('id').values_list('id', 'slug'))
+    categories = list(Category.objects.order_by('id').values_list('id', flat=True))
+    for name, through, field, keys in (
+        ('genres', Movie.genres.through, 'genre_id', [pk for pk, _ in genres]),
+        ('categories', Movie.categories.through, 'category_id', categories),
+    ):
+        links = np.array(list(through.objects.values_list('movie_id', field)), dtype=np.int64).reshape(-1, 2)
+        positions = {key: bit for bit, key in enumerate(keys)}
+        link_rows = np.searchsorted(ids, links[:, 0])
+        link_bits = np.fromiter((positions[key] for key in links[:, 1].tolist()), dtype=np.int64, count=len(links))
+        columns[name] = _bitset(np, link_rows, link_bits, count, len(keys))
+
+    # Ascending permutations with ties broken by id; descending reads them backwards.
+    for name in ORDERINGS:
+        columns[f'order_{name}'] = np.lexsort((ids, columns[name])).astype(np.int32)
+
+    header = {
+        'built_at': datetime.now(dt_timezone.utc).isoformat(),
+        'version': f'{time.time_ns():x}',
+        'database': _database_name(),
+        'count': count,
+        'content_types': content_types,
+        'genre_bits': {str(pk): bit for bit, (pk, _) in enumerate(genres)},
+        'genre_slugs': {slug: bit for bit, (_, slug) in enumerate(genres)},
+        'category_bits': {str(pk): bit for bit, pk in enumerate(categories)},
+    }
+    return header, columns
+
+def write_snapshot(path, header, columns):
+    """Write the snapshot next to ``path`` and atomically move it into place."""
+    header = dict(header, columns={})
+    offset = 0
+    layout = []
+    for name, array in columns.items():
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        header['columns'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        layout.append((offset, array))
+        offset += array.nbytes
+
+    encoded = json.dumps(header).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(encoded)) // ALIGNMENT) * ALIGNMENT
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(MAGIC + struct.pack('<Q', len(encoded)) + encoded)
+        for column_offset, array in layout:
+            handle.seek(data_start + column_offset)
+            handle.write(array.tobytes())
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+def build_snapshot(path=None):
+    path = path or _options()['PATH']
+    started = time.perf_counter()
+    header, columns = build_columns()
+    write_snapshot(path, header, columns)
+    return header['count'], time.perf_counter() - started
+
+class CatalogSnapshot:
+    def __init__(self, path):
+        import numpy as np
+
+        self.path = path
+        stat = os.stat(path)
+        self.key = (stat.st_ino, stat.st_mtime_ns)
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a catalog snapshot')
+            (length,) = struct.unpack('<Q', handle.read(8))
+            self.header = json.loads(handle.read(length))
+        data_start = -(-(len(MAGIC) + 8 + length) // ALIGNMENT) * ALIGNMENT
+        self.columns = {}
+        for name, spec in self.header['columns'].items():
+            shape = tuple(spec['shape'])
+            if 0 in shape:
+                self.columns[name] = np.zeros(shape, dtype=np.dtype(spec['dtype']))
+                continue
+            self.columns[name] = np.memmap(
+                path, dtype=np.dtype(spec['dtype']), mode='r',
+                offset=data_start + spec['offset'], shape=shape
+            )
+        self.version = self.header['version']
+        self.built_at = datetime.fromisoformat(self.header['built_at'])
+
+    def _has_bit(self, column, bit):
+        words = self.columns[column]
+        return ((words[:, bit // 64] >> bit % 64) & 1).astype(bool)
+
+    def mask(self, params, is_premium):
+        """Boolean row mask for MovieListView's filters, or None if they need the ORM."""
+        if (params.get('search') or '').strip():
+            return None
+        flags = self.columns['flags']
+        mask = (flags & FLAG_ACTIVE) != 0
+        if not is_premium:
+            mask &= (flags & FLAG_PREMIUM) == 0
+
+        genre = params.get('genre')
+        if genre:
+            bit = self.header['genre_slugs'].get(genre)
+            if bit is None:
+                return mask & False
+            mask &= self._has_bit('genres', bit)
+        for param, column, bits in (
+            ('genres', 'genres', self.header['genre_bits']),
+            ('categories', 'categories', self.header['category_bits']),
+        ):
+            values = [value for value in params.getlist(param) if value != '']
+            if not values:
+                continue
+            # MovieListView also filters on the last ``genres`` value by hand, so
+            # several of them do not mean "any of"; leave that case to the ORM.
+            if any(value not in bits for value in values) or (param == 'genres' and len(values) > 1):
+                return None
+            matches = self._has_bit(column, bits[values[0]])
+            for value in values[1:]:
+                matches |= self._has_bit(column, bits[value])
+            mask &= matches
+
+        content_type = params.get('content_type')
+        if content_type:
+            if content_type not in self.header['content_types']:
+                return None
+            mask &= self.columns['content_type'] == self.header['content_types'].index(content_type)
+        value = BOOLEANS.get(params.get('is_premium'))
+        if value is not None:
+            mask &= ((flags & FLAG_PREMIUM) != 0) == value
+        release_year = params.get('release_year')
+        if release_year:
+            try:
+                mask &= self.columns['release_year'] == int(release_year)
+            except ValueError:
+                return None
+        return mask
+
+    def search(self, params, is_premium, ordering):
+        """Matching ids in ``ordering`` order, as a lazy sequence for the paginator."""
+        field = ordering.lstrip('-')
+        if field not in ORDERINGS:
+            return None
+        mask = self.mask(params, is_premium)
+        if mask is None:
+            return None
+        return SnapshotHits(self, mask, field, ordering.startswith('-'))
+
+class SnapshotHits:
+    """Sized, sliceable ids of a snapshot query; the order is only computed once sliced."""
+
+    def __init__(self, snapshot, mask, field, descending):
+        self.snapshot = snapshot
+        self.mask = mask
+        self.field = field
+        self.descending = descending
+        self._count = None
+        self._rows = None
+
+    def __len__(self):
+        if self._count is None:
+            self._count = int(self.mask.sum())
+        return self._count
+
+    def count(self):
+        return len(self)
+
+    def __getitem__(self, index):
+        if self._rows is None:
+            order = self.snapshot.columns[f'order_{self.field}']
+            if self.descending:
+                order = order[::-1]
+            self._rows = order[self.mask[order]]
+        return self.snapshot.columns['id'][self._rows[index]].tolist()
+
+def get_snapshot():
+    """The current snapshot of this database, remapped when the file was replaced."""
+    global _current, _checked_at
+    options = _options()
+    if not options['ENABLED']:
+        return None
+    now = time.monotonic()
+    if _current is not None and now - _checked_at < options['RELOAD_INTERVAL']:
+        return _usable(_current)
+    with _lock:
+        _checked_at = now
+        try:
+            stat = os.stat(options['PATH'])
+        except FileNotFoundError:
+            _current = None
+            return None
+        if _current is None or _current.key != (stat.st_ino, stat.st_mtime_ns):
+            try:
+                _current = CatalogSnapshot(options['PATH'])
+            except (ImportError, OSError, ValueError):
+                logger.exception('Could not map the catalog snapshot')
+                _current = None
+    return _usable(_current)
+
+def _usable(snapshot):
+    if snapshot is None or snapshot.header['database'] != _database_name():
+        return None
+    age = (datetime.now(dt_timezone.utc) - snapshot.built_at).total_seconds()
+    return snapshot if age <= _options()['MAX_AGE'] else None
+
+def _rebuild():
+    global _rebuild_timer
+    _rebuild_timer = None
+    try:
+        build_snapshot()
+    except Exception:
+        logger.exception('Catalog snapshot rebuild failed')
+    finally:
+        connections.close_all()
+
+def schedule_snapshot_rebuild():
+    """Rebuild shortly after a catalog change; changes in the meantime share one rebuild."""
+    global _rebuild_timer
+    options = _options()
+    if not options['ENABLED']:
+        return
+    with _lock:
+        if _rebuild_timer is not None:
+            return
+        _rebuild_timer = threading.Timer(options['REBUILD_DELAY'], _rebuild)
+        _rebuild_timer.daemon = True
+        _rebuild_timer.start()
@@ -0,0 +1,145 @@
+"""
+Counts for the catalog filter sidebar.
+
+Every facet is counted under all active filters except its own, so picking
+a genre still shows how many titles the other genres would give. Each facet
+is one grouped query over the visible catalog, and the whole result is
+cached per filter signature, language and premium tier.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.http import QueryDict
+
+from apps.movies.filters import MovieListFilter
+from apps.movies.models import Category, Genre, Movie
+
+FACETS_TIMEOUT = 60 * 5
+GENERATION_KEY = 'movie_facets:generation'
+
+# Facet -> the MovieListView filter parameters it ignores while being counted.
+FACET_PARAMS = {
+    'genres': ('genre', 'genres'),
+    'categories': ('categories',),
+    'content_types': ('content_type',),
+    'release_years': ('release_year',),
+    'is_premium': ('is_premium',),
+}
+FILTER_PARAMS = tuple(param for params in FACET_PARAMS.values() for param in params)
+MULTIPLE_PARAMS = ('genres', 'categories')
+
+def visible_movies(is_premium):
+    """The titles MovieListView lists for a user of the given tier."""
+    queryset = Movie.objects.filter(is_active=True)
+    if not is_premium:
+        queryset = queryset.filter(is_premium=False)
+    return queryset
+
+def search_movies(queryset, search):
+    # The same terms MovieListView's SearchFilter matches: each one in the title or description.
+    for term in (search or '').replace('\x00', '').replace(',', ' ').split():
+        queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+    return queryset
+
+def filter_state(params):
+    """The filter parameters that affect the counts, empty ones dropped, in the list's form."""
+    state = {}
+    for param in FILTER_PARAMS + ('search',):
+        if param in MULTIPLE_PARAMS:
+            values = [value.strip() for value in params.getlist(param) if value.strip()]
+            if values:
+                state[param] = values
+            continue
+        value = (params.get(param) or '').strip()
+        if value:
+            state[param] = value
+    return state
+
+def filter_data(state, ignore=()):
+    """``state`` as the query data MovieListFilter reads, without the ``ignore`` parameters."""
+    data = QueryDict(mutable=True)
+    for param, value in state.items():
+        if param in ignore or param == 'search':
+            continue
+        if param in MULTIPLE_PARAMS:
+            data.setlist(param, value)
+        else:
+            data[param] = value
+    return data
+
+def invalidate_movie_facets():
+    # Bumping the generation orphans every cached signature at once.
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+def facets_cache_key(state, lang, is_premium):
+    tier = 'premium' if is_premium else 'free'
+    signature = hashlib.sha1(json.dumps(state, sort_keys=True).encode()).hexdigest()
+    generation = cache.get_or_set(GENERATION_KEY, 1, None)
+    return f'movie_facets:{generation}:{lang}:{tier}:{signature}'
+
+def _filtered(base, state, ignore=()):
+    return MovieListFilter(filter_data(state, ignore), queryset=base).qs
+
+def _grouped(queryset, field):
+    return dict(queryset.order_by().values_list(field).annotate(count=Count('id', distinct=True)))
+
+def _linked(through, field, movies):
+    return dict(
+        through.objects.filter(movie__in=movies.values('id')).order_by().values_list(field).annotate(
+            count=Count('movie_id', distinct=True)
+        )
+    )
+
+def compute_facets(state, lang, is_premium):
+    base = search_movies(visible_movies(is_premium), state.get('search'))
+
+    def without(facet):
+        return _filtered(base, state, FACET_PARAMS[facet])
+
+    genre_counts = _linked(Movie.genres.through, 'genre_id', without('genres'))
+    category_counts = _linked(Movie.categories.through, 'category_id', without('categories'))
+    content_type_counts = _grouped(without('content_types'), 'content_type')
+    year_counts = _grouped(without('release_years'), 'release_year')
+    premium_counts = _grouped(without('is_premium'), 'is_premium')
+
+    name = f'name_{lang}'
+    genres = Genre.objects.order_by(name).values_list('id', 'slug', name)
+    categories = Category.objects.filter(is_active=True).order_by('order', name).values_list('id', 'slug', name)
+    return {
+        'total': _filtered(base, state).order_by().values('id').distinct().count(),
+        'facets': {
+            'genres': [
+                {'id': pk, 'slug': slug, 'name': label, 'count': genre_counts.get(pk, 0)}
+                for pk, slug, label in genres
+            ],
+            'categories': [
+                {'id': pk, 'slug': slug, 'name': label, 'count': category_counts.get(pk, 0)}
+                for pk, slug, label in categories
+            ],
+            'content_types': [
+                {'value': value, 'label': str(label), 'count': content_type_counts[value]}
+                for value, label in Movie.CONTENT_TYPES if value in content_type_counts
+            ],
+            'release_years': [
+                {'value': year, 'count': year_counts[year]}
+                for year in sorted(year_counts, reverse=True)
+            ],
+            'is_premium': [
+                {'value': value, 'count': premium_counts[value]}
+                for value in (False, True) if value in premium_counts
+            ],
+        },
+    }
+
+def get_facets(state, lang, is_premium):
+    key = facets_cache_key(state, lang, is_premium)
+    data = cache.get(key)
+    if data is None:
+        data = compute_facets(state, lang, is_premium)
+        cache.set(key, data, FACETS_TIMEOUT)
+    return data
@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.movies.models import Category, Movie
+from apps.movies.serializers import CategorySerializer, MovieListSerializer
+from .premieres import cache_timeout, is_current, next_boundary, premier_movies
+from .trending import trending_queryset
+
+RAIL_SIZE = 20
+HOME_FEED_TIMEOUT = 60 * 5
+
+def home_feed_cache_key(lang, is_premium):
+    tier = 'premium' if is_premium else 'free'
+    return f'home_feed:{lang}:{tier}'
+
+def invalidate_home_feed():
+    cache.delete_many([
+        home_feed_cache_key(lang, is_premium)
+        for lang in settings.MODELTRANSLATION_LANGUAGES
+        for is_premium in (True, False)
+    ])
+
+def _rail_ids(queryset):
+    return list(queryset.values_list('id', flat=True)[:RAIL_SIZE])
+
+def build_home_feed(request, is_premium):
+    """
+    Assemble every home page rail. Rails are resolved to id lists first, then
+    all referenced movies are loaded and serialized once.
+    """
+    now = timezone.now()
+    visible = Movie.objects.filter(is_active=True)
+    if not is_premium:
+        visible = visible.filter(is_premium=False)
+
+    rails = {
+        'featured': _rail_ids(visible.filter(is_featured=True)),
+        'trending': _rail_ids(trending_queryset(visible)),
+        # Same rules as PremierMoviesView: premier titles are listed for every tier.
+        'premier': _rail_ids(premier_movies(now)),
+    }
+
+    categories = list(Category.objects.filter(is_active=True))
+    links = Movie.categories.through.objects.filter(
+        category__in=categories,
+        movie__in=visible
+    ).order_by('category_id', '-movie__created_at').values_list('category_id', 'movie_id')
+
+    category_rails = defaultdict(list)
+    for category_id, movie_id in links:
+        if len(category_rails[category_id]) < RAIL_SIZE:
+            category_rails[category_id].append(movie_id)
+
+    movie_ids = set()
+    for ids in rails.values():
+        movie_ids.update(ids)
+    for ids in category_rails.values():
+        movie_ids.update(ids)
+
+    movies = Movie.objects.filter(id__in=movie_ids).prefetch_related('categories', 'genres')
+    # The feed is cached per language and tier, so it always has the full shape.
+    context = {'request': request, 'sparse_fields': False}
+    serialized = {
+        item['id']: item
+        for item in MovieListSerializer(movies, many=True, context=context).data
+    }
+
+    data = {name: [serialized[movie_id] for movie_id in ids] for name, ids in rails.items()}
+    data['categories'] = []
+    for category in categories:
+        category_data = CategorySerializer(category, context=context).data
+        category_data['movies'] = [serialized[movie_id] for movie_id in category_rails[category.id]]
+        data['categories'].append(category_data)
+    return data
+
+def refresh_home_feed(request, is_premium):
+    """Build and cache the feed; the premier rail makes it valid until the next premiere boundary at most."""
+    now = timezone.now()
+    valid_until = next_boundary(now)
+    cached = {'data': build_home_feed(request, is_premium), 'valid_until': valid_until}
+    cache.set(
+        home_feed_cache_key(getattr(request, 'lang', 'en'), is_premium),
+        cached,
+        cache_timeout(valid_until, now, HOME_FEED_TIMEOUT)
+    )
+    return cached
+
+def get_home_feed(request, is_premium):
+    cached = cache.get(home_feed_cache_key(getattr(request, 'lang', 'en'), is_premium))
+    if cached is None or not is_current(cached['valid_until'], timezone.now()):
+        cached = refresh_home_feed(request, is_premium)
+    return cached['data']
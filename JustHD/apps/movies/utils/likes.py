@@ -0,0 +1,96 @@
+"""
+Likes and the watchlist.
+
+Liking never writes the movie row. Each like or unlike adds +1/-1 to one of
+LIKE_SHARDS counter rows of the movie, picked at random, so concurrent likes
+of a popular title rarely wait for the same row lock. ``flush_like_counts``
+folds the shards into ``Movie.likes_count`` from cron; until then
+``current_likes_count`` adds the pending deltas where an exact number is shown.
+"""
+import random
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Sum, Value, When
+from django.utils import timezone
+
+from apps.movies.models import Movie, MovieLike, MovieLikeShard, WatchlistItem
+
+LIKE_SHARDS = 16
+FLUSH_BATCH_SIZE = 500
+
+def _bump(movie_id, delta):
+    shard = random.randrange(LIKE_SHARDS)
+    shards = MovieLikeShard.objects.filter(movie_id=movie_id, shard=shard)
+    if not shards.update(delta=F('delta') + delta):
+        # The shard was flushed away (or never used); recreate it and retry once.
+        MovieLikeShard.objects.bulk_create(
+            [MovieLikeShard(movie_id=movie_id, shard=shard)], ignore_conflicts=True
+        )
+        shards.update(delta=F('delta') + delta)
+
+def like(user, movie_id):
+    """Like ``movie_id``; returns False if the user already liked it."""
+    try:
+        with transaction.atomic():
+            MovieLike.objects.create(user=user, movie_id=movie_id)
+            _bump(movie_id, 1)
+    except IntegrityError:
+        return False
+    return True
+
+def unlike(user, movie_id):
+    """Remove the like; returns False if there was none."""
+    with transaction.atomic():
+        deleted, _ = MovieLike.objects.filter(user=user, movie_id=movie_id).delete()
+        if deleted:
+            _bump(movie_id, -1)
+    return bool(deleted)
+
+def save_to_watchlist(user, movie_id):
+    WatchlistItem.objects.bulk_create([WatchlistItem(user=user, movie_id=movie_id)], ignore_conflicts=True)
+
+def remove_from_watchlist(user, movie_id):
+    deleted, _ = WatchlistItem.objects.filter(user=user, movie_id=movie_id).delete()
+    return bool(deleted)
+
+def pending_likes(movie_ids):
+    """Likes of ``movie_ids`` not yet folded into likes_count, by movie id."""
+    return dict(
+        MovieLikeShard.objects.filter(movie_id__in=movie_ids).order_by().values_list('movie_id').annotate(
+            total=Sum('delta')
+        )
+    )
+
+def current_likes_count(movie):
+    return movie.likes_count + pending_likes([movie.id]).get(movie.id, 0)
+
+def library_state(user, movie_ids):
+    """Which of ``movie_ids`` the user liked and saved; one indexed query per table."""
+    return {
+        'liked': set(MovieLike.objects.filter(user=user, movie_id__in=movie_ids).values_list('movie_id', flat=True)),
+        'saved': set(WatchlistItem.objects.filter(user=user, movie_id__in=movie_ids).values_list('movie_id', flat=True)),
+    }
+
+def flush_like_counts():
+    """Fold the pending shards into likes_count; returns the number of updated movies."""
+    with transaction.atomic():
+        # Locked shards make concurrent likes wait; once these rows are gone
+        # their update matches nothing and they start a fresh shard.
+        shards = list(MovieLikeShard.objects.select_for_update().order_by('id').values_list('id', 'movie_id', 'delta'))
+        totals = Counter()
+        for _, movie_id, delta in shards:
+            totals[movie_id] += delta
+        changed = [(movie_id, total) for movie_id, total in sorted(totals.items()) if total]
+        now = timezone.now()
+        for start in range(0, len(changed), FLUSH_BATCH_SIZE):
+            batch = changed[start:start + FLUSH_BATCH_SIZE]
+            # updated_at moves with the count so list and detail ETags change.
+            Movie.objects.filter(id__in=[movie_id for movie_id, _ in batch]).update(
+                updated_at=now,
+                likes_count=F('likes_count') + Case(*[When(id=movie_id, then=Value(total)) for movie_id, total in batch])
+            )
+        shard_ids = [shard_id for shard_id, _, _ in shards]
+        for start in range(0, len(shard_ids), FLUSH_BATCH_SIZE):
+            MovieLikeShard.objects.filter(id__in=shard_ids[start:start + FLUSH_BATCH_SIZE]).delete()
+    return len(changed)
@@ -0,0 +1,76 @@
+"""
+Premiere windows: a premier title is listed from its ``premier_date`` until
+its ``available_until``.
+
+Listings are cached together with the next instant any window opens or
+closes. A cached listing is only used before that boundary, so between
+transitions requests never touch the database and never show a title past
+its window. ``run_premiere_scheduler`` sleeps until each boundary and
+rebuilds the listings right then, so the first request after a transition
+does not pay for it.
+"""
+import math
+
+from django.core.cache import cache
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from apps.movies.models import Movie
+
+PREMIERS_TIMEOUT = 60 * 60
+LISTING_KEY = 'premier_listing'
+LISTING_MODES = {'all': False, 'active': True}
+
+def premier_movies(now, active_only=True):
+    queryset = Movie.objects.filter(is_premier=True, is_active=True, premier_date__lte=now)
+    if active_only:
+        queryset = queryset.filter(Q(available_until__isnull=True) | Q(available_until__gt=now))
+    return queryset
+
+def next_boundary(now):
+    """The next premier_date or available_until after ``now``, or None if nothing is scheduled."""
+    result = Movie.objects.filter(is_premier=True, is_active=True).aggregate(
+        opens=Min('premier_date', filter=Q(premier_date__gt=now)),
+        closes=Min('available_until', filter=Q(available_until__gt=now)),
+    )
+    boundaries = [value for value in result.values() if value is not None]
+    return min(boundaries) if boundaries else None
+
+def is_current(valid_until, now):
+    return valid_until is None or now < valid_until
+
+def cache_timeout(valid_until, now, timeout):
+    """``timeout``, shortened so the entry expires by the boundary at the latest."""
+    if valid_until is None:
+        return timeout
+    return max(1, min(timeout, math.ceil((valid_until - now).total_seconds())))
+
+def listing_cache_key(mode):
+    return f'{LISTING_KEY}:{mode}'
+
+def build_listing(mode, now):
+    # The boundary is read first: a window that changes during the build only shortens the validity.
+    valid_until = next_boundary(now)
+    queryset = premier_movies(now, LISTING_MODES[mode])
+    return {
+        'ids': list(queryset.values_list('id', flat=True)),
+        'latest': queryset.aggregate(latest=Max('updated_at'))['latest'],
+        'valid_until': valid_until,
+    }
+
+def refresh_listing(mode, now=None):
+    now = now or timezone.now()
+    listing = build_listing(mode, now)
+    cache.set(listing_cache_key(mode), listing, cache_timeout(listing['valid_until'], now, PREMIERS_TIMEOUT))
+    return listing
+
+def get_listing(mode, now=None):
+    """Ids of the premier titles of ``mode`` ('all' or 'active'), newest first."""
+    now = now or timezone.now()
+    listing = cache.get(listing_cache_key(mode))
+    if listing is None or not is_current(listing['valid_until'], now):
+        listing = refresh_listing(mode, now)
+    return listing
+
+def invalidate_premier_listings():
+    cache.delete_many([listing_cache_key(mode) for mode in LISTING_MODES])
@@ -0,0 +1,34 @@
+"""
+Per-show season index: one row per season with its episode count and
+runtime, embedded in detail responses in place of the full episode list.
+Episodes themselves are paged per season by show id.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from apps.movies.models import Episode
+
+SEASONS_TIMEOUT = 60 * 60
+
+def seasons_cache_key(show_id):
+    return f'movie_seasons:{show_id}'
+
+def build_season_index(show_id):
+    rows = Episode.objects.filter(tv_show_id=show_id).order_by('season_number').values('season_number').annotate(
+        episodes_count=Count('id'),
+        total_duration=Sum('duration'),
+    )
+    return [
+        {
+            'season_number': row['season_number'],
+            'episodes_count': row['episodes_count'],
+            'total_duration': row['total_duration'] or 0,
+        }
+        for row in rows
+    ]
+
+def get_season_index(show_id):
+    return cache.get_or_set(seasons_cache_key(show_id), lambda: build_season_index(show_id), SEASONS_TIMEOUT)
+
+def invalidate_season_index(show_ids):
+    cache.delete_many([seasons_cache_key(show_id) for show_id in show_ids])
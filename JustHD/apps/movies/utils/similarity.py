@@ -0,0 +1,311 @@
+"""
+Content-based "more like this".
+
+Every active movie is a TF-IDF vector per language over its title,
+description and genre/category tags, L2-normalised so a dot product is the
+cosine similarity. The vectors form a sparse matrix held as NumPy CSR arrays
+and again by column; the scores of one movie against the catalog are a
+weighted bincount over the columns of its terms. That is the one sparse
+product needed here, so SciPy is not pulled in next to NumPy.
+
+The TOP_N neighbours are stored in MovieSimilarity and the lookup endpoint
+only reads them. Edits queue a refresh of the lists they can change as a
+bulk job (see ``schedule_similarity_refresh``), so queued ids survive a
+worker restart and run_bulk_jobs picks them up.
+
+NumPy is imported on first use, it is not needed at worker boot.
+"""
+import logging
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Min
+
+from apps.movies.models import Movie, MovieSimilarity
+from apps.shared.models import BulkJob
+from apps.shared.utils.bulk_jobs import heartbeat, run_job
+
+logger = logging.getLogger(__name__)
+
+TOP_N = 20
+TOKEN_RE = re.compile(r'\w{3,}', re.UNICODE)
+# Bulk job target of the queued refreshes (apps.shared.utils.bulk_jobs.TARGETS).
+REFRESH_TARGET = 'movie_similarities'
+REFRESH_CHUNK_SIZE = 1000
+
+_lock = threading.Lock()
+_refresh_timer = None
+
+def _languages():
+    return settings.MODELTRANSLATION_LANGUAGES
+
+def _tokenize(text):
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+def _load_documents():
+    """Term counts per language for every active movie, including genre and category tags."""
+    langs = _languages()
+    fields = ['id', 'title', 'description']
+    for lang in langs:
+        fields += [f'title_{lang}', f'description_{lang}']
+
+    tags = defaultdict(list)
+    genre_links = Movie.genres.through.objects.filter(
+        movie__is_active=True
+    ).values_list('movie_id', 'genre_id')
+    for movie_id, genre_id in genre_links:
+        tags[movie_id].append(f'genre:{genre_id}')
+    category_links = Movie.categories.through.objects.filter(
+        movie__is_active=True
+    ).values_list('movie_id', 'category_id')
+    for movie_id, category_id in category_links:
+        tags[movie_id].append(f'category:{category_id}')
+
+    documents = {lang: {} for lang in langs}
+    for row in Movie.objects.filter(is_active=True).values(*fields):
+        for lang in langs:
+            title = row[f'title_{lang}'] or row['title']
+            description = row[f'description_{lang}'] or row['description']
+            terms = Counter(_tokenize(title))
+            # Titles are short, so weight them above description words.
+            for term in list(terms):
+                terms[term] *= 2
+            terms.update(_tokenize(description))
+            terms.update(tags[row['id']])
+            documents[lang][row['id']] = terms
+    return documents
+
+class Vectors:
+    """Normalised TF-IDF rows of one language's documents, by row and by column."""
+
+    def __init__(self, documents):
+        import numpy as np
+
+        document_frequency = Counter()
+        for terms in documents.values():
+            document_frequency.update(terms.keys())
+        columns = {term: column for column, term in enumerate(document_frequency)}
+        frequencies = np.fromiter(document_frequency.values(), dtype=np.float64, count=len(columns))
+        idf = np.log((1 + len(documents)) / (1 + frequencies)) + 1
+
+        ids, indptr, indices, counts = [], [0], [], []
+        for movie_id, terms in documents.items():
+            if not terms:
+                continue
+            ids.append(movie_id)
+            indices.extend(columns[term] for term in terms)
+            counts.extend(terms.values())
+            indptr.append(len(indices))
+        self.ids = np.array(ids, dtype=np.int64)
+        self.rows = {movie_id: row for row, movie_id in enumerate(ids)}
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        rows = np.repeat(np.arange(len(ids)), np.diff(self.indptr))
+        data = (1 + np.log(np.array(counts, dtype=np.float64))) * idf[self.indices]
+        norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=len(ids)))
+        self.data = data / norms[rows]
+
+        order = np.argsort(self.indices, kind='stable')
+        self.column_ptr = np.concatenate(([0], np.cumsum(np.bincount(self.indices, minlength=len(columns)))))
+        self.column_rows = rows[order]
+        self.column_data = self.data[order]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def scores(self, movie_id):
+        """Cosine similarity of ``movie_id`` to every row; 0 for itself and rows sharing no term."""
+        import numpy as np
+
+        scores = np.zeros(len(self.ids))
+        row = self.rows.get(movie_id)
+        if row is None:
+            return scores
+        start, end = self.indptr[row], self.indptr[row + 1]
+        columns, weights = self.indices[start:end], self.data[start:end]
+        starts = self.column_ptr[columns]
+        lengths = self.column_ptr[columns + 1] - starts
+        # Every entry of those columns, gathered without a Python loop.
+        entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        scores += np.bincount(
+            self.column_rows[entries],
+            weights=self.column_data[entries] * np.repeat(weights, lengths),
+            minlength=len(self.ids)
+        )
+        scores[row] = 0
+        return scores
+
+    def neighbours(self, movie_id, top_n):
+        """The ``top_n`` best scored (movie id, score) pairs, ties by id."""
+        import numpy as np
+
+        scores = self.scores(movie_id)
+        candidates = np.flatnonzero(scores > 0)
+        ranked = candidates[np.lexsort((self.ids[candidates], -scores[candidates]))][:top_n]
+        return [(int(self.ids[row]), float(scores[row])) for row in ranked]
+
+def _store(movie_id, lang, neighbours):
+    # An upsert: two refreshes writing one list never trip over unique_together.
+    MovieSimilarity.objects.filter(movie_id=movie_id, language=lang).exclude(
+        similar_movie_id__in=[other_id for other_id, _ in neighbours]
+    ).delete()
+    _insert([
+        MovieSimilarity(
+            movie_id=movie_id,
+            similar_movie_id=other_id,
+            language=lang,
+            score=score,
+            rank=rank,
+        )
+        for rank, (other_id, score) in enumerate(neighbours, start=1)
+    ])
+
+def _insert(rows):
+    MovieSimilarity.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['movie', 'similar_movie', 'language'],
+        update_fields=['score', 'rank', 'updated_at'],
+    )
+
+def rebuild_all_similarities(top_n=TOP_N):
+    """Recompute the nearest neighbours of every active movie in every language."""
+    documents = _load_documents()
+    stored = 0
+    with transaction.atomic():
+        MovieSimilarity.objects.all().delete()
+        for lang, lang_documents in documents.items():
+            vectors = Vectors(lang_documents)
+            rows = [
+                MovieSimilarity(
+                    movie_id=movie_id,
+                    similar_movie_id=other_id,
+                    language=lang,
+                    score=score,
+                    rank=rank,
+                )
+                for movie_id in vectors
+                for rank, (other_id, score) in enumerate(vectors.neighbours(movie_id, top_n), start=1)
+            ]
+            _insert(rows)
+            stored += len(rows)
+    return stored
+
+def _affected(movie_ids, lang, vectors, top_n):
+    """
+    The lists that can change when ``movie_ids`` change: their own, the ones
+    that listed them, and every list they now rank into, i.e. lists with a
+    free slot or whose last score is below the new similarity (top-N is not
+    symmetric, so their own neighbours are not enough).
+    """
+    import numpy as np
+
+    affected = set(movie_ids)
+    affected.update(
+        MovieSimilarity.objects.filter(similar_movie_id__in=movie_ids, language=lang).values_list('movie_id', flat=True)
+    )
+    sizes = np.zeros(len(vectors.ids))
+    lowest = np.zeros(len(vectors.ids))
+    lists = MovieSimilarity.objects.filter(language=lang).order_by().values('movie_id').annotate(
+        size=Count('id'), lowest=Min('score')
+    )
+    for row in lists:
+        position = vectors.rows.get(row['movie_id'])
+        if position is not None:
+            sizes[position], lowest[position] = row['size'], row['lowest']
+    for movie_id in movie_ids:
+        scores = vectors.scores(movie_id)
+        reached = (scores > 0) & ((sizes < top_n) | (scores > lowest))
+        affected.update(vectors.ids[reached].tolist())
+    return affected
+
+def refresh_movie_similarities(movie_ids, top_n=TOP_N):
+    """
+    Refresh the neighbour lists touched by added, edited or removed movies
+    (see _affected); returns the number of lists rewritten.
+    """
+    movie_ids = set(movie_ids)
+    documents = _load_documents()
+    refreshed = 0
+    with transaction.atomic():
+        for lang, lang_documents in documents.items():
+            vectors = Vectors(lang_documents)
+            for movie_id in _affected(movie_ids, lang, vectors, top_n):
+                _store(movie_id, lang, vectors.neighbours(movie_id, top_n))
+                refreshed += 1
+            heartbeat()
+    return refreshed
+
+ACTIONS = {
+    'refresh': refresh_movie_similarities,
+}
+
+def _queue(movie_ids):
+    """Add ``movie_ids`` to the refresh job waiting to run, or record one; returns its id."""
+    with transaction.atomic():
+        # Locked, so a worker claiming it either waits for these ids or makes us record a new job.
+        job = BulkJob.objects.select_for_update().filter(
+            target=REFRESH_TARGET, status='pending'
+        ).order_by('created_at').first()
+        if job is None:
+            job = BulkJob.objects.create(
+                target=REFRESH_TARGET,
+                action='refresh',
+                object_ids=sorted(movie_ids),
+                total=len(movie_ids),
+                chunk_size=REFRESH_CHUNK_SIZE,
+            )
+        else:
+            object_ids = list(dict.fromkeys([*job.object_ids, *sorted(movie_ids)]))
+            BulkJob.objects.filter(pk=job.pk).update(object_ids=object_ids, total=len(object_ids))
+    return job.pk
+
+def _run_queued():
+    global _refresh_timer
+    with _lock:
+        _refresh_timer = None
+    try:
+        pending = BulkJob.objects.filter(target=REFRESH_TARGET, status='pending').order_by('created_at')
+        for job_id in pending.values_list('pk', flat=True):
+            run_job(job_id)
+    except Exception:
+        logger.exception('Similar movies refresh failed')
+    finally:
+        connections.close_all()
+
+def _schedule(movie_ids):
+    global _refresh_timer
+    job_id = _queue(movie_ids)
+    options = settings.MOVIE_SIMILARITIES
+    if not options['REFRESH_IN_BACKGROUND']:
+        run_job(job_id)
+        return
+    with _lock:
+        if _refresh_timer is not None:
+            return
+        _refresh_timer = threading.Timer(options['REFRESH_DELAY'], _run_queued)
+        _refresh_timer.daemon = True
+        _refresh_timer.start()
+
+def schedule_similarity_refresh(movie_ids):
+    """
+    Queue a refresh of the neighbour lists of edited movies once the edit
+    commits; edits close together share one job, since each run re-reads
+    the whole catalog. The job is run from a background timer, or by
+    run_bulk_jobs when this worker goes away first.
+
+    Call it before deleting movies: the lists that hold them are read here,
+    while their rows still exist, and refreshed so they fill the freed slot.
+    """
+    movie_ids = set(movie_ids)
+    movie_ids.update(
+        MovieSimilarity.objects.filter(similar_movie_id__in=movie_ids).values_list('movie_id', flat=True).distinct()
+    )
+    if movie_ids:
+        transaction.on_commit(lambda: _schedule(movie_ids))
@@ -0,0 +1,133 @@
+"""
+IMDb-style weighted rating:
+
+    WR = (v * R + m * C) / (v + m)
+
+with R and v a movie's mean score and vote count, C the mean score over all
+ratings and m the votes a movie needs before its own mean outweighs C. A
+single 10/10 vote stays close to C while thousands of 9s approach 9.
+
+The inputs live on the movie (ratings_count, ratings_average) and the
+result in the indexed weighted_rating column, so ordering and the top list
+never join ratings. Rating writes refresh their movies right away against
+the last computed C; compute_weighted_ratings recomputes C and every movie
+from cron, or as a service with --loop.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Case, Count, FloatField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from apps.movies.models import Movie
+
+MIN_VOTES = 25
+TOP_N = 250
+TOP_RATED_TIMEOUT = 60 * 10
+GLOBAL_MEAN_KEY = 'top_rated:global_mean'
+RATING_FIELDS = ['ratings_count', 'ratings_average', 'weighted_rating']
+# bulk_update skips auto_now; the rating columns are served, so a change
+# has to move updated_at for the list and detail ETags.
+UPDATE_FIELDS = RATING_FIELDS + ['updated_at']
+
+def weighted_rating(count, average, mean, min_votes=MIN_VOTES):
+    # Unrated titles sort last instead of sitting at the global mean.
+    if not count:
+        return 0
+    return (count * average + min_votes * mean) / (count + min_votes)
+
+def _rating_stats(ratings):
+    return {
+        row['movie_id']: (row['count'], row['average'])
+        for row in ratings.values('movie_id').annotate(count=Count('id'), average=Avg('score')).order_by()
+    }
+
+def global_mean():
+    mean = cache.get(GLOBAL_MEAN_KEY)
+    if mean is None:
+        from apps.ratings.models import Rating
+
+        mean = Rating.objects.aggregate(mean=Avg('score'))['mean'] or 0
+        cache.set(GLOBAL_MEAN_KEY, mean, None)
+    return mean
+
+def refresh_movie_ratings(movie_ids):
+    """
+    Recompute the stored rating columns of ``movie_ids`` from their ratings
+    in one UPDATE whose columns are subqueries over the ratings table.
+
+    The movie rows are locked first, so the UPDATE reads the ratings only
+    once every earlier refresh of the same movies has committed: concurrent
+    writers are applied in lock order and the last one always sees every
+    rating the others saw.
+    """
+    from apps.ratings.models import Rating
+
+    movie_ids = set(movie_ids)
+    if not movie_ids:
+        return
+    mean = global_mean()
+    ratings = Rating.objects.filter(movie_id=OuterRef('pk')).order_by().values('movie_id')
+    count = Coalesce(Subquery(ratings.annotate(count=Count('id')).values('count')), 0)
+    average = Coalesce(Subquery(ratings.annotate(average=Avg('score')).values('average')), 0.0)
+    votes = Cast(count, FloatField())
+    with transaction.atomic():
+        list(Movie.objects.select_for_update().filter(id__in=movie_ids).order_by('id').values_list('id', flat=True))
+        Movie.objects.filter(id__in=movie_ids).update(
+            ratings_count=count,
+            ratings_average=average,
+            # weighted_rating() in SQL, against the same subqueries.
+            weighted_rating=Case(
+                When(GreaterThan(count, 0), then=(votes * average + MIN_VOTES * mean) / (votes + MIN_VOTES)),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+            updated_at=timezone.now(),
+        )
+
+def compute_weighted_ratings(min_votes=MIN_VOTES):
+    """
+    Recompute the global mean and the rating columns of every movie; only
+    rows whose values changed are written. Returns the number of updated movies.
+    """
+    from apps.ratings.models import Rating
+
+    stats = _rating_stats(Rating.objects.all())
+    votes = sum(count for count, _ in stats.values())
+    mean = sum(count * average for count, average in stats.values()) / votes if votes else 0
+
+    now = timezone.now()
+    changed = []
+    current = Movie.objects.values_list('id', *RATING_FIELDS).iterator(chunk_size=5000)
+    for movie_id, *stored in current:
+        count, average = stats.get(movie_id, (0, 0))
+        values = [count, average, weighted_rating(count, average, mean, min_votes)]
+        if any(abs(new - old) > 1e-9 for new, old in zip(values, stored)):
+            changed.append(Movie(id=movie_id, updated_at=now, **dict(zip(RATING_FIELDS, values))))
+
+    with transaction.atomic():
+        Movie.objects.bulk_update(changed, UPDATE_FIELDS, batch_size=1000)
+    cache.set(GLOBAL_MEAN_KEY, mean, None)
+    invalidate_top_rated()
+    return len(changed)
+
+def top_rated_queryset(queryset):
+    return queryset.filter(ratings_count__gt=0).order_by('-weighted_rating', '-ratings_count', 'id')
+
+def top_rated_cache_key(is_premium):
+    return f'top_rated:{"premium" if is_premium else "free"}'
+
+def get_top_rated_ids(is_premium):
+    """Ids of the TOP_N best weighted visible titles, cached for TOP_RATED_TIMEOUT."""
+    from .facets import visible_movies
+
+    key = top_rated_cache_key(is_premium)
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(top_rated_queryset(visible_movies(is_premium)).values_list('id', flat=True)[:TOP_N])
+        cache.set(key, ids, TOP_RATED_TIMEOUT)
+    return ids
+
+def invalidate_top_rated():
+    cache.delete_many([top_rated_cache_key(is_premium) for is_premium in (True, False)])
@@ -0,0 +1,66 @@
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from apps.movies.models import Movie, MovieView
+
+HALF_LIFE_HOURS = 48
+WINDOW_DAYS = 14
+TOP_N = 100
+RATING_WEIGHT = 3.0
+
+def _decayed_activity(queryset, since, now, decay, weight, scores):
+    """
+    Add time-decayed activity to ``scores``. Events are bucketed per hour in
+    the database so the Python side only sees movies x hours rows.
+    """
+    buckets = queryset.filter(created_at__gte=since).annotate(
+        bucket=TruncHour('created_at')
+    ).values('movie_id', 'bucket').annotate(events=Count('id'))
+
+    for row in buckets:
+        age_hours = max((now - row['bucket']).total_seconds() / 3600, 0)
+        scores[row['movie_id']] += weight * row['events'] * math.exp(-decay * age_hours)
+
+def compute_trending_scores(half_life_hours=HALF_LIFE_HOURS, window_days=WINDOW_DAYS, top_n=TOP_N):
+    """
+    Score every movie by exponentially decayed recent views and ratings and
+    persist the score and rank of the top ``top_n`` active movies.
+    """
+    from apps.ratings.models import Rating
+
+    now = timezone.now()
+    since = now - timedelta(days=window_days)
+    decay = math.log(2) / half_life_hours
+
+    scores = defaultdict(float)
+    _decayed_activity(MovieView.objects.all(), since, now, decay, 1.0, scores)
+    _decayed_activity(Rating.objects.all(), since, now, decay, RATING_WEIGHT, scores)
+
+    active_ids = set(
+        Movie.objects.filter(id__in=scores.keys(), is_active=True).values_list('id', flat=True)
+    )
+    ranked = sorted(
+        ((movie_id, score) for movie_id, score in scores.items() if movie_id in active_ids),
+        key=lambda item: (-item[1], item[0])
+    )[:top_n]
+
+    with transaction.atomic():
+        Movie.objects.filter(trending_rank__isnull=False).update(trending_rank=None, trending_score=0)
+        movies = [
+            Movie(id=movie_id, trending_score=score, trending_rank=rank)
+            for rank, (movie_id, score) in enumerate(ranked, start=1)
+        ]
+        Movie.objects.bulk_update(movies, ['trending_score', 'trending_rank'], batch_size=500)
+    return len(movies)
+
+def trending_queryset(queryset):
+    """Editor-pinned titles (is_trending) first, then the precomputed ranks."""
+    return queryset.filter(
+        Q(is_trending=True) | Q(trending_rank__isnull=False)
+    ).order_by('-is_trending', F('trending_rank').asc(nulls_last=True), '-created_at')
@@ -0,0 +1,195 @@
+"""
+Monthly range partitions of ``movie_views`` on PostgreSQL.
+
+The parent table is partitioned on ``created_at`` with one partition per
+calendar month (UTC) named ``movie_views_yYYYYmMM``, plus a default
+partition that catches rows no month partition covers yet. Time-filtered
+queries only touch the months they need, and retiring a month is a
+``DETACH``/``DROP`` of its partition after the month has been rolled up
+into ``MovieViewMonthly``.
+
+On other databases ``movie_views`` is a plain table: partition management
+is a no-op and retention falls back to batched deletes.
+"""
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from apps.movies.models import MovieView, MovieViewMonthly
+from apps.shared.utils.bulk_jobs import delete_in_batches
+
+PARENT = 'movie_views'
+DEFAULT_PARTITION = 'movie_views_default'
+PARTITION_NAME = re.compile(r'^movie_views_y(\d{4})m(\d{2})$')
+
+def month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+def partition_name(month):
+    return f'{PARENT}_y{month.year}m{month.month:02d}'
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [PARENT])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+def partition_months():
+    """Months that currently have their own partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s)",
+            [PARENT]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            months.append(datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc))
+    return sorted(months)
+
+def _default_months(cursor):
+    cursor.execute(
+        f"SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC') FROM {DEFAULT_PARTITION}"
+    )
+    return [row[0].replace(tzinfo=dt_timezone.utc) for row in cursor.fetchall()]
+
+def create_partition(month):
+    """
+    Create and attach the partition of ``month``. Rows of that month that
+    already landed in the default partition are moved into it first, since
+    PostgreSQL refuses to attach a range the default partition has rows for.
+    """
+    name = partition_name(month)
+    upper = add_months(month, 1)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+            [month, upper]
+        )
+        # A matching CHECK lets ATTACH skip scanning the new partition.
+        cursor.execute(
+            f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds "
+            f"CHECK (created_at >= %s AND created_at < %s)",
+            [month, upper]
+        )
+        cursor.execute(
+            f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)",
+            [month, upper]
+        )
+        cursor.execute(f"ALTER TABLE {name} DROP CONSTRAINT {name}_bounds")
+    return name
+
+def ensure_partitions(ahead=3, start=None, now=None):
+    """
+    Create the missing partitions from ``start`` (default: the current
+    month) to ``ahead`` months in the future, and for every month found in
+    the default partition. Returns the names of the created partitions.
+    """
+    if not is_partitioned():
+        return []
+    current = month_start(now or timezone.now())
+    month = month_start(start) if start else current
+    wanted = set()
+    while month <= add_months(current, ahead):
+        wanted.add(month)
+        month = add_months(month, 1)
+    with connection.cursor() as cursor:
+        wanted.update(_default_months(cursor))
+    existing = set(partition_months())
+    return [create_partition(month) for month in sorted(wanted - existing)]
+
+def rollup_month(month):
+    """Store per-movie totals of ``month`` in MovieViewMonthly; safe to repeat."""
+    upper = add_months(month, 1)
+    totals = MovieView.objects.filter(created_at__gte=month, created_at__lt=upper).values('movie_id').annotate(
+        views=Count('id'),
+        viewers=Count('user_id', distinct=True),
+        watched_seconds=Sum('duration_watched'),
+    ).order_by()
+    rows = [
+        MovieViewMonthly(
+            movie_id=row['movie_id'],
+            month=month.date(),
+            views=row['views'],
+            viewers=row['viewers'],
+            watched_seconds=row['watched_seconds'] or 0,
+        )
+        for row in totals
+    ]
+    MovieViewMonthly.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['movie', 'month'],
+        update_fields=['views', 'viewers', 'watched_seconds', 'updated_at'],
+    )
+    return len(rows)
+
+def drop_month(month, detach_only=False):
+    """Remove the raw views of ``month`` once it has been rolled up."""
+    upper = add_months(month, 1)
+    if not is_partitioned():
+        return delete_in_batches(MovieView.objects.filter(created_at__gte=month, created_at__lt=upper))
+
+    name = partition_name(month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= %s AND created_at < %s",
+            [month, upper]
+        )
+        deleted = cursor.rowcount
+        if month in partition_months():
+            cursor.execute(f"SELECT count(*) FROM {name}")
+            deleted += cursor.fetchone()[0]
+            cursor.execute(f"ALTER TABLE {PARENT} DETACH PARTITION {name}")
+            if not detach_only:
+                cursor.execute(f"DROP TABLE {name}")
+    return deleted
+
+def expired_months(retain_months, now=None):
+    """Months older than the newest ``retain_months`` that still hold raw views."""
+    cutoff = add_months(month_start(now or timezone.now()), -retain_months)
+    if is_partitioned():
+        with connection.cursor() as cursor:
+            months = set(partition_months()) | set(_default_months(cursor))
+        return sorted(month for month in months if month < cutoff)
+
+    oldest = MovieView.objects.filter(created_at__lt=cutoff).order_by('created_at').values_list(
+        'created_at', flat=True
+    ).first()
+    months = []
+    month = month_start(oldest) if oldest else cutoff
+    while month < cutoff:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+def apply_retention(retain_months, detach_only=False, now=None):
+    """
+    Roll up and then drop every expired month. Returns
+    ``[(month, rolled_up_movies, dropped_views), ...]``.
+    """
+    results = []
+    for month in expired_months(retain_months, now):
+        rolled_up = rollup_month(month)
+        results.append((month, rolled_up, drop_month(month, detach_only=detach_only)))
+    return results
@@ -1,44 +1,56 @@
+import io
+
 from rest_framework import generics, permissions, status
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Sum, Avg
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import timedelta
 
-from ..models import Category, Genre, Movie, Video, Episode
+from ..bulk_actions import purge_children
+from ..models import Category, Genre, Movie, MovieView, Video, Episode
 from ..serializers.admin import (
     AdminCategorySerializer, AdminGenreSerializer,
     AdminMovieSerializer, AdminVideoSerializer, AdminEpisodeSerializer
 )
+from ..utils.catalog_import import BATCH_SIZE, FORMATS, detect_format, import_catalog
+from ..utils.similarity import schedule_similarity_refresh
+from ..utils.autocomplete import invalidate_autocomplete
+from ..utils.catalog import catalog_changed
+from apps.shared.mixins.metrics import SerializationMetricsMixin
 from apps.shared.utils.custom_response import CustomResponse
 from apps.shared.permissions.base_permissions import IsAdminUser, IsSuperUser
+from apps.shared.views import BulkActionView
 from apps.ratings.models import Rating
 from apps.comments.models import Comment
 from apps.users.models import User
 
-class AdminCategoryListCreateView(generics.ListCreateAPIView):
+class AdminCategoryListCreateView(SerializationMetricsMixin, generics.ListCreateAPIView):
     serializer_class = AdminCategorySerializer
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['is_active']
 
-class AdminCategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminCategoryDetailView(SerializationMetricsMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all()
     serializer_class = AdminCategorySerializer
     permission_classes = [IsAdminUser]
 
-class AdminGenreListCreateView(generics.ListCreateAPIView):
+class AdminGenreListCreateView(SerializationMetricsMixin, generics.ListCreateAPIView):
     serializer_class = AdminGenreSerializer
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend]
 
-class AdminGenreDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminGenreDetailView(SerializationMetricsMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Genre.objects.all()
     serializer_class = AdminGenreSerializer
     permission_classes = [IsAdminUser]
 
-class AdminMovieListCreateView(generics.ListCreateAPIView):
+class AdminMovieListCreateView(SerializationMetricsMixin, generics.ListCreateAPIView):
     serializer_class = AdminMovieSerializer
     permission_classes = [IsAdminUser]
     filter_backends = [DjangoFilterBackend]
@@ -62,7 +74,9 @@ class AdminMovieListCreateView(generics.ListCreateAPIView):
                 errors=serializer.errors,
                 request=request
             )
-        serializer.save()
+        movie = serializer.save()
+        schedule_similarity_refresh([movie.id])
+        catalog_changed()
         return CustomResponse.success(
             message_key="CREATED",
             request=request,
@@ -70,7 +84,7 @@ class AdminMovieListCreateView(generics.ListCreateAPIView):
             status_code=201
         )
 
-class AdminMovieDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminMovieDetailView(SerializationMetricsMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Movie.objects.all()
     serializer_class = AdminMovieSerializer
     permission_classes = [IsAdminUser]
@@ -93,7 +107,9 @@ class AdminMovieDetailView(generics.RetrieveUpdateDestroyAPIView):
                 errors=serializer.errors,
                 request=request
             )
-        serializer.save()
+        movie = serializer.save()
+        schedule_similarity_refresh([movie.id])
+        catalog_changed()
         return CustomResponse.success(
             message_key="UPDATED",
             request=request,
@@ -102,33 +118,37 @@ class AdminMovieDetailView(generics.RetrieveUpdateDestroyAPIView):
     
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.delete()
+        purge_children([instance.id])
+        with transaction.atomic():
+            schedule_similarity_refresh([instance.id])
+            instance.delete()
+        catalog_changed()
         return CustomResponse.success(
             message_key="DELETED",
             request=request,
             data={"message": "Movie deleted successfully"}
         )
 
-class AdminVideoListCreateView(generics.ListCreateAPIView):
+class AdminVideoListCreateView(SerializationMetricsMixin, generics.ListCreateAPIView):
     serializer_class = AdminVideoSerializer
     permission_classes = [IsAdminUser]
 
     def get_queryset(self):
         return Video.objects.select_related('movie')
 
-class AdminVideoDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminVideoDetailView(SerializationMetricsMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Video.objects.all()
     serializer_class = AdminVideoSerializer
     permission_classes = [IsAdminUser]
 
-class AdminEpisodeListCreateView(generics.ListCreateAPIView):
+class AdminEpisodeListCreateView(SerializationMetricsMixin, generics.ListCreateAPIView):
     serializer_class = AdminEpisodeSerializer
     permission_classes = [IsAdminUser]
 
     def get_queryset(self):
         return Episode.objects.select_related('tv_show')
 
-class AdminEpisodeDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AdminEpisodeDetailView(SerializationMetricsMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Episode.objects.all()
     serializer_class = AdminEpisodeSerializer
     permission_classes = [IsAdminUser]
@@ -182,50 +202,41 @@ class AdminDashboardView(APIView):
             data=data
         )
 
-class AdminBulkActionView(APIView):
+class AdminBulkActionView(BulkActionView):
+    target = 'movies'
+    ids_field = 'movie_ids'
+
+class AdminCatalogImportView(APIView):
+    """
+    Import a CSV or JSONL catalog upload. The file is streamed in batches;
+    very large catalogs are better served by the import_catalog command.
+    """
     permission_classes = [IsAdminUser]
-    
+    parser_classes = [MultiPartParser, FormParser]
+
     def post(self, request):
-        action = request.data.get('action')
-        movie_ids = request.data.get('movie_ids', [])
-        
-        if not action or not movie_ids:
+        upload = request.FILES.get('file')
+        if upload is None:
             return CustomResponse.validation_error(
-                errors={"detail": "Action and movie_ids are required"},
+                errors={"file": ["A CSV or JSONL file is required"]},
                 request=request
             )
-        
-        movies = Movie.objects.filter(id__in=movie_ids)
-        
-        if action == 'activate':
-            movies.update(is_active=True)
-            message = f"{movies.count()} movies activated"
-        elif action == 'deactivate':
-            movies.update(is_active=False)
-            message = f"{movies.count()} movies deactivated"
-        elif action == 'mark_premium':
-            movies.update(is_premium=True)
-            message = f"{movies.count()} movies marked as premium"
-        elif action == 'mark_free':
-            movies.update(is_premium=False)
-            message = f"{movies.count()} movies marked as free"
-        elif action == 'mark_premier':
-            movies.update(is_premier=True)
-            message = f"{movies.count()} movies marked as premier"
-        elif action == 'delete':
-            count = movies.count()
-            movies.delete()
-            message = f"{count} movies deleted"
-        else:
+        fmt = request.data.get('format') or detect_format(upload.name)
+        if fmt not in FORMATS:
             return CustomResponse.validation_error(
-                errors={"detail": "Invalid action"},
+                errors={"format": [f"Supported formats: {', '.join(FORMATS)}"]},
                 request=request
             )
-        
+
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        report = import_catalog(stream, fmt, batch_size=BATCH_SIZE)
+        if report.created or report.updated:
+            catalog_changed()
+            invalidate_autocomplete()
         return CustomResponse.success(
             message_key="SUCCESS_MESSAGE",
             request=request,
-            data={"message": message}
+            data=report.to_dict()
         )
 
 class AdminMovieAnalyticsView(APIView):
@@ -237,16 +248,23 @@ class AdminMovieAnalyticsView(APIView):
                 movie = Movie.objects.get(id=movie_id)
                 
                 total_views = movie.views_count
-                total_ratings = movie.ratings.count()
+                total_ratings = movie.ratings_count
                 total_comments = movie.comments.count()
-                avg_rating = movie.ratings.aggregate(avg=Avg('score'))['avg'] or 0
+                avg_rating = movie.ratings_average
                 
+                # Bounded on created_at, so only the last one or two monthly partitions are read.
+                since = timezone.now() - timedelta(days=30)
+                daily = dict(
+                    MovieView.objects.filter(movie=movie, created_at__gte=since).annotate(
+                        date=TruncDate('created_at')
+                    ).values('date').annotate(views=Count('id')).values_list('date', 'views')
+                )
                 views_by_date = []
                 for i in range(30, 0, -1):
-                    date = timezone.now() - timedelta(days=i)
+                    date = timezone.localdate() - timedelta(days=i)
                     views_by_date.append({
-                        'date': date.date().isoformat(),
-                        'views': 0
+                        'date': date.isoformat(),
+                        'views': daily.get(date, 0)
                     })
                 
                 data = {
@@ -269,7 +287,6 @@ class AdminMovieAnalyticsView(APIView):
                 return CustomResponse.not_found(request=request)
         
         movies = Movie.objects.annotate(
-            rating_avg=Avg('ratings__score'),
             comments_count=Count('comments')
         ).order_by('-views_count')[:10]
         
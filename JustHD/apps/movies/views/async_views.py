@@ -0,0 +1,196 @@
+"""
+Async (ASGI) versions of the hot catalog read endpoints. They return the same
+bodies (the CustomResponse envelope, or the bare page of the paginated movie
+list), filters and premium rules as the DRF views in views.py, but never block
+the event loop while waiting on the database, so a single uvicorn worker can
+serve many slow clients at once.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.http import JsonResponse
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from ..filters import MovieListFilter
+from ..models import Movie, MovieView
+from ..serializers import MovieListSerializer, MovieDetailSerializer
+from ..utils import facets
+from ..utils.home_feed import home_feed_cache_key, refresh_home_feed
+from ..utils.premieres import is_current
+from ..utils.trending import trending_queryset
+from .views import MOVIE_LIST_PREFETCHES, MovieListView, TrendingMoviesView
+from apps.shared.utils.custom_current_host import get_client_ip
+from apps.shared.utils.custom_pagination import CustomPageNumberPagination
+from apps.shared.utils.custom_response import ResponseBody
+
+def _json(body, status_code=200):
+    return JsonResponse(
+        body,
+        status=status_code,
+        encoder=JSONEncoder,
+        json_dumps_params={'ensure_ascii': False}
+    )
+
+def _respond(request, data=None, message_key="SUCCESS_MESSAGE", status_code=None, **kwargs):
+    body_maker = ResponseBody(message_key=message_key, request=request)
+    body = body_maker.to_dict(data=data, **kwargs)
+    return _json(body, status_code or body_maker.get_status_code())
+
+def _resolve_user(request):
+    result = JWTAuthentication().authenticate(request)
+    if result is not None:
+        return result[0]
+    # Resolve the lazy session user here, outside the event loop.
+    request.user.is_authenticated
+    return request.user
+
+async def _authenticate(request):
+    try:
+        request.user = await sync_to_async(_resolve_user)(request)
+    except (InvalidToken, AuthenticationFailed):
+        return False
+    return True
+
+def _is_premium(request):
+    user = request.user
+    return user.is_authenticated and user.has_active_premium
+
+def _visible_movies(request):
+    queryset = Movie.objects.filter(is_active=True)
+    if not _is_premium(request):
+        queryset = queryset.filter(is_premium=False)
+    return queryset
+
+def _serialize_list(request, movies):
+    # Every relation the serializer touches is prefetched, so this does no I/O.
+    return MovieListSerializer(movies, many=True, context={'request': request}).data
+
+async def _fetch(queryset):
+    return [item async for item in queryset]
+
+def _page_number(value, default):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+async def movie_list(request):
+    if not await _authenticate(request):
+        return _respond(request, message_key="UNAUTHORIZED", status_code=401)
+
+    filterset = MovieListFilter(request.GET, queryset=_visible_movies(request))
+    # Validating categories and genres looks the ids up.
+    if not await sync_to_async(filterset.is_valid)():
+        errors = {field: list(messages) for field, messages in filterset.errors.items()}
+        body = ResponseBody(message_key="VALIDATION_ERROR", request=request).to_dict(errors=errors)
+        return _json(body, 400)
+    queryset = facets.search_movies(filterset.qs, request.GET.get('search'))
+
+    ordering = request.GET.get('ordering', '')
+    terms = MovieListView.ordering_aliases.get(ordering, [ordering])
+    if all(term.lstrip('-') in MovieListView.ordering_fields for term in terms):
+        queryset = queryset.order_by(*terms)
+    else:
+        queryset = queryset.order_by(*MovieListView.ordering)
+
+    pagination = CustomPageNumberPagination
+    page_size = min(
+        _page_number(request.GET.get(pagination.page_size_query_param), pagination.page_size),
+        pagination.max_page_size
+    )
+    page = _page_number(request.GET.get(pagination.page_query_param), 1)
+    offset = (page - 1) * page_size
+
+    total, movies = await asyncio.gather(
+        queryset.acount(),
+        _fetch(queryset.prefetch_related(*MOVIE_LIST_PREFETCHES.values())[offset:offset + page_size]),
+    )
+    total_pages = (total + page_size - 1) // page_size
+
+    # Same bare page as CustomPageNumberPagination, without the envelope.
+    return _json({
+        'pagination': {
+            'total_items': total,
+            'total_pages': total_pages,
+            'current_page': page,
+            'page_size': len(movies),
+            'next_page': page + 1 if page < total_pages else None,
+            'prev_page': page - 1 if page > 1 else None,
+        },
+        'results': _serialize_list(request, movies),
+    })
+
+async def movie_detail(request, slug):
+    if not await _authenticate(request):
+        return _respond(request, message_key="UNAUTHORIZED", status_code=401)
+
+    queryset = Movie.objects.filter(is_active=True).prefetch_related(
+        'categories', 'genres', 'videos'
+    )
+    movie = await queryset.filter(slug=slug).afirst()
+    if movie is None:
+        return _respond(request, message_key="NOT_FOUND", status_code=404)
+
+    user = request.user
+    await asyncio.gather(
+        MovieView.objects.acreate(
+            movie=movie,
+            user=user if user.is_authenticated else None,
+            ip_address=get_client_ip(request)
+        ),
+        Movie.objects.filter(pk=movie.pk).aupdate(views_count=F('views_count') + 1),
+    )
+    movie.views_count += 1
+
+    # comments_count and is_watched query the database from the serializer.
+    data = await sync_to_async(
+        lambda: MovieDetailSerializer(movie, context={'request': request}).data
+    )()
+    return _respond(request, data=data)
+
+async def search_movies(request):
+    if not await _authenticate(request):
+        return _respond(request, message_key="UNAUTHORIZED", status_code=401)
+
+    query = request.GET.get('q', '').strip()
+    movies = []
+    if query:
+        queryset = Movie.objects.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(genres__name__icontains=query) |
+            Q(categories__name__icontains=query)
+        ).filter(is_active=True).distinct()
+        movies = await _fetch(queryset.prefetch_related(*MOVIE_LIST_PREFETCHES.values()))
+
+    results = _serialize_list(request, movies)
+    return _respond(request, data={
+        'query': request.GET.get('q', ''),
+        'results': results,
+        'count': len(results)
+    })
+
+async def trending_movies(request):
+    if not await _authenticate(request):
+        return _respond(request, message_key="UNAUTHORIZED", status_code=401)
+
+    queryset = trending_queryset(_visible_movies(request))[:TrendingMoviesView.limit]
+    movies = await _fetch(queryset.prefetch_related(*MOVIE_LIST_PREFETCHES.values()))
+    return _respond(request, data=_serialize_list(request, movies))
+
+async def home_feed(request):
+    if not await _authenticate(request):
+        return _respond(request, message_key="UNAUTHORIZED", status_code=401)
+
+    is_premium = _is_premium(request)
+    cache_key = home_feed_cache_key(getattr(request, 'lang', 'en'), is_premium)
+    cached = await cache.aget(cache_key)
+    if cached is None or not is_current(cached['valid_until'], timezone.now()):
+        cached = await sync_to_async(refresh_home_feed)(request, is_premium)
+    return _respond(request, data=cached['data'])
@@ -1,22 +1,53 @@
+from django.conf import settings
 from rest_framework import generics, permissions
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count, Avg, Q, F
-from django.utils import timezone
-from ..filters import MovieFilter
+from rest_framework.filters import SearchFilter
+from django.db.models import Count, Avg, Q, F, Max
+from ..filters import MovieListFilter, MovieOrderingFilter
 
-from ..models import Category, Genre, Movie, MovieView, Episode
+from ..models import Category, Genre, Movie, MovieView, Episode, MovieSimilarity, Video
 from ..serializers import (
     CategorySerializer, GenreSerializer, 
     MovieListSerializer, MovieDetailSerializer, 
     PremierMovieSerializer, EpisodeSerializer
 )
+from ..utils.trending import trending_queryset
+from ..utils.autocomplete import fold, get_index as get_autocomplete_index
+from ..utils.catalog_snapshot import get_snapshot
+from ..utils.facets import filter_data, filter_state, get_facets, visible_movies
+from ..utils.premieres import get_listing as get_premier_listing
+from ..utils.seasons import get_season_index
+from ..utils.top_rated import get_top_rated_ids
+from ..utils.home_feed import get_home_feed
+from ..utils.likes import (
+    current_likes_count, library_state, like, remove_from_watchlist, save_to_watchlist, unlike
+)
+from apps.shared.mixins.conditional import ConditionalGetMixin
+from apps.shared.mixins.dynamic_fields import DynamicFieldsViewMixin
+from apps.shared.mixins.metrics import SerializationMetricsMixin
+from apps.shared.utils.conditional import (
+    build_etag, latest_related_version, not_modified_response, related_count,
+    request_identity, set_validators
+)
 from apps.shared.utils.custom_response import CustomResponse
 from apps.shared.utils.decorators import premium_required
 from django.utils.decorators import method_decorator
 
-class CategoryListView(generics.ListAPIView):
+MOVIE_LIST_PREFETCHES = {
+    'categories': 'categories',
+    'genres': 'genres',
+}
+
+class CatalogConditionalMixin(ConditionalGetMixin):
+    def get_related_versions(self):
+        # Movie payloads embed categories and genres, so their edits count too.
+        return [
+            Category.objects.aggregate(latest=Max('updated_at'))['latest'],
+            Genre.objects.aggregate(latest=Max('updated_at'))['latest'],
+        ]
+
+class CategoryListView(ConditionalGetMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [SearchFilter]
@@ -35,7 +66,7 @@ class CategoryListView(generics.ListAPIView):
             data=serializer.data
         )
 
-class GenreListView(generics.ListAPIView):
+class GenreListView(ConditionalGetMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = GenreSerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [SearchFilter]
@@ -55,42 +86,72 @@ class GenreListView(generics.ListAPIView):
         )
 
 
-class MovieListView(generics.ListAPIView):
+class MovieListView(CatalogConditionalMixin, DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = MovieListSerializer
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['categories', 'genres', 'content_type', 'is_premium', 'release_year']
+    filter_backends = [DjangoFilterBackend, SearchFilter, MovieOrderingFilter]
+    filterset_class = MovieListFilter
     search_fields = ['title', 'description']
-    ordering_fields = ['title', 'release_year', 'created_at', 'views_count', 'likes_count']
+    ordering_fields = ['title', 'release_year', 'created_at', 'views_count', 'likes_count', 'weighted_rating']
+    ordering_aliases = {'top_rated': ['-weighted_rating']}
     ordering = ['-created_at']
 
     def get_queryset(self):
-        queryset = Movie.objects.filter(is_active=True).prefetch_related('categories', 'genres')
-        
         user = self.request.user
-        if not user.is_authenticated or not user.has_active_premium:
-            queryset = queryset.filter(is_premium=False)
+        return self.apply_requested_fields(
+            visible_movies(user.is_authenticated and user.has_active_premium)
+        )
 
-        genre_slug = self.request.query_params.get('genre')
-        if genre_slug:
-            queryset = queryset.filter(genres__slug=genre_slug)
-        
-        genre_id = self.request.query_params.get('genres')
-        if genre_id:
-            queryset = queryset.filter(genres__id=genre_id)
-        
-        return queryset
+    def get_snapshot_hits(self):
+        """Ids matching the request from the catalog snapshot, or None to use the ORM."""
+        if not hasattr(self, '_snapshot_hits'):
+            self._snapshot_hits = None
+            snapshot = get_snapshot()
+            ordering = MovieOrderingFilter().get_ordering(self.request, Movie.objects.none(), self)
+            if snapshot is not None and len(ordering) == 1:
+                user = self.request.user
+                self._snapshot_hits = snapshot.search(
+                    self.request.query_params,
+                    user.is_authenticated and user.has_active_premium,
+                    ordering[0]
+                )
+        return self._snapshot_hits
 
-class MovieDetailView(generics.RetrieveAPIView):
+    def get_etag(self, request):
+        hits = self.get_snapshot_hits()
+        if hits is None:
+            return super().get_etag(request)
+        return build_etag(
+            *request_identity(request), hits.snapshot.version, len(hits), *self.get_related_versions()
+        )
+
+    def list(self, request, *args, **kwargs):
+        hits = self.get_snapshot_hits()
+        if hits is None:
+            return super().list(request, *args, **kwargs)
+
+        ids = self.paginate_queryset(hits)
+        user = request.user
+        # Visibility is checked again, the snapshot may trail the catalog by a few seconds.
+        movies = self.apply_requested_fields(
+            visible_movies(user.is_authenticated and user.has_active_premium)
+        ).in_bulk(ids)
+        serializer = self.get_serializer([movies[pk] for pk in ids if pk in movies], many=True)
+        return self.get_paginated_response(serializer.data)
+
+class MovieDetailView(DynamicFieldsViewMixin, SerializationMetricsMixin, generics.RetrieveAPIView):
     serializer_class = MovieDetailSerializer
+    field_prefetch_related = {
+        **MOVIE_LIST_PREFETCHES,
+        'videos': 'videos',
+    }
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug'
     lookup_url_kwarg = 'slug'
 
     def get_queryset(self):
-        return Movie.objects.filter(is_active=True).prefetch_related(
-            'categories', 'genres', 'videos', 'episodes'
-        )
+        return self.apply_requested_fields(Movie.objects.filter(is_active=True))
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -101,15 +162,50 @@ class MovieDetailView(generics.RetrieveAPIView):
             ip_address=self.get_client_ip(request)
         )
 
+        # A queryset update sends no post_save, so a view is not an autocomplete change.
+        Movie.objects.filter(pk=instance.pk).update(views_count=F('views_count') + 1)
         instance.views_count += 1
-        instance.save(update_fields=['views_count'])
+
+        etag = self.get_etag(request, instance)
+        response = not_modified_response(request, etag)
+        if response is not None:
+            return response
         
         serializer = self.get_serializer(instance)
-        return CustomResponse.success(
+        response = CustomResponse.success(
             message_key="SUCCESS_MESSAGE",
             request=request,
             data=serializer.data
         )
+        return set_validators(response, etag)
+
+    def get_etag(self, request, instance):
+        from apps.comments.models import Comment
+        from apps.ratings.models import Rating
+
+        related = Movie.objects.filter(pk=instance.pk).annotate(
+            videos_version=latest_related_version(Video, 'movie'),
+            episodes_version=latest_related_version(Episode, 'tv_show'),
+            categories_version=latest_related_version(Category, 'movies'),
+            genres_version=latest_related_version(Genre, 'movies'),
+            # Counts too, so deleting an older video or episode changes the ETag.
+            videos_count=related_count(Video, 'movie'),
+            episodes_count=related_count(Episode, 'tv_show'),
+        ).values(
+            'videos_version', 'episodes_version', 'categories_version', 'genres_version',
+            'videos_count', 'episodes_count'
+        ).get()
+        ratings = Rating.objects.filter(movie=instance).aggregate(
+            count=Count('pk'), latest=Max('updated_at')
+        )
+        comments = Comment.objects.filter(movie=instance, is_active=True).aggregate(
+            count=Count('pk'), latest=Max('updated_at')
+        )
+
+        return build_etag(
+            *request_identity(request), instance.pk, instance.updated_at, *related.values(),
+            ratings['latest'], ratings['count'], comments['latest'], comments['count']
+        )
     
     def get_client_ip(self, request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -119,7 +215,7 @@ class MovieDetailView(generics.RetrieveAPIView):
             ip = request.META.get('REMOTE_ADDR')
         return ip
 
-class MovieWatchView(generics.RetrieveAPIView):
+class MovieWatchView(SerializationMetricsMixin, generics.RetrieveAPIView):
     serializer_class = MovieDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'slug'
@@ -145,35 +241,61 @@ class MovieWatchView(generics.RetrieveAPIView):
             data=serializer.data
         )
 
-class PremierMoviesView(generics.ListAPIView):
+class TopRatedMoviesView(CatalogConditionalMixin, DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
+    """The best weighted-rated titles, a cached id list paged like the catalog."""
+    serializer_class = MovieListSerializer
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
+    permission_classes = [permissions.AllowAny]
+
+    def get_ranked_ids(self):
+        user = self.request.user
+        return get_top_rated_ids(user.is_authenticated and user.has_active_premium)
+
+    def get_etag(self, request):
+        related = self.get_related_versions()
+        # Scores change without touching updated_at, so the ranking itself goes into the ETag.
+        return build_etag(*request_identity(request), self.get_ranked_ids(), *related)
+
+    def get_queryset(self):
+        return self.apply_requested_fields(Movie.objects.filter(is_active=True))
+
+    def list(self, request, *args, **kwargs):
+        ids = self.paginate_queryset(self.get_ranked_ids())
+        movies = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer([movies[pk] for pk in ids if pk in movies], many=True)
+        return self.get_paginated_response(serializer.data)
+
+class PremierMoviesView(CatalogConditionalMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = PremierMovieSerializer
     permission_classes = [permissions.AllowAny]
-    
+
+    def get_listing(self):
+        # Cached until the next premiere or expiry, see utils.premieres.
+        if not hasattr(self, '_listing'):
+            mode = 'active' if self.request.query_params.get('available_until') == 'active' else 'all'
+            self._listing = get_premier_listing(mode)
+        return self._listing
+
+    def get_etag(self, request):
+        listing = self.get_listing()
+        related = self.get_related_versions()
+        # The ids themselves: a title can close as another opens without any newer updated_at.
+        return build_etag(*request_identity(request), listing['ids'], listing['latest'], *related)
+
     def get_queryset(self):
-        now = timezone.now()
-        queryset = Movie.objects.filter(
-            is_premier=True,
-            is_active=True,
-            premier_date__lte=now
-        )
-        
-        available_until = self.request.query_params.get('available_until')
-        if available_until == 'active':
-            queryset = queryset.filter(
-                Q(available_until__isnull=True) | Q(available_until__gt=now)
-            )
-        
-        return queryset.prefetch_related('categories', 'genres')
-    
+        return Movie.objects.filter(is_active=True).prefetch_related('categories', 'genres')
+
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        
+        ids = self.get_listing()['ids']
+        page = self.paginate_queryset(ids)
+
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            movies = self.get_queryset().in_bulk(page)
+            serializer = self.get_serializer([movies[pk] for pk in page if pk in movies], many=True)
             return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(queryset, many=True)
+
+        movies = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer([movies[pk] for pk in ids if pk in movies], many=True)
         
         return CustomResponse.success(
             message_key="SUCCESS_MESSAGE",
@@ -181,15 +303,16 @@ class PremierMoviesView(generics.ListAPIView):
             data=serializer.data
         )
 
-class FeaturedMoviesView(generics.ListAPIView):
+class FeaturedMoviesView(CatalogConditionalMixin, DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = MovieListSerializer
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
     permission_classes = [permissions.AllowAny]
     
     def get_queryset(self):
-        queryset = Movie.objects.filter(
+        queryset = self.apply_requested_fields(Movie.objects.filter(
             is_featured=True,
             is_active=True
-        ).prefetch_related('categories', 'genres')
+        ))
         
         user = self.request.user
         if not user.is_authenticated or not user.has_active_premium:
@@ -207,21 +330,26 @@ class FeaturedMoviesView(generics.ListAPIView):
             data=serializer.data
         )
 
-class TrendingMoviesView(generics.ListAPIView):
+class TrendingMoviesView(CatalogConditionalMixin, DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = MovieListSerializer
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
     permission_classes = [permissions.AllowAny]
+    limit = 20
     
     def get_queryset(self):
-        queryset = Movie.objects.filter(
-            is_trending=True,
-            is_active=True
-        ).prefetch_related('categories', 'genres')
+        queryset = self.apply_requested_fields(Movie.objects.filter(is_active=True))
         
         user = self.request.user
         if not user.is_authenticated or not user.has_active_premium:
             queryset = queryset.filter(is_premium=False)
         
-        return queryset
+        return trending_queryset(queryset)[:self.limit]
+
+    def get_etag(self, request):
+        # Ranks are recomputed in place without touching updated_at, so the
+        # order itself goes into the ETag.
+        ranked_ids = list(self.get_queryset().values_list('id', flat=True))
+        return build_etag(super().get_etag(request), ranked_ids)
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -233,8 +361,9 @@ class TrendingMoviesView(generics.ListAPIView):
             data=serializer.data
         )
 
-class SearchMoviesView(generics.ListAPIView):
+class SearchMoviesView(CatalogConditionalMixin, DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = MovieListSerializer
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
@@ -242,12 +371,12 @@ class SearchMoviesView(generics.ListAPIView):
         if not query:
             return Movie.objects.none()
         
-        return Movie.objects.filter(
+        return self.apply_requested_fields(Movie.objects.filter(
             Q(title__icontains=query) | 
             Q(description__icontains=query) |
             Q(genres__name__icontains=query) |
             Q(categories__name__icontains=query)
-        ).filter(is_active=True).distinct()
+        ).filter(is_active=True).distinct())
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -263,7 +392,7 @@ class SearchMoviesView(generics.ListAPIView):
             }
         )
 
-class TVShowEpisodesView(generics.ListAPIView):
+class TVShowEpisodesView(ConditionalGetMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = EpisodeSerializer
     permission_classes = [permissions.AllowAny]
     
@@ -289,4 +418,299 @@ class TVShowEpisodesView(generics.ListAPIView):
             message_key="SUCCESS_MESSAGE",
             request=request,
             data=serializer.data
-        )
\ No newline at end of file
+        )
+
+class SeasonListView(APIView):
+    """The season index of a show: episode count and runtime per season."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        if not Movie.objects.filter(pk=pk, is_active=True).exists():
+            return CustomResponse.not_found(request=request)
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data=get_season_index(pk)
+        )
+
+class SeasonEpisodesView(ConditionalGetMixin, SerializationMetricsMixin, generics.ListAPIView):
+    """One season of a show, paginated."""
+    serializer_class = EpisodeSerializer
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        return Episode.objects.filter(
+            tv_show_id=self.kwargs['pk'],
+            tv_show__is_active=True,
+            season_number=self.kwargs['season_number']
+        ).order_by('episode_number')
+
+class SimilarMoviesView(DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
+    serializer_class = MovieListSerializer
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
+    permission_classes = [permissions.AllowAny]
+
+    def get_queryset(self):
+        lang = getattr(self.request, 'lang', 'en')
+        self.similar_ids = list(
+            MovieSimilarity.objects.filter(
+                movie__slug=self.kwargs['slug'],
+                movie__is_active=True,
+                language=lang
+            ).order_by('rank').values_list('similar_movie_id', flat=True)
+        )
+
+        queryset = self.apply_requested_fields(Movie.objects.filter(
+            id__in=self.similar_ids,
+            is_active=True
+        ))
+
+        user = self.request.user
+        if not user.is_authenticated or not user.has_active_premium:
+            queryset = queryset.filter(is_premium=False)
+
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        movies = {movie.id: movie for movie in self.get_queryset()}
+        ordered = [movies[movie_id] for movie_id in self.similar_ids if movie_id in movies]
+        serializer = self.get_serializer(ordered, many=True)
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data=serializer.data
+        )
+
+
+class HomeFeedView(APIView):
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        is_premium = request.user.is_authenticated and request.user.has_active_premium
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data=get_home_feed(request, is_premium)
+        )
+
+class MovieFacetsView(APIView):
+    """How many visible titles each filter option would match under the current filters."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        is_premium = request.user.is_authenticated and request.user.has_active_premium
+        state = filter_state(request.query_params)
+        filterset = MovieListFilter(filter_data(state), queryset=Movie.objects.none())
+        if not filterset.is_valid():
+            return CustomResponse.validation_error(
+                errors=filterset.errors,
+                request=request
+            )
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data=get_facets(state, getattr(request, 'lang', 'en'), is_premium)
+        )
+
+class MovieAutocompleteView(APIView):
+    """Search-as-you-type over titles in the request language, most viewed first."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        options = settings.MOVIE_AUTOCOMPLETE
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(int(request.query_params.get('limit', options['LIMIT'])), options['MAX_LIMIT'])
+        except ValueError:
+            limit = options['LIMIT']
+
+        results = []
+        if fold(query) and limit > 0:
+            lang = getattr(request, 'lang', 'en')
+            index = get_autocomplete_index()
+            is_premium = request.user.is_authenticated and request.user.has_active_premium
+            storage = Movie._meta.get_field('poster').storage
+            results = [
+                {
+                    'id': movie_id,
+                    'slug': slug,
+                    'title': title,
+                    'poster': request.build_absolute_uri(storage.url(poster)) if poster else None,
+                }
+                for movie_id, slug, title, poster in index.results(
+                    index.complete(query, lang, is_premium, limit), lang
+                )
+            ]
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data={'query': query, 'results': results}
+        )
+
+
+class MovieBatchView(DynamicFieldsViewMixin, APIView):
+    permission_classes = [permissions.AllowAny]
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
+    max_keys = 50
+
+    def get(self, request):
+        ids = [value for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        slugs = [value.strip() for value in request.query_params.get('slugs', '').split(',') if value.strip()]
+
+        if not ids and not slugs:
+            return CustomResponse.validation_error(
+                errors={"detail": "ids or slugs are required"},
+                request=request
+            )
+        if len(ids) + len(slugs) > self.max_keys:
+            return CustomResponse.validation_error(
+                errors={"detail": f"At most {self.max_keys} ids and slugs can be requested at once"},
+                request=request
+            )
+        try:
+            ids = [int(value) for value in ids]
+        except ValueError:
+            return CustomResponse.validation_error(
+                errors={"ids": "ids must be integers"},
+                request=request
+            )
+
+        queryset = self.apply_requested_fields(Movie.objects.filter(
+            Q(id__in=ids) | Q(slug__in=slugs),
+            is_active=True
+        ))
+
+        user = request.user
+        if not user.is_authenticated or not user.has_active_premium:
+            queryset = queryset.filter(is_premium=False)
+
+        movies = list(queryset)
+        by_id = {movie.id: movie for movie in movies}
+        by_slug = {movie.slug: movie for movie in movies}
+        # Keyed by the objects, ``?fields=`` may leave ``id`` out of the items.
+        serialized = {
+            movie.id: item
+            for movie, item in zip(movies, MovieListSerializer(movies, many=True, context={'request': request}).data)
+        }
+
+        results = []
+        missing = {'ids': [], 'slugs': []}
+        for movie_id in ids:
+            if movie_id in by_id:
+                results.append(serialized[movie_id])
+            else:
+                missing['ids'].append(movie_id)
+        for slug in slugs:
+            if slug in by_slug:
+                results.append(serialized[by_slug[slug].id])
+            else:
+                missing['slugs'].append(slug)
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data={
+                'results': results,
+                'missing': missing
+            }
+        )
+
+class MovieLikeView(APIView):
+    """POST likes the movie, DELETE takes the like back; both are idempotent."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def respond(self, request, pk, change):
+        movie = Movie.objects.filter(pk=pk, is_active=True).only('id', 'likes_count').first()
+        if movie is None:
+            return CustomResponse.not_found(request=request)
+
+        change(request.user, movie.id)
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data={
+                'movie': movie.id,
+                'liked': change is like,
+                'likes_count': current_likes_count(movie),
+            }
+        )
+
+    def post(self, request, pk):
+        return self.respond(request, pk, like)
+
+    def delete(self, request, pk):
+        return self.respond(request, pk, unlike)
+
+class WatchlistItemView(APIView):
+    """POST saves the movie to the user's watchlist, DELETE removes it."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def respond(self, request, pk, change):
+        if not Movie.objects.filter(pk=pk, is_active=True).exists():
+            return CustomResponse.not_found(request=request)
+
+        change(request.user, pk)
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data={'movie': pk, 'saved': change is save_to_watchlist}
+        )
+
+    def post(self, request, pk):
+        return self.respond(request, pk, save_to_watchlist)
+
+    def delete(self, request, pk):
+        return self.respond(request, pk, remove_from_watchlist)
+
+class WatchlistView(DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
+    """The user's saved titles, most recently saved first."""
+    serializer_class = MovieListSerializer
+    field_prefetch_related = MOVIE_LIST_PREFETCHES
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return self.apply_requested_fields(
+            Movie.objects.filter(watchlist_items__user=self.request.user, is_active=True).order_by(
+                '-watchlist_items__created_at'
+            )
+        )
+
+class MovieLibraryStateView(APIView):
+    """Which of up to ``max_keys`` movies the user liked and saved, for marking list pages."""
+    permission_classes = [permissions.IsAuthenticated]
+    max_keys = 100
+
+    def get(self, request):
+        ids = [value for value in request.query_params.get('ids', '').split(',') if value.strip()]
+
+        if not ids:
+            return CustomResponse.validation_error(
+                errors={"ids": "ids are required"},
+                request=request
+            )
+        if len(ids) > self.max_keys:
+            return CustomResponse.validation_error(
+                errors={"detail": f"At most {self.max_keys} ids can be requested at once"},
+                request=request
+            )
+        try:
+            ids = [int(value) for value in ids]
+        except ValueError:
+            return CustomResponse.validation_error(
+                errors={"ids": "ids must be integers"},
+                request=request
+            )
+
+        state = library_state(request.user, ids)
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data={'liked': sorted(state['liked']), 'saved': sorted(state['saved'])}
+        )
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class RatingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.ratings'
-    verbose_name = 'Ratings Management'
\ No newline at end of file
+    verbose_name = 'Ratings Management'
+
+    def ready(self):
+        import apps.ratings.signals
\ No newline at end of file
@@ -0,0 +1,14 @@
+from apps.movies.utils.top_rated import refresh_movie_ratings
+from .models import Rating
+
+def delete(ids):
+    ratings = Rating.objects.filter(id__in=ids)
+    movie_ids = set(ratings.values_list('movie_id', flat=True))
+    # Only this DELETE, without per-row signals; the movies are refreshed once per chunk.
+    deleted = ratings._raw_delete(ratings.db)
+    refresh_movie_ratings(movie_ids)
+    return deleted
+
+ACTIONS = {
+    'delete': delete,
+}
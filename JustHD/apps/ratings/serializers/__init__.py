@@ -1,6 +1,7 @@
-from .rating import RatingSerializer, RatingCreateSerializer
+from .rating import RatingSerializer, RatingCreateSerializer, RatingSyncSerializer
 
 __all__ = [
     'RatingSerializer',
     'RatingCreateSerializer',
+    'RatingSyncSerializer',
 ]
\ No newline at end of file
@@ -1,7 +1,12 @@
 from rest_framework import serializers
+from apps.movies.models import Movie
 from apps.ratings.models import Rating
+from apps.ratings.utils import upsert_ratings
+from apps.shared.mixins.dynamic_fields import DynamicFieldsMixin
 
-class RatingSerializer(serializers.ModelSerializer):
+MAX_SYNC_RATINGS = 500
+
+class RatingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     movie_title = serializers.CharField(source='movie.title', read_only=True)
     
@@ -29,21 +34,38 @@ class RatingCreateSerializer(serializers.ModelSerializer):
             })
         return value
     
-    def validate(self, attrs):
+    def create(self, validated_data):
+        # Rating a movie again replaces the score, in the same single statement.
         user = self.context['request'].user
-        movie = attrs.get('movie')
-        
-        if Rating.objects.filter(user=user, movie=movie).exists():
+        movie = validated_data.pop('movie')
+        return upsert_ratings(user, [dict(validated_data, movie_id=movie.id)]).select_related('user', 'movie').get()
+
+class RatingSyncItemSerializer(serializers.Serializer):
+    movie = serializers.IntegerField(min_value=1)
+    score = serializers.IntegerField(min_value=1, max_value=10)
+    comment = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+class RatingSyncSerializer(serializers.Serializer):
+    ratings = RatingSyncItemSerializer(many=True, allow_empty=False, max_length=MAX_SYNC_RATINGS)
+
+    def validate_ratings(self, value):
+        movie_ids = {item['movie'] for item in value}
+        found = set(Movie.objects.filter(id__in=movie_ids, is_active=True).values_list('id', flat=True))
+        missing = sorted(movie_ids - found)
+        if missing:
             raise serializers.ValidationError({
-                "non_field_errors": {
-                    "en": "You have already rated this movie",
-                    "uz": "Siz bu kinoni allaqachon baholagansiz",
-                    "ru": "Вы уже оценили этот фильм"
+                "movies": {
+                    "en": f"Unknown movies: {missing}",
+                    "uz": f"Noma'lum kinolar: {missing}",
+                    "ru": f"Неизвестные фильмы: {missing}"
                 }
             })
-        
-        return attrs
-    
+        return value
+
     def create(self, validated_data):
         user = self.context['request'].user
-        return Rating.objects.create(user=user, **validated_data)
\ No newline at end of file
+        items = []
+        for item in validated_data['ratings']:
+            movie_id = item.pop('movie')
+            items.append(dict(item, movie_id=movie_id))
+        return upsert_ratings(user, items)
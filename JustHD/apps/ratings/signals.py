@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.movies.utils.top_rated import refresh_movie_ratings
+from .models import Rating
+
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+def rating_changed(sender, instance, **kwargs):
+    """Refresh the stored rating columns of the movie once the change is committed"""
+    movie_id = instance.movie_id
+    transaction.on_commit(lambda: refresh_movie_ratings([movie_id]))
@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from apps.ratings.models import Rating
 from apps.movies.models import Movie, Genre
 from django.urls import reverse
+from apps.shared.models import BulkJob
 
 User = get_user_model()
 
@@ -71,7 +72,7 @@ class RatingViewsTest(TestCase):
         response_data = self._get_response_data(response)
         self.assertEqual(response_data['score'], 9)
 
-    def test_rating_create_duplicate(self):
+    def test_rating_create_again_updates_the_score(self):
         self.client.force_authenticate(user=self.user)
         
         data = {
@@ -79,8 +80,15 @@ class RatingViewsTest(TestCase):
             'score': 9
         }
         
-        response = self.client.post(self.rating_create_url, data)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.rating_create_url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['id'], self.rating.id)
+
+        self.rating.refresh_from_db()
+        self.assertEqual((self.rating.score, self.rating.comment), (9, 'Good movie'))
+        self.movie.refresh_from_db()
+        self.assertEqual((self.movie.ratings_count, self.movie.ratings_average), (1, 9))
 
     def test_rating_create_invalid_score(self):
         self.client.force_authenticate(user=self.other_user)
@@ -111,4 +119,53 @@ class RatingViewsTest(TestCase):
     def test_movie_ratings(self):
         response = self.client.get(self.movie_ratings_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('data', response.data)
\ No newline at end of file
+        self.assertIn('data', response.data)
+
+    def test_rating_sync_upserts_a_batch(self):
+        other_movie = Movie.objects.create(
+            title='Other Movie', slug='other-movie', description='d', release_year=2022, duration=90
+        )
+        self.client.force_authenticate(user=self.user)
+        url = reverse('ratings:rating-sync')
+        data = {'ratings': [
+            {'movie': self.movie.id, 'score': 3, 'comment': 'Rewatched'},
+            {'movie': other_movie.id, 'score': 5},
+            {'movie': other_movie.id, 'score': 7},
+        ]}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        scores = dict(Rating.objects.filter(user=self.user).values_list('movie_id', 'score'))
+        self.assertEqual(scores, {self.movie.id: 3, other_movie.id: 7})
+        self.assertEqual(Rating.objects.get(pk=self.rating.pk).comment, 'Rewatched')
+        self.assertEqual(len(response.data['data']), 2)
+        other_movie.refresh_from_db()
+        self.assertEqual((other_movie.ratings_count, other_movie.ratings_average), (1, 7))
+
+    def test_rating_sync_rejects_unknown_movies(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            reverse('ratings:rating-sync'),
+            {'ratings': [{'movie': self.movie.id, 'score': 1}, {'movie': 999999, 'score': 5}]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Rating.objects.get(pk=self.rating.pk).score, 8)
+
+    def test_admin_bulk_delete_runs_as_job(self):
+        admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        self.client.force_authenticate(user=admin)
+        url = reverse('admin_ratings:rating-bulk-actions')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {'rating_ids': [self.rating.id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(BulkJob.objects.get(uuid=response.data['data']['uuid']).affected, 1)
+        self.assertFalse(Rating.objects.exists())
@@ -0,0 +1,35 @@
+from django.db import transaction
+
+from apps.movies.utils.top_rated import refresh_movie_ratings
+from .models import Rating
+
+UPSERT_FIELDS = ['score', 'comment', 'updated_at']
+
+def upsert_ratings(user, items):
+    """
+    Rate many movies at once with INSERT ... ON CONFLICT (user, movie) DO UPDATE,
+    so repeated or concurrent requests never hit the unique constraint.
+
+    ``items`` are dicts with ``movie_id``, ``score`` and optionally ``comment``;
+    a missing comment keeps the stored one. A movie listed twice keeps its
+    last item. Returns the stored ratings of the listed movies.
+    """
+    latest = {item['movie_id']: item for item in items}
+    groups = {True: [], False: []}
+    for movie_id, item in latest.items():
+        groups['comment' in item].append(Rating(
+            user=user, movie_id=movie_id, score=item['score'], comment=item.get('comment')
+        ))
+
+    with transaction.atomic():
+        for with_comment, ratings in groups.items():
+            if ratings:
+                Rating.objects.bulk_create(
+                    ratings,
+                    update_conflicts=True,
+                    unique_fields=['user', 'movie'],
+                    update_fields=UPSERT_FIELDS if with_comment else ['score', 'updated_at'],
+                )
+        # bulk_create sends no post_save, refresh the stored aggregates here.
+        transaction.on_commit(lambda: refresh_movie_ratings(latest))
+    return Rating.objects.filter(user=user, movie_id__in=latest)
@@ -3,11 +3,19 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter
 
 from ..models import Rating
-from ..serializers import RatingSerializer, RatingCreateSerializer
+from ..serializers import RatingSerializer, RatingCreateSerializer, RatingSyncSerializer
+from apps.shared.mixins.dynamic_fields import DynamicFieldsViewMixin
+from apps.shared.mixins.metrics import SerializationMetricsMixin
 from apps.shared.utils.custom_response import CustomResponse
 
-class RatingListView(generics.ListAPIView):
+RATING_SELECT_RELATED = {
+    'user': 'user',
+    'movie_title': 'movie',
+}
+
+class RatingListView(DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = RatingSerializer
+    field_select_related = RATING_SELECT_RELATED
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_fields = ['movie', 'user', 'score']
@@ -15,7 +23,7 @@ class RatingListView(generics.ListAPIView):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return Rating.objects.select_related('user', 'movie')
+        return self.apply_requested_fields(Rating.objects.all())
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -33,7 +41,7 @@ class RatingListView(generics.ListAPIView):
             data=serializer.data
         )
 
-class RatingCreateView(generics.CreateAPIView):
+class RatingCreateView(SerializationMetricsMixin, generics.CreateAPIView):
     serializer_class = RatingCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -53,7 +61,28 @@ class RatingCreateView(generics.CreateAPIView):
             data=RatingSerializer(rating, context={'request': request}).data
         )
 
-class RatingDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RatingSyncView(SerializationMetricsMixin, generics.GenericAPIView):
+    """Upsert a batch of ratings, e.g. the ones a client collected offline."""
+    serializer_class = RatingSyncSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return CustomResponse.validation_error(
+                errors=serializer.errors,
+                request=request
+            )
+
+        ratings = serializer.save().select_related('user', 'movie')
+
+        return CustomResponse.success(
+            message_key="SUCCESS_MESSAGE",
+            request=request,
+            data=RatingSerializer(ratings, many=True, context={'request': request}).data
+        )
+
+class RatingDetailView(SerializationMetricsMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = RatingSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -99,15 +128,16 @@ class RatingDetailView(generics.RetrieveUpdateDestroyAPIView):
             data={"message": "Rating deleted successfully"}
         )
 
-class MovieRatingsView(generics.ListAPIView):
+class MovieRatingsView(DynamicFieldsViewMixin, SerializationMetricsMixin, generics.ListAPIView):
     serializer_class = RatingSerializer
+    field_select_related = RATING_SELECT_RELATED
     permission_classes = [permissions.AllowAny]
 
     def get_queryset(self):
         movie_slug = self.kwargs['movie_slug']
-        return Rating.objects.filter(
+        return self.apply_requested_fields(Rating.objects.filter(
             movie__slug=movie_slug
-        ).select_related('user', 'movie')
+        ))
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -0,0 +1,61 @@
+"""
+PostgreSQL backend that checks connections out of a per-process pool
+instead of opening one per request. Django "closes" the connection at the
+end of every request (CONN_MAX_AGE=0), which hands it back to the pool.
+
+Pool sizes come from the ``POOL`` key of the database settings:
+``MIN_SIZE``, ``MAX_SIZE``, ``MAX_IDLE`` and ``TIMEOUT`` (seconds).
+"""
+from django.db.backends.postgresql import base
+
+from apps.shared.db.pool import ConnectionPool, get_pool
+from .creation import DatabaseCreation
+
+def _check(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception:
+        return False
+    return True
+
+def _reset(connection):
+    if connection.closed:
+        return False
+    # psycopg2: 0 is TRANSACTION_STATUS_IDLE.
+    if connection.info.transaction_status != 0:
+        connection.rollback()
+    return True
+
+def _close(connection):
+    connection.close()
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def _get_pool(self, conn_params):
+        key = (self.alias, self.settings_dict['NAME'], tuple(sorted(
+            (name, repr(value)) for name, value in conn_params.items()
+        )))
+        options = self.settings_dict.get('POOL', {})
+        connect = super().get_new_connection
+        return get_pool(key, lambda: ConnectionPool(
+            connect=lambda: connect(conn_params),
+            check=_check,
+            reset=_reset,
+            close=_close,
+            min_size=options.get('MIN_SIZE', 1),
+            max_size=options.get('MAX_SIZE', 4),
+            max_idle=options.get('MAX_IDLE', 300),
+            timeout=options.get('TIMEOUT', 10),
+        ))
+
+    def get_new_connection(self, conn_params):
+        self.pool = self._get_pool(conn_params)
+        return self.pool.getconn()
+
+    def _close(self):
+        if self.connection is not None:
+            # After errors other than integrity/data errors the connection
+            # may be unusable; don't hand it to the next request.
+            self.pool.putconn(self.connection, discard=self.errors_occurred)
@@ -0,0 +1,9 @@
+from django.db.backends.postgresql import creation
+
+from apps.shared.db.pool import close_pools
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Pooled connections would keep the test database busy and block DROP DATABASE.
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
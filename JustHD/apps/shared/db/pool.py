@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+class PoolTimeout(OperationalError):
+    pass
+
+class ConnectionPool:
+    """
+    A small thread-safe pool of DB-API connections for one worker process.
+
+    ``connect`` opens a new connection, ``check`` pings one that sat idle
+    for longer than ``health_check_after`` seconds, ``reset`` returns a
+    connection to a clean state (False means it must be discarded) and
+    ``close`` closes it. Idle connections above ``min_size`` are closed after
+    ``max_idle`` seconds; a checkout waits at most ``timeout`` seconds for a
+    free slot once ``max_size`` connections are open.
+    """
+
+    def __init__(self, connect, check, reset, close, min_size=1, max_size=4,
+                 max_idle=300, timeout=10, health_check_after=30):
+        self._connect = connect
+        self._check = check
+        self._reset = reset
+        self._close = close
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+
+        self._lock = threading.Condition()
+        self._idle = deque()
+        self._size = 0
+        self._pid = os.getpid()
+        self._counters = dict.fromkeys((
+            'connections_opened', 'connections_closed', 'checkouts', 'waits',
+            'wait_time_ms', 'timeouts', 'health_check_failures',
+        ), 0)
+
+    def _check_pid(self):
+        # Connections inherited over fork() belong to the parent; forget them
+        # without closing, or the parent's sockets would be torn down.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._size = 0
+
+    def _expired(self, now):
+        expired = []
+        while self._idle and self._size > self.min_size:
+            connection, returned_at = self._idle[0]
+            if now - returned_at < self.max_idle:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            expired.append(connection)
+        return expired
+
+    def _discard(self, connection):
+        with self._lock:
+            self._size -= 1
+            self._counters['connections_closed'] += 1
+            self._lock.notify()
+        try:
+            self._close(connection)
+        except Exception:
+            pass
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._lock:
+                self._check_pid()
+                waited_since = None
+                connection = returned_at = None
+                while True:
+                    if self._idle:
+                        # Most recently returned first, so the oldest idle
+                        # connections age out and get reaped.
+                        connection, returned_at = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters['timeouts'] += 1
+                        raise PoolTimeout(
+                            f'No database connection available within {self.timeout}s '
+                            f'({self.max_size} in use)'
+                        )
+                    if waited_since is None:
+                        waited_since = time.monotonic()
+                        self._counters['waits'] += 1
+                    self._lock.wait(remaining)
+                self._counters['checkouts'] += 1
+                if waited_since is not None:
+                    self._counters['wait_time_ms'] += int((time.monotonic() - waited_since) * 1000)
+
+            if connection is None:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._counters['connections_opened'] += 1
+                return connection
+
+            if time.monotonic() - returned_at < self.health_check_after or self._check(connection):
+                return connection
+            with self._lock:
+                self._counters['health_check_failures'] += 1
+            self._discard(connection)
+
+    def putconn(self, connection, discard=False):
+        if not discard:
+            try:
+                discard = not self._reset(connection)
+            except Exception:
+                discard = True
+
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            if discard:
+                expired = []
+            else:
+                now = time.monotonic()
+                self._idle.append((connection, now))
+                expired = self._expired(now)
+                self._counters['connections_closed'] += len(expired)
+                self._lock.notify()
+
+        if discard:
+            self._discard(connection)
+        for connection in expired:
+            try:
+                self._close(connection)
+            except Exception:
+                pass
+
+    def close_all(self):
+        with self._lock:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._counters['connections_closed'] += len(idle)
+        for connection in idle:
+            try:
+                self._close(connection)
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._lock:
+            self._check_pid()
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                **self._counters,
+            }
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(key, factory):
+    """Return the process-wide pool registered under ``key``, creating it with ``factory``."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = factory()
+        return pool
+
+def pool_stats():
+    """Statistics of every pool opened by this process, keyed by alias and database."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {f'{alias}:{database}': pool.stats() for (alias, database, _), pool in pools}
+
+def close_pools(database=None):
+    """Close the idle connections of every pool, or only of pools for ``database``."""
+    with _pools_lock:
+        pools = [pool for (_, name, _), pool in _pools.items() if database in (None, name)]
+    for pool in pools:
+        pool.close_all()
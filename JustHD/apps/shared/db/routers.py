@@ -0,0 +1,137 @@
+"""
+Primary/replica routing. Reads made while serving a safe-method request go
+to a healthy replica; everything else, including reads outside a request,
+inside a transaction or after the request already wrote, uses the primary.
+
+Users who wrote through an unsafe request stay pinned to the primary for
+REPLICA_ROUTING['STICKY_SECONDS'] so they always read their own writes.
+Replicas whose replay lag exceeds REPLICA_ROUTING['MAX_LAG_SECONDS'] are
+skipped.
+"""
+import contextvars
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils.functional import SimpleLazyObject, empty
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# 0 on a primary, or on a replica that has replayed everything it received.
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+_request_state = contextvars.ContextVar('replica_routing', default=None)
+_lag = {}
+
+def _option(name, default):
+    return getattr(settings, 'REPLICA_ROUTING', {}).get(name, default)
+
+def replica_aliases():
+    """Database aliases configured as mirrors of the primary."""
+    return [
+        alias for alias, database in settings.DATABASES.items()
+        if alias != DEFAULT_DB_ALIAS and database.get('TEST', {}).get('MIRROR') == DEFAULT_DB_ALIAS
+    ]
+
+def pin_cache_key(user_id):
+    return f'db_pin:user:{user_id}'
+
+def pin_to_primary(user_id):
+    cache.set(pin_cache_key(user_id), True, _option('STICKY_SECONDS', 15))
+
+def resolved_user_id(request):
+    # Never force a lazy user here: resolving it runs a query, which would
+    # route back into the router.
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject):
+        user = user._wrapped
+    if user is None or user is empty or not user.is_authenticated:
+        return None
+    return user.pk
+
+def replica_lag(alias):
+    """Replication lag of ``alias`` in seconds, or None when it can't be measured."""
+    now = time.monotonic()
+    checked = _lag.get(alias)
+    if checked and now - checked[0] < _option('LAG_CHECK_INTERVAL', 5):
+        return checked[1]
+
+    connection = connections[alias]
+    try:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = float(cursor.fetchone()[0] or 0)
+        else:
+            lag = 0.0
+    except DatabaseError:
+        lag = None
+    _lag[alias] = (now, lag)
+    return lag
+
+def healthy_replicas():
+    max_lag = _option('MAX_LAG_SECONDS', 5)
+    healthy = []
+    for alias in replica_aliases():
+        lag = replica_lag(alias)
+        if lag is not None and lag <= max_lag:
+            healthy.append(alias)
+    return healthy
+
+class RoutingState:
+    def __init__(self, request):
+        self.request = request
+        self.use_replicas = request.method in SAFE_METHODS
+        self.wrote = False
+        self.pinned = None
+
+    def is_pinned(self):
+        if self.pinned is None:
+            user_id = resolved_user_id(self.request)
+            if user_id is None:
+                return False
+            # Set first so a cache backed by the database can't recurse here.
+            self.pinned = False
+            self.pinned = bool(cache.get(pin_cache_key(user_id)))
+        return self.pinned
+
+def start_request(request):
+    state = RoutingState(request)
+    return state, _request_state.set(state)
+
+def finish_request(token):
+    _request_state.reset(token)
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or not state.use_replicas or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block or state.is_pinned():
+            return None
+        replicas = healthy_replicas()
+        return random.choice(replicas) if replicas else None
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        return db not in replica_aliases()
@@ -0,0 +1,59 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+DIRECT_ENGINE = 'django.db.backends.postgresql'
+POOLED_ENGINE = 'apps.shared.db.backends.postgresql_pool'
+
+class Command(BaseCommand):
+    help = 'Compare per-request connect overhead with and without the connection pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to benchmark')
+        parser.add_argument('--requests', type=int, default=500, help='Request cycles per engine')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        settings_dict = connections.settings[alias]
+        if settings_dict['ENGINE'] not in (DIRECT_ENGINE, POOLED_ENGINE):
+            raise CommandError(f'Database "{alias}" is not PostgreSQL')
+
+        results = {}
+        for label, engine in (('direct', DIRECT_ENGINE), ('pooled', POOLED_ENGINE)):
+            wrapper = load_backend(engine).DatabaseWrapper(
+                {**settings_dict, 'ENGINE': engine, 'CONN_MAX_AGE': 0},
+                alias=f'{alias}-benchmark',
+            )
+            results[label] = self.run_cycles(wrapper, options['requests'])
+            if label == 'pooled':
+                pool_stats = wrapper.pool.stats()
+                wrapper.pool.close_all()
+
+        self.stdout.write(self.style.SUCCESS(f'{options["requests"]} request cycles (connect, SELECT 1, close)'))
+        for label, timings in results.items():
+            timings.sort()
+            self.stdout.write(
+                f'  {label:>7}: mean {statistics.mean(timings):7.3f} ms, '
+                f'p50 {timings[len(timings) // 2]:7.3f} ms, '
+                f'p95 {timings[int(len(timings) * 0.95)]:7.3f} ms'
+            )
+        saved = statistics.mean(results['direct']) - statistics.mean(results['pooled'])
+        self.stdout.write(f'  Connect overhead saved per request: {saved:.3f} ms')
+
+        self.stdout.write(self.style.SUCCESS('Pool statistics'))
+        for name, value in pool_stats.items():
+            self.stdout.write(f'  {name}: {value}')
+
+    def run_cycles(self, wrapper, count):
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            # What one request does: connect lazily, query, close at request_finished.
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            wrapper.close()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
@@ -0,0 +1,141 @@
+import os
+import statistics
+import threading
+import time
+from urllib.error import URLError
+from urllib.request import urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.gunicorn_sizing import (
+    cpu_count, memory_limit_bytes, recommended_threads, recommended_workers, worker_memory_bytes
+)
+
+MB = 1024 * 1024
+
+def _children(pid):
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing paren.
+        fields = stat.rsplit(')', 1)[1].split()
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+def _memory(pid):
+    """RSS, PSS and private (unshared) memory of a process, in bytes."""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    private = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    return values.get('Rss', 0), values.get('Pss', 0), private
+
+class Command(BaseCommand):
+    help = 'Report gunicorn worker sizing, per-worker memory and request throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pid', type=int, help='PID of a running gunicorn master')
+        parser.add_argument('--pidfile', help='Read the master PID from this file')
+        parser.add_argument('--url', help='URL to load test, e.g. http://127.0.0.1:8000/api/v1/movies/')
+        parser.add_argument('--requests', type=int, default=1000, help='Total requests to send')
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent clients')
+
+    def handle(self, *args, **options):
+        self.report_sizing()
+
+        pid = options['pid']
+        if options['pidfile']:
+            with open(options['pidfile']) as f:
+                pid = int(f.read().strip())
+        if pid:
+            self.report_memory(pid)
+
+        if options['url']:
+            self.report_throughput(options['url'], options['requests'], options['concurrency'])
+
+    def report_sizing(self):
+        memory = memory_limit_bytes()
+        self.stdout.write(self.style.SUCCESS('Sizing'))
+        self.stdout.write(f'  CPUs available:    {cpu_count()}')
+        self.stdout.write(f'  Memory limit:      {memory // MB if memory else "unknown"} MB')
+        self.stdout.write(f'  Budget per worker: {worker_memory_bytes() // MB} MB')
+        self.stdout.write(f'  Workers x threads: {recommended_workers()} x {recommended_threads()}')
+
+    def report_memory(self, pid):
+        try:
+            master = _memory(pid)
+        except OSError:
+            raise CommandError(f'No readable process with PID {pid}')
+
+        workers = _children(pid)
+        self.stdout.write(self.style.SUCCESS(f'Memory (master {pid}, {len(workers)} workers)'))
+        self.stdout.write(f'  {"pid":>8} {"rss MB":>9} {"pss MB":>9} {"private MB":>11}')
+        self.stdout.write(f'  {"master":>8} {master[0] / MB:9.1f} {master[1] / MB:9.1f} {master[2] / MB:11.1f}')
+
+        rows = []
+        for worker in workers:
+            try:
+                rows.append(_memory(worker))
+            except OSError:
+                continue
+            rss, pss, private = rows[-1]
+            self.stdout.write(f'  {worker:>8} {rss / MB:9.1f} {pss / MB:9.1f} {private / MB:11.1f}')
+
+        if rows:
+            # Private memory is what each extra worker really costs; shared
+            # pages from the preloaded master are counted once.
+            average_private = sum(row[2] for row in rows) / len(rows)
+            total = master[1] + sum(row[1] for row in rows)
+            self.stdout.write(f'  Average private memory per worker: {average_private / MB:.1f} MB')
+            self.stdout.write(f'  Total PSS (master + workers):      {total / MB:.1f} MB')
+
+    def report_throughput(self, url, total, concurrency):
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+        remaining = [total]
+
+        def client():
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                try:
+                    with urlopen(url, timeout=30) as response:
+                        response.read()
+                except (URLError, OSError):
+                    with lock:
+                        errors[0] += 1
+                    continue
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(f'Throughput ({url})'))
+        self.stdout.write(f'  Requests: {len(latencies)} ok, {errors[0]} failed in {elapsed:.2f}s')
+        if latencies:
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.stdout.write(f'  Requests/s: {len(latencies) / elapsed:.1f}')
+            self.stdout.write(
+                f'  Latency: median {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms'
+            )
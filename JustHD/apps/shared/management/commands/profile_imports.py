@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.shared.utils.import_profile import run_importtime, total_us, totals_by_package
+
+class Command(BaseCommand):
+    help = 'Report cumulative import time per app and module for a cold worker boot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Number of packages to list')
+        parser.add_argument('--depth', type=int, default=3, help='Depth of the module tree to print')
+        parser.add_argument('--min-ms', type=float, default=5.0, help='Hide modules cheaper than this')
+        parser.add_argument('--runs', type=int, default=3, help='Boot this many times and keep the fastest')
+
+    def handle(self, *args, **options):
+        try:
+            runs = [run_importtime() for _ in range(max(options['runs'], 1))]
+        except RuntimeError as e:
+            raise CommandError(f'Worker boot failed:\n{e}')
+        roots = min(runs, key=total_us)
+        min_us = options['min_ms'] * 1000
+
+        self.stdout.write(self.style.SUCCESS(f'Total import time: {total_us(roots) / 1000:.1f} ms'))
+
+        self.stdout.write(self.style.SUCCESS('\nBy package'))
+        for package, cumulative in totals_by_package(roots)[:options['top']]:
+            self.stdout.write(f'  {cumulative / 1000:9.1f} ms  {package}')
+
+        self.stdout.write(self.style.SUCCESS('\nModule tree (cumulative / self)'))
+        for root in sorted(roots, key=lambda node: -node.cumulative_us):
+            for node, depth in root.walk():
+                if depth > options['depth'] or node.cumulative_us < min_us:
+                    continue
+                self.stdout.write(
+                    f'  {node.cumulative_us / 1000:9.1f} {node.self_us / 1000:7.1f}  {"  " * depth}{node.name}'
+                )
@@ -0,0 +1,140 @@
+import json
+import os
+import platform
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.shared.utils.benchmark import build_scenarios, compare, run_scenario
+from apps.shared.utils.seeding import catalog_summary, seed_catalog
+from apps.users.models import User
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway database with a large catalog and benchmark the hot API endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--movies', type=int, default=2000, help='Movies to seed')
+        parser.add_argument('--users', type=int, default=1000, help='Users to seed')
+        parser.add_argument('--views', type=int, default=200000, help='Movie views to seed')
+        parser.add_argument('--ratings', type=int, default=50000, help='Ratings to seed')
+        parser.add_argument('--comments', type=int, default=20000, help='Comments to seed')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the dataset')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per scenario')
+        parser.add_argument('--scenario', action='append', default=[], help='Only run these scenarios')
+        parser.add_argument('--output', default='benchmarks/results.json', help='Where to write the results')
+        parser.add_argument('--baseline', default='benchmarks/baseline.json', help='Baseline to compare against')
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p95 slowdown as a fraction')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the seeded test database between runs')
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            results = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        self.write_json(options['output'], results)
+        self.stdout.write(f'Results written to {options["output"]}')
+
+        if options['save_baseline']:
+            self.write_json(options['baseline'], results)
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {options["baseline"]}'))
+            return
+        if not os.path.exists(options['baseline']):
+            self.stdout.write(self.style.WARNING('No baseline found, run with --save-baseline to store one'))
+            return
+
+        with open(options['baseline']) as handle:
+            baseline = json.load(handle)
+        if baseline.get('dataset') != results['dataset']:
+            self.stdout.write(self.style.WARNING('Baseline was recorded against a different dataset'))
+        regressions = compare(results, baseline, tolerance=options['tolerance'])
+        if regressions:
+            raise CommandError('Performance regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def run(self, options):
+        catalog = catalog_summary()
+        if catalog.counts['movies'] != options['movies']:
+            self.stdout.write('Seeding catalog...')
+            catalog = seed_catalog(
+                movies=options['movies'],
+                users=options['users'],
+                views=options['views'],
+                ratings=options['ratings'],
+                comments=options['comments'],
+                seed=options['seed'],
+            )
+
+        headers = {
+            'anonymous': {},
+            'user': self.auth_header('bench-premium', is_premium=True),
+            'admin': self.auth_header('bench-admin', is_staff=True),
+        }
+        scenarios = build_scenarios(catalog)
+        if options['scenario']:
+            unknown = set(options['scenario']) - {scenario.name for scenario in scenarios}
+            if unknown:
+                raise CommandError(f'Unknown scenarios: {", ".join(sorted(unknown))}')
+            scenarios = [scenario for scenario in scenarios if scenario.name in options['scenario']]
+
+        client = Client()
+        results = {}
+        self.stdout.write(
+            f'{"scenario":<22}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"req/s":>9}{"queries":>9}'
+        )
+        for scenario in scenarios:
+            cache.clear()
+            stats = run_scenario(
+                client, scenario, options['requests'],
+                warmup=options['warmup'], headers=headers[scenario.auth]
+            )
+            results[scenario.name] = stats
+            self.stdout.write(
+                f'{scenario.name:<22}{stats["p50_ms"]:>9.2f}{stats["p95_ms"]:>9.2f}{stats["p99_ms"]:>9.2f}'
+                f'{stats["throughput_rps"]:>9.1f}{stats["queries_per_request"]:>9.1f}'
+            )
+            if stats['errors']:
+                self.stdout.write(self.style.WARNING(f'  {stats["errors"]} requests failed'))
+
+        return {
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'machine': platform.machine(),
+            },
+            'dataset': {
+                'movies': options['movies'],
+                'users': options['users'],
+                'views': options['views'],
+                'ratings': options['ratings'],
+                'comments': options['comments'],
+                'seed': options['seed'],
+            },
+            'requests': options['requests'],
+            'scenarios': results,
+        }
+
+    def auth_header(self, username, **fields):
+        user, _ = User.objects.update_or_create(
+            username=username,
+            defaults={'email': f'{username}@example.com', **fields}
+        )
+        return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+    def write_json(self, path, data):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as handle:
+            json.dump(data, handle, indent=2)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.shared.utils.bulk_jobs import resume_stale_jobs
+
+class Command(BaseCommand):
+    help = 'Run pending bulk jobs and resume the ones whose worker stopped sending heartbeats'
+
+    def handle(self, *args, **options):
+        jobs = resume_stale_jobs()
+        for job in jobs:
+            line = f'{job.target}.{job.action} {job.uuid}: {job.affected} of {job.total} affected, {job.status}'
+            if job.status == 'failed':
+                self.stdout.write(self.style.ERROR(f'{line} ({job.error})'))
+            else:
+                self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f'{len(jobs)} jobs run'))
@@ -1,10 +1,13 @@
-from django.core.management.base import BaseCommand
+import os
+
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from datetime import timedelta
 from apps.movies.models import Category, Genre, Movie
 from apps.users.models import User
 from apps.ratings.models import Rating
 from apps.comments.models import Comment
+from apps.shared.utils import data_generator
 
 class Command(BaseCommand):
     help = 'Seed database with initial data for JustHD'
@@ -15,6 +18,29 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding',
         )
+        parser.add_argument(
+            '--scale',
+            type=float,
+            help='Generate a synthetic load-testing catalog; 1.0 is 10k movies, 20k users and 2M views',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=min(os.cpu_count() or 1, 8),
+            help='Parallel writer processes for --scale (PostgreSQL only)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=data_generator.CHUNK_SIZE,
+            help='Rows per chunk and transaction for --scale',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for --scale',
+        )
 
     def handle(self, *args, **options):
         clear = options['clear']
@@ -31,6 +57,10 @@ class Command(BaseCommand):
             User.objects.exclude(is_superuser=True).delete()
             self.stdout.write(self.style.SUCCESS('Existing data cleared'))
 
+        if options['scale'] is not None:
+            self.seed_scale(options)
+            return
+
         self.stdout.write('📚 Creating categories...')
         categories_data = [
             {
@@ -470,4 +500,36 @@ class Command(BaseCommand):
         self.stdout.write(f'🎥 Movies: {Movie.objects.count()}')
         self.stdout.write(f'👥 Users: {User.objects.count()}')
         self.stdout.write(f'⭐ Ratings: {Rating.objects.count()}')
-        self.stdout.write(f'💬 Comments: {Comment.objects.count()}')
\ No newline at end of file
+        self.stdout.write(f'💬 Comments: {Comment.objects.count()}')
+
+    def seed_scale(self, options):
+        if options['scale'] <= 0:
+            raise CommandError('--scale must be positive')
+
+        sizes = data_generator.scaled_sizes(options['scale'])
+        self.stdout.write(
+            '📈 Generating ' + ', '.join(f'{count:,} {name}' for name, count in sizes.items())
+            + f' with {options["workers"]} worker(s)...'
+        )
+
+        def progress(kind, rows, seconds):
+            self.stdout.write(f'  {kind}: {rows:,} rows in {seconds:.2f}s', ending='\r')
+            self.stdout.flush()
+
+        report = data_generator.generate(
+            scale=options['scale'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            seed=options['seed'],
+            progress=progress if self.stdout.isatty() else None,
+        )
+
+        self.stdout.write(self.style.SUCCESS('✅ SYNTHETIC DATA GENERATED!'))
+        for table, rows in sorted(report.rows.items()):
+            self.stdout.write(f'  {table:<24}{rows:>12,} rows')
+        for name, rows, seconds in report.phases:
+            self.stdout.write(f'  {name:<24}{rows:>12,} rows in {seconds:6.1f}s ({rows / seconds:,.0f} rows/s)')
+        self.stdout.write(
+            f'Total: {report.total_rows:,} rows in {report.elapsed:.1f}s '
+            f'({report.total_rows / report.elapsed:,.0f} rows/s)'
+        )
@@ -11,6 +11,15 @@ SHARED_MESSAGES: Dict[str, MessageTemplate] = {
         },
         "status_code": 200
     },
+    "JOB_ACCEPTED": {
+        "id": "JOB_ACCEPTED",
+        "messages": {
+            "en": "The job has been queued",
+            "uz": "Vazifa navbatga qo'yildi",
+            "ru": "Задача поставлена в очередь",
+        },
+        "status_code": 202
+    },
     "CREATED": {
         "id": "CREATED",
         "messages": {
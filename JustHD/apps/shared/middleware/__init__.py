@@ -1,3 +1,5 @@
 from .language_middleware import LanguageMiddleware
+from .metrics_middleware import MetricsMiddleware
+from .replica_routing_middleware import ReplicaRoutingMiddleware
 
-__all__ = ['LanguageMiddleware']
\ No newline at end of file
+__all__ = ['LanguageMiddleware', 'MetricsMiddleware', 'ReplicaRoutingMiddleware']
@@ -0,0 +1,35 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from apps.shared.utils.metrics import execute_wrapper, finish_request, registry, start_request
+
+class MetricsMiddleware:
+    """
+    Record latency, query count, DB time, serialization and rendering time
+    of every request under its resolved URL name. Keep it first in MIDDLEWARE
+    so the latency covers the whole stack.
+
+    Under ASGI Django runs this middleware in the request's thread-sensitive
+    thread, and the async views' sync_to_async calls run there too, so their
+    queries go through the same wrapped connections.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        metrics, token = start_request()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            finish_request(token)
+
+        match = request.resolver_match
+        view = match.view_name if match is not None else 'unmatched'
+        registry.record(view, request.method, response.status_code, time.perf_counter() - started, metrics)
+        return response
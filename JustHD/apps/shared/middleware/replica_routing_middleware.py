@@ -0,0 +1,22 @@
+from apps.shared.db.routers import SAFE_METHODS, finish_request, pin_to_primary, resolved_user_id, start_request
+
+class ReplicaRoutingMiddleware:
+    """
+    Scope replica routing to the current request and pin users who just
+    wrote to the primary for the sticky window.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state, token = start_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_request(token)
+
+        if state.wrote and request.method not in SAFE_METHODS and response.status_code < 400:
+            user_id = resolved_user_id(request)
+            if user_id is not None:
+                pin_to_primary(user_id)
+        return response
@@ -0,0 +1,32 @@
+from apps.shared.utils.conditional import (
+    build_etag, not_modified_response, queryset_fingerprint, request_identity,
+    set_validators
+)
+
+class ConditionalGetMixin:
+    """
+    ETag support for list views. The ETag comes from a count/max(updated_at)
+    fingerprint of the filtered queryset, so a matching request is answered
+    with 304 before anything is serialized. There is no Last-Modified: it
+    would not move when a row is deleted, the count in the ETag does.
+
+    Writes to served fields must move updated_at; rating and like counters
+    do. views_count is the exception: bumping updated_at on every detail
+    view would defeat the validators, so a 304 may carry a stale view count.
+    """
+
+    def get_related_versions(self):
+        return []
+
+    def get_etag(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        count, latest = queryset_fingerprint(queryset)
+        return build_etag(*request_identity(request), count, latest, *self.get_related_versions())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        response = not_modified_response(request, etag)
+        if response is not None:
+            return response
+        response = super().get(request, *args, **kwargs)
+        return set_validators(response, etag)
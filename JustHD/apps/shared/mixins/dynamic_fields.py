@@ -0,0 +1,64 @@
+from rest_framework import serializers
+
+def get_field_params(request):
+    """
+    Parse ``?fields=`` and ``?expand=`` from the request. ``fields`` is None
+    when the client did not ask for a sparse fieldset.
+    """
+    query_params = getattr(request, 'query_params', None)
+    if query_params is None:
+        return None, set()
+    fields = query_params.get('fields')
+    expand = query_params.get('expand', '')
+    expand = {name.strip() for name in expand.split(',') if name.strip()}
+    if not fields:
+        return None, expand
+    return {name.strip() for name in fields.split(',') if name.strip()}, expand
+
+def is_field_requested(request, name):
+    fields, expand = get_field_params(request)
+    return fields is None or name in fields or name in expand
+
+class DynamicFieldsMixin:
+    """
+    Serializer side of sparse fieldsets. With ``?fields=`` only the listed
+    fields are rendered; relations listed in ``expandable_fields`` are
+    rendered as primary keys unless they are also named in ``?expand=``.
+    Without ``?fields=`` the serializer output is unchanged. Pass
+    ``sparse_fields=False`` in the context to always render the full shape.
+    """
+    expandable_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.context.get('sparse_fields', True):
+            return
+        fields, expand = get_field_params(self.context.get('request'))
+        if fields is None:
+            return
+
+        for name in list(self.fields):
+            if name in self.expandable_fields and name in expand:
+                continue
+            if name not in fields:
+                self.fields.pop(name)
+            elif name in self.expandable_fields:
+                many = isinstance(self.fields[name], serializers.ListSerializer)
+                self.fields[name] = serializers.PrimaryKeyRelatedField(many=many, read_only=True)
+
+class DynamicFieldsViewMixin:
+    """
+    View side of sparse fieldsets: only join or prefetch the relations that
+    back fields the client actually requested.
+    """
+    field_select_related = {}
+    field_prefetch_related = {}
+
+    def apply_requested_fields(self, queryset):
+        for field, lookup in self.field_select_related.items():
+            if is_field_requested(self.request, field):
+                queryset = queryset.select_related(lookup)
+        for field, lookup in self.field_prefetch_related.items():
+            if is_field_requested(self.request, field):
+                queryset = queryset.prefetch_related(lookup)
+        return queryset
@@ -0,0 +1,28 @@
+import time
+
+from apps.shared.utils.metrics import current_request_metrics
+
+class SerializationMetricsMixin:
+    """
+    Generic view side of the request metrics: time spent in the serializer's
+    to_representation, queries of method fields included, is added to the
+    request's serialization time. Rendering the body is timed separately.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        metrics = current_request_metrics()
+        if metrics is None:
+            return serializer
+
+        to_representation = serializer.to_representation
+
+        def timed_to_representation(instance):
+            started = time.perf_counter()
+            try:
+                return to_representation(instance)
+            finally:
+                metrics.serialization_seconds += time.perf_counter() - started
+
+        serializer.to_representation = timed_to_representation
+        return serializer
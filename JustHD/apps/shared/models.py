@@ -72,4 +72,42 @@ class Media(BaseModel):
                 self.mime_type = self.file.file.content_type
             else:
                 self.mime_type = 'application/octet-stream'
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+class BulkJob(BaseModel):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    target = models.CharField(max_length=50)
+    action = models.CharField(max_length=50)
+    object_ids = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    affected = models.PositiveIntegerField(default=0)
+    chunk_size = models.PositiveIntegerField(default=200)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+        null=True, blank=True,
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'bulk_jobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.target}.{self.action} ({self.status})"
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100.0
+        return round(self.processed * 100 / self.total, 1)
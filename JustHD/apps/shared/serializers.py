@@ -0,0 +1,21 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import BulkJob
+
+class BulkJobSerializer(serializers.ModelSerializer):
+    progress = serializers.FloatField(read_only=True)
+    status_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BulkJob
+        fields = [
+            'uuid', 'target', 'action', 'status', 'total', 'processed', 'affected',
+            'progress', 'error', 'created_by', 'created_at', 'started_at',
+            'heartbeat_at', 'finished_at', 'status_url',
+        ]
+
+    def get_status_url(self, obj):
+        url = reverse('admin_shared:bulk-job-detail', args=[obj.uuid])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
@@ -1,3 +1,431 @@
-from django.test import TestCase
+import itertools
+import json
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.movies.models import Movie, MovieView
+from apps.shared.db import routers
+from apps.shared.db.pool import ConnectionPool, PoolTimeout
+from apps.shared.models import BulkJob
+from apps.shared.utils import data_generator, metrics
+from apps.shared.utils.benchmark import build_scenarios, compare, percentile, run_scenario
+from apps.shared.utils.bulk_jobs import delete_in_batches, resume_stale_jobs, run_job
+from apps.shared.utils.import_profile import imported_modules, parse_importtime, run_importtime, total_us
+from apps.shared.utils.seeding import seed_catalog
+
+SAMPLE_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     encodings.aliases
+import time:       200 |        300 |   encodings
+import time:        50 |         50 |   json.decoder
+import time:       400 |        750 | apps.movies.serializers
+import time:        80 |         80 | telebot
+"""
+
+# Generous enough for slow CI machines; the lazy-module checks below are the
+# precise guard. Override with IMPORT_TIME_BUDGET_MS.
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', 1000))
+
+# Production settings: debug toolbar off, Telegram alerts configured.
+PRODUCTION_ENV = {
+    'DEBUG': 'False',
+    'SECRET_KEY': 'import-time-budget-' + 'x' * 50,
+    'DATABASE_URL': 'sqlite://:memory:',
+    'TELEGRAM_BOT_TOKEN': '123:import-time-budget',
+}
+
+class ImportProfileTest(SimpleTestCase):
+    def test_parse_importtime_builds_tree(self):
+        roots = parse_importtime(SAMPLE_IMPORTTIME)
+
+        self.assertEqual([node.name for node in roots], ['apps.movies.serializers', 'telebot'])
+        self.assertEqual([node.name for node in roots[0].children], ['encodings', 'json.decoder'])
+        self.assertEqual(roots[0].children[0].children[0].name, 'encodings.aliases')
+        self.assertEqual(roots[0].package, 'apps.movies')
+        self.assertEqual(total_us(roots), 830)
+
+    def test_worker_boot_import_budget(self):
+        roots = min((run_importtime(env=PRODUCTION_ENV) for _ in range(3)), key=total_us)
+        modules = imported_modules(roots)
+
+        for module in ('telebot', 'numpy', 'debug_toolbar.toolbar', 'drf_spectacular.views'):
+            self.assertFalse(module in modules, f'{module} is imported at worker boot')
+        self.assertLess(total_us(roots) / 1000, IMPORT_TIME_BUDGET_MS)
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.healthy = True
+
+class ConnectionPoolTest(SimpleTestCase):
+    def make_pool(self, **options):
+        counter = itertools.count(1)
+        return ConnectionPool(
+            connect=lambda: FakeConnection(next(counter)),
+            check=lambda connection: connection.healthy,
+            reset=lambda connection: not connection.closed,
+            close=lambda connection: setattr(connection, 'closed', True),
+            **options
+        )
+
+    def test_connections_are_reused(self):
+        pool = self.make_pool()
+        first = pool.getconn()
+        pool.putconn(first)
+
+        self.assertIs(pool.getconn(), first)
+        stats = pool.stats()
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_checkout_times_out_when_exhausted(self):
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_broken_connections_are_discarded(self):
+        pool = self.make_pool()
+        connection = pool.getconn()
+        connection.closed = True
+        pool.putconn(connection)
+
+        self.assertIsNot(pool.getconn(), connection)
+        self.assertEqual(pool.stats()['connections_opened'], 2)
+
+    def test_idle_connections_are_reaped_and_health_checked(self):
+        pool = self.make_pool(min_size=1, max_idle=60, health_check_after=30)
+        first, second = pool.getconn(), pool.getconn()
+        pool.putconn(first)
+
+        with mock.patch('apps.shared.db.pool.time.monotonic') as monotonic:
+            # Returning the second connection reaps the first, which idled past max_idle.
+            monotonic.return_value = 10 ** 6
+            pool.putconn(second)
+            self.assertTrue(first.closed)
+            self.assertEqual(pool.stats()['size'], 1)
+
+            # The survivor fails its ping after idling, so a fresh one is opened.
+            monotonic.return_value += 45
+            second.healthy = False
+            third = pool.getconn()
+        self.assertEqual(third.number, 3)
+        self.assertEqual(pool.stats()['health_check_failures'], 1)
+
+class PrimaryReplicaRouterTest(TransactionTestCase):
+    # Reads inside a transaction always use the primary, so no TestCase wrapping.
+    def setUp(self):
+        cache.clear()
+        self.router = routers.PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        self.user = get_user_model().objects.create_user(
+            username='reader', email='reader@example.com', password='testpass123'
+        )
+        patcher = mock.patch.object(routers, 'healthy_replicas', return_value=['replica_1'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read_in_request(self, method='get', user=None, write_first=False):
+        request = getattr(self.factory, method)('/api/v1/movies/')
+        if user is not None:
+            request.user = user
+        state, token = routers.start_request(request)
+        try:
+            if write_first:
+                self.router.db_for_write(Movie)
+            return self.router.db_for_read(Movie)
+        finally:
+            routers.finish_request(token)
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertIsNone(self.router.db_for_read(Movie))
+        self.assertEqual(self.router.db_for_write(Movie), 'default')
+
+    def test_safe_request_reads_use_replica(self):
+        self.assertEqual(self.read_in_request(), 'replica_1')
+
+    def test_unsafe_request_and_reads_after_a_write_use_primary(self):
+        self.assertIsNone(self.read_in_request(method='post'))
+        self.assertIsNone(self.read_in_request(write_first=True))
+
+    def test_user_is_pinned_after_writing(self):
+        movie = Movie.objects.create(title='Pinned', slug='pinned', release_year=2023, duration=90)
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(reverse('ratings:rating-create'), {'movie': movie.id, 'score': 7})
+        self.assertEqual(response.status_code, 201)
+
+        self.assertTrue(cache.get(routers.pin_cache_key(self.user.pk)))
+        self.assertIsNone(self.read_in_request(user=self.user))
+        self.assertEqual(self.read_in_request(), 'replica_1')
+
+class ReplicaLagTest(SimpleTestCase):
+    def test_lagging_replicas_are_skipped(self):
+        lags = {'replica_1': 0.5, 'replica_2': 30.0, 'replica_3': None}
+        with mock.patch.object(routers, 'replica_aliases', return_value=list(lags)), \
+                mock.patch.object(routers, 'replica_lag', side_effect=lags.get):
+            self.assertEqual(routers.healthy_replicas(), ['replica_1'])
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(METRICS={'DIR': self.directory, 'FLUSH_INTERVAL': 0})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        Movie.objects.create(title='Metered', slug='metered', release_year=2023, duration=90)
+
+    def scrape(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('admin_shared:metrics'))
+        self.client.force_authenticate(user=None)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode()
+
+    def test_requests_are_recorded_per_view(self):
+        self.client.get(reverse('movies:movie-list'))
+        body = self.scrape()
+
+        labels = 'view="movies:movie-list",method="GET"'
+        self.assertIn(f'justhd_http_requests_total{{{labels},status="2xx"}}', body)
+        self.assertIn(f'justhd_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}', body)
+        self.assertIn(f'justhd_db_queries_per_request_count{{{labels}}}', body)
+        series = metrics.collect()['movies:movie-list|GET']
+        self.assertGreater(series['queries'], 0)
+        self.assertGreater(series['serialization_seconds'], 0)
+        self.assertGreater(series['render_seconds'], 0)
+        self.assertIn(f'justhd_render_seconds_total{{{labels}}}', body)
+
+    async def test_async_views_are_recorded(self):
+        def recorded():
+            series = metrics.collect().get('movies_async:movie-list|GET', metrics._empty_series())
+            return series['count'], series['queries']
+
+        count, queries = await sync_to_async(recorded)()
+        await self.async_client.get(reverse('movies_async:movie-list'))
+        # The queries run through sync_to_async in the view are counted too.
+        self.assertEqual(await sync_to_async(recorded)(), (count + 1, queries + 4))
+
+    def test_metrics_require_admin(self):
+        response = self.client.get(reverse('admin_shared:metrics'))
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_exited_workers_are_folded_into_archive(self):
+        series = metrics._empty_series()
+        series['count'] = 5
+        series['statuses'] = {'2xx': 5}
+        # No process can have this pid, so the snapshot belongs to an exited worker.
+        with open(os.path.join(self.directory, 'worker-99999999.json'), 'w') as f:
+            json.dump({'exited:view|GET': series}, f)
+
+        self.assertEqual(metrics.collect()['exited:view|GET']['count'], 5)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'worker-99999999.json')))
+        # Still counted on the next scrape, from the archive.
+        self.assertEqual(metrics.collect()['exited:view|GET']['count'], 5)
+
+class BenchmarkTest(TestCase):
+    def test_seeded_catalog_is_reproducible(self):
+        catalog = seed_catalog(movies=30, users=10, views=300, ratings=60, comments=40, seed=7)
+
+        self.assertEqual(catalog.counts['movies'], 30)
+        self.assertEqual(sum(Movie.objects.values_list('views_count', flat=True)), 300)
+        first_titles = list(Movie.objects.order_by('slug').values_list('title', flat=True))
+
+        Movie.objects.all().delete()
+        get_user_model().objects.all().delete()
+        seed_catalog(movies=30, users=10, views=300, ratings=60, comments=40, seed=7)
+        self.assertEqual(list(Movie.objects.order_by('slug').values_list('title', flat=True)), first_titles)
+
+    def test_scenarios_record_latency_and_queries(self):
+        catalog = seed_catalog(movies=20, users=5, views=100, ratings=20, comments=20)
+        scenarios = {scenario.name: scenario for scenario in build_scenarios(catalog)}
+
+        stats = run_scenario(self.client, scenarios['movie_list'], requests=5, warmup=1)
+        self.assertEqual(stats['errors'], 0)
+        self.assertGreater(stats['queries_per_request'], 0)
+        self.assertLessEqual(stats['p50_ms'], stats['p95_ms'])
+        self.assertLessEqual(stats['p95_ms'], stats['p99_ms'])
+
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_compare_reports_regressions(self):
+        baseline = {'scenarios': {'movie_list': {'errors': 0, 'queries_per_request': 4, 'p95_ms': 20.0}}}
+
+        within = {'scenarios': {'movie_list': {'errors': 0, 'queries_per_request': 4, 'p95_ms': 24.0}}}
+        self.assertEqual(compare(within, baseline, tolerance=0.25), [])
+
+        slower = {'scenarios': {'movie_list': {'errors': 0, 'queries_per_request': 5, 'p95_ms': 40.0}}}
+        regressions = compare(slower, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('movie_list: queries/request'))
+
+class DataGeneratorTest(TestCase):
+    def test_scale_generates_every_table(self):
+        from apps.comments.models import Comment
+        from apps.movies.models import Episode, MovieView
+        from apps.ratings.models import Rating
+
+        report = data_generator.generate(scale=0.001, chunk_size=500, seed=3)
+        sizes = data_generator.scaled_sizes(0.001)
+
+        self.assertEqual(Movie.objects.count(), sizes['movies'])
+        self.assertEqual(MovieView.objects.count(), sizes['views'])
+        # A tiny catalog caps ratings at half of all (user, movie) pairs.
+        self.assertEqual(Rating.objects.count(), min(sizes['ratings'], sizes['users'] * sizes['movies'] // 2))
+        self.assertEqual(Comment.objects.count(), sizes['comments'])
+        self.assertTrue(Comment.objects.filter(parent__isnull=False).exists())
+        self.assertEqual(report.rows['movie_views'], sizes['views'])
+        self.assertEqual(Episode.objects.count(), report.rows['episodes'])
+
+        movie = Movie.objects.order_by('-views_count').first()
+        self.assertTrue(movie.title_en and movie.title_uz and movie.title_ru)
+        self.assertNotEqual(movie.title_en, movie.title_ru)
+        # Zipf popularity: the top title is far above the median one.
+        counts = sorted(Movie.objects.values_list('views_count', flat=True))
+        self.assertGreater(counts[-1], 3 * counts[len(counts) // 2])
+        self.assertEqual(sum(counts), sizes['views'])
+
+        # Explicit ids must not leave the sequences behind.
+        Movie.objects.create(title='After', slug='after', release_year=2023, duration=90)
+
+    def test_chunks_are_deterministic(self):
+        from django.utils import timezone
+
+        context = data_generator.GenerationContext(
+            seed=5, sizes=data_generator.scaled_sizes(0.001), now=timezone.now(),
+            first_ids={'movies': 1, 'users': 1, 'comments': 1}, password='', category_ids={},
+            genre_ids=[], popular_movie_ids=list(range(1, 11)), zipf=data_generator.Zipf(10),
+        )
+        first, _ = data_generator._view_chunk(context, 0, 0, 50)
+        second, _ = data_generator._view_chunk(context, 0, 0, 50)
+        self.assertEqual(first, second)
+
+class BulkJobTest(TestCase):
+    def setUp(self):
+        self.movies = [
+            Movie.objects.create(
+                title=f'Movie {number}', slug=f'movie-{number}', description='Description',
+                release_year=2020, duration=100
+            )
+            for number in range(5)
+        ]
+        self.ids = [movie.id for movie in self.movies]
+
+    def test_stale_job_resumes_after_last_chunk(self):
+        job = BulkJob.objects.create(
+            target='movies', action='deactivate', object_ids=self.ids, total=5, chunk_size=2,
+            status='running', processed=2, affected=2,
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(resume_stale_jobs(), [job])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.affected), ('succeeded', 5, 5))
+        # The first chunk was recorded as done before the worker stopped.
+        self.assertEqual(Movie.objects.filter(is_active=False).count(), 3)
+
+    def test_running_job_is_not_claimed_twice(self):
+        job = BulkJob.objects.create(
+            target='movies', action='deactivate', object_ids=self.ids, total=5,
+            status='running', heartbeat_at=timezone.now(),
+        )
+        self.assertIsNone(run_job(job.pk))
+        self.assertEqual(resume_stale_jobs(), [])
+
+    def test_prepare_steps_keep_the_heartbeat_fresh(self):
+        from apps.movies import bulk_actions
+
+        MovieView.objects.bulk_create([MovieView(movie=self.movies[0], ip_address='127.0.0.1') for _ in range(3)])
+        job = BulkJob.objects.create(target='movies', action='delete', object_ids=self.ids, total=5)
+        beats = []
+
+        def purge(ids):
+            delete_in_batches(MovieView.objects.filter(movie_id__in=ids), batch_size=1)
+            beats.append(BulkJob.objects.get(pk=job.pk).heartbeat_at)
+
+        with mock.patch.dict(bulk_actions.PREPARE, {'delete': purge}):
+            run_job(job.pk)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertGreater(beats[0], job.started_at)
+
+    def test_reclaimed_job_stops_at_its_next_heartbeat(self):
+        from apps.movies import bulk_actions
+
+        MovieView.objects.create(movie=self.movies[0], ip_address='127.0.0.1')
+        job = BulkJob.objects.create(target='movies', action='delete', object_ids=self.ids, total=5)
+
+        def purge(ids):
+            # Another worker took the job over while this one was purging.
+            BulkJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() + timedelta(seconds=1))
+            delete_in_batches(MovieView.objects.filter(movie_id__in=ids))
+
+        with mock.patch.dict(bulk_actions.PREPARE, {'delete': purge}):
+            self.assertIsNone(run_job(job.pk))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), ('running', 0))
+        self.assertEqual(Movie.objects.count(), 5)
+
+    def test_claim_compares_the_heartbeat_it_read(self):
+        stale = timezone.now() - timedelta(hours=1)
+        job = BulkJob.objects.create(
+            target='movies', action='deactivate', object_ids=self.ids, total=5,
+            status='running', heartbeat_at=stale,
+        )
+        read_first = QuerySet.first
+
+        def read_then_reclaimed(queryset):
+            # Another worker claims the job between this worker's read and its update.
+            row = read_first(queryset)
+            BulkJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now())
+            return row
+
+        with mock.patch.object(QuerySet, 'first', read_then_reclaimed):
+            self.assertIsNone(run_job(job.pk))
+        self.assertEqual(Movie.objects.filter(is_active=False).count(), 0)
+
+    def test_failure_is_recorded(self):
+        job = BulkJob.objects.create(target='movies', action='activate', object_ids=self.ids, total=5)
+        with mock.patch('apps.movies.bulk_actions.Movie.objects.filter', side_effect=RuntimeError('boom')):
+            run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', 'boom'))
+
+    def test_delete_in_batches(self):
+        MovieView.objects.bulk_create([
+            MovieView(movie=self.movies[index % 2], ip_address='127.0.0.1') for index in range(7)
+        ])
+        deleted = delete_in_batches(MovieView.objects.filter(movie=self.movies[0]), batch_size=2)
+        self.assertEqual(deleted, 4)
+        self.assertEqual(MovieView.objects.count(), 3)
@@ -0,0 +1,10 @@
+from django.urls import path
+from ..views import BulkJobDetailView, BulkJobListView, MetricsView
+
+app_name = 'admin_shared'
+
+urlpatterns = [
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('jobs/', BulkJobListView.as_view(), name='bulk-job-list'),
+    path('jobs/<uuid:uuid>/', BulkJobDetailView.as_view(), name='bulk-job-detail'),
+]
@@ -0,0 +1,123 @@
+"""
+Request-level API benchmarks. Scenarios are driven through the Django test
+client so a run measures the full middleware, view, serializer and renderer
+stack without network noise, and every database query is counted.
+"""
+import itertools
+import math
+import statistics
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from django.db import connections
+from django.urls import reverse
+
+@dataclass
+class Scenario:
+    name: str
+    paths: list
+    auth: str = 'anonymous'
+
+class QueryCounter:
+    """``execute_wrapper`` that counts queries on every connection it is installed on."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+def percentile(values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+def build_scenarios(catalog, sample=50):
+    """The hot read endpoints, fed from the most viewed slugs of a seeded catalog."""
+    slugs = catalog.movie_slugs[:sample]
+    genre = catalog.genre_slugs[0]
+    movies_url = reverse('movies:movie-list')
+    return [
+        Scenario('movie_list', [movies_url]),
+        Scenario('movie_list_filtered', [
+            f'{movies_url}?genre={slug}&ordering=-views_count' for slug in catalog.genre_slugs
+        ] + [
+            f'{movies_url}?category={slug}&ordering=-release_year' for slug in catalog.category_slugs
+        ]),
+        Scenario('movie_list_premium', [f'{movies_url}?genre={genre}&ordering=-created_at'], auth='user'),
+        Scenario('movie_detail', [reverse('movies:movie-detail', args=[slug]) for slug in slugs]),
+        Scenario('movie_search', [
+            f'{reverse("movies:movie-search")}?q={term}' for term in catalog.search_terms
+        ]),
+        Scenario('home_feed', [reverse('movies:home-feed')]),
+        Scenario('movie_facets', [
+            f'{reverse("movies:movie-facets")}?genre={slug}' for slug in catalog.genre_slugs
+        ]),
+        Scenario('movie_comments', [reverse('comments:movie-comments', args=[slug]) for slug in slugs]),
+        Scenario('movie_ratings', [reverse('ratings:movie-ratings', args=[slug]) for slug in slugs]),
+        Scenario('admin_dashboard', [reverse('admin_movies:dashboard')], auth='admin'),
+    ]
+
+def run_scenario(client, scenario, requests, warmup=0, headers=None):
+    """
+    Issue ``warmup`` unmeasured and ``requests`` measured GETs, cycling over
+    the scenario paths, and summarise latency, throughput and queries.
+    """
+    headers = headers or {}
+    paths = itertools.cycle(scenario.paths)
+    for _ in range(warmup):
+        client.get(next(paths), **headers)
+
+    counter = QueryCounter()
+    timings = []
+    errors = 0
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        started = time.perf_counter()
+        for _ in range(requests):
+            request_started = time.perf_counter()
+            response = client.get(next(paths), **headers)
+            timings.append((time.perf_counter() - request_started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+        elapsed = time.perf_counter() - started
+
+    timings.sort()
+    return {
+        'requests': requests,
+        'errors': errors,
+        'mean_ms': round(statistics.mean(timings), 3) if timings else 0.0,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'max_ms': round(timings[-1], 3) if timings else 0.0,
+        'throughput_rps': round(requests / elapsed, 2) if elapsed else 0.0,
+        'queries_per_request': round(counter.count / requests, 2) if requests else 0.0,
+    }
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=2.0):
+    """
+    Regressions of ``results`` against ``baseline``. Query counts are
+    deterministic and compared exactly; latency may drift by ``tolerance``
+    (a fraction) and by at least ``min_delta_ms`` before it is reported.
+    """
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        if current['errors'] > previous['errors']:
+            regressions.append(f'{name}: errors {previous["errors"]} -> {current["errors"]}')
+        if current['queries_per_request'] > previous['queries_per_request']:
+            regressions.append(
+                f'{name}: queries/request {previous["queries_per_request"]} -> {current["queries_per_request"]}'
+            )
+        limit = max(previous['p95_ms'] * (1 + tolerance), previous['p95_ms'] + min_delta_ms)
+        if current['p95_ms'] > limit:
+            regressions.append(f'{name}: p95 {previous["p95_ms"]} ms -> {current["p95_ms"]} ms')
+    return regressions
@@ -0,0 +1,176 @@
+"""
+Admin bulk actions as resumable background jobs.
+
+A job stores the selected ids and walks them in ``chunk_size`` slices, each
+applied and recorded in its own short transaction, so a large selection
+never holds row locks for the whole run and an interrupted job continues
+from its last finished chunk. Handlers live in a ``bulk_actions`` module of
+the owning app:
+
+    ACTIONS = {'activate': activate, ...}  # ids -> affected rows
+    PREPARE = {'delete': purge_children}   # ids -> None, optional
+    finish(job)                            # optional, once at the end
+
+Internal jobs that are not admin actions (the similar-movie refreshes)
+keep their handlers next to the code they run.
+
+``PREPARE`` handlers run before a chunk's transaction and are expected to
+manage their own (see ``delete_in_batches``). Long steps call ``heartbeat()``
+so the job is not taken for abandoned; claims and heartbeats compare-and-set
+the last heartbeat, and a worker whose job was reclaimed stops at its next one.
+"""
+import logging
+import threading
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.shared.models import BulkJob
+
+logger = logging.getLogger(__name__)
+
+_running = threading.local()
+
+TARGETS = {
+    'movies': 'apps.movies.bulk_actions',
+    'comments': 'apps.comments.bulk_actions',
+    'ratings': 'apps.ratings.bulk_actions',
+    'movie_similarities': 'apps.movies.utils.similarity',
+}
+
+def _setting(name):
+    return settings.BULK_JOBS[name]
+
+def get_handlers(target):
+    return import_module(TARGETS[target])
+
+def get_actions(target):
+    return get_handlers(target).ACTIONS
+
+def submit_bulk_job(target, action, object_ids, user=None):
+    """Record a job and start it once the surrounding transaction commits."""
+    object_ids = list(dict.fromkeys(object_ids))
+    job = BulkJob.objects.create(
+        target=target,
+        action=action,
+        object_ids=object_ids,
+        total=len(object_ids),
+        chunk_size=_setting('CHUNK_SIZE'),
+        created_by=user if user and user.is_authenticated else None,
+    )
+    transaction.on_commit(lambda: start_job(job.pk))
+    return job
+
+def start_job(job_id):
+    if not _setting('RUN_IN_BACKGROUND'):
+        run_job(job_id)
+        return
+    threading.Thread(target=_run_in_thread, args=(job_id,), daemon=True).start()
+
+def _run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        connections.close_all()
+
+def _claimable():
+    stale = timezone.now() - timedelta(seconds=_setting('STALE_AFTER'))
+    return Q(status='pending') | Q(status='running', heartbeat_at__lt=stale)
+
+class JobLost(Exception):
+    """Another worker reclaimed the job this thread was running."""
+
+def heartbeat():
+    """Mark the job running in this thread as alive; no-op outside a job."""
+    state = getattr(_running, 'job', None)
+    if state is None:
+        return
+    job_id, last = state
+    now = timezone.now()
+    if not BulkJob.objects.filter(pk=job_id, status='running', heartbeat_at=last).update(heartbeat_at=now):
+        raise JobLost(job_id)
+    _running.job = (job_id, now)
+
+def _claim(job_id):
+    job = BulkJob.objects.filter(_claimable(), pk=job_id).values('status', 'heartbeat_at').first()
+    if job is None:
+        return None
+    now = timezone.now()
+    # Compare-and-set on what was read: of two workers reclaiming one stale job, only one wins.
+    claimed = BulkJob.objects.filter(pk=job_id, **job).update(status='running', heartbeat_at=now, started_at=now)
+    return now if claimed else None
+
+def run_job(job_id):
+    """
+    Claim and run a pending (or abandoned) job. Returns the job, or None
+    when another worker holds it.
+    """
+    claimed_at = _claim(job_id)
+    if claimed_at is None:
+        return None
+
+    # A job run from another job's on_commit callback hands the outer one back afterwards.
+    outer = getattr(_running, 'job', None)
+    _running.job = (job_id, claimed_at)
+    job = BulkJob.objects.get(pk=job_id)
+    try:
+        handlers = get_handlers(job.target)
+        apply = handlers.ACTIONS[job.action]
+        prepare = getattr(handlers, 'PREPARE', {}).get(job.action)
+        for start in range(job.processed, job.total, job.chunk_size):
+            ids = job.object_ids[start:start + job.chunk_size]
+            if prepare:
+                prepare(ids)
+            with transaction.atomic():
+                affected = apply(ids)
+                BulkJob.objects.filter(pk=job.pk).update(
+                    processed=start + len(ids),
+                    affected=F('affected') + affected,
+                )
+                # Inside the chunk's transaction, so a lost job also rolls the chunk back.
+                heartbeat()
+        job.refresh_from_db()
+        finish = getattr(handlers, 'finish', None)
+        if finish:
+            finish(job)
+        job.status = 'succeeded'
+    except JobLost:
+        logger.warning(f'Bulk job {job.uuid} was reclaimed by another worker')
+        return None
+    except Exception as exc:
+        logger.exception(f'Bulk job {job.uuid} ({job.target}.{job.action}) failed')
+        job.refresh_from_db()
+        job.status = 'failed'
+        job.error = str(exc)
+    finally:
+        _running.job = outer
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+    return job
+
+def resume_stale_jobs():
+    """Run every pending job and every running job whose worker went away."""
+    job_ids = list(BulkJob.objects.filter(_claimable()).order_by('created_at').values_list('pk', flat=True))
+    return [job for job in map(run_job, job_ids) if job is not None]
+
+def delete_in_batches(queryset, batch_size=None):
+    """
+    Delete the rows of ``queryset`` with plain ``DELETE ... WHERE pk IN``
+    statements of ``batch_size`` rows, one transaction each, without
+    loading them into Python or running the deletion collector. Only for
+    tables no other rows depend on.
+    """
+    batch_size = batch_size or _setting('CHILD_BATCH_SIZE')
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        with transaction.atomic(using=queryset.db):
+            deleted += model._base_manager.using(queryset.db).filter(pk__in=pks)._raw_delete(queryset.db)
+        heartbeat()
@@ -0,0 +1,51 @@
+import hashlib
+from typing import Any, Optional, Tuple
+from django.db.models import Count, Max, OuterRef, QuerySet, Subquery
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+VARY_HEADERS = ('Accept-Language', 'Authorization')
+
+def build_etag(*parts: Any) -> str:
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+def request_identity(request) -> Tuple[str, str, Optional[int]]:
+    """Everything besides the data itself that changes a catalog payload."""
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    return request.get_full_path(), getattr(request, 'lang', 'en'), user_id
+
+def queryset_fingerprint(queryset: QuerySet):
+    """Row count and newest updated_at of a queryset, without loading rows."""
+    result = queryset.aggregate(count=Count('pk'), latest=Max('updated_at'))
+    return result['count'], result['latest']
+
+def latest_related_version(model, field: str) -> Subquery:
+    """Subquery for the newest updated_at of ``model`` rows pointing at the outer row."""
+    return Subquery(
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by('-updated_at')
+        .values('updated_at')[:1]
+    )
+
+def related_count(model, field: str) -> Subquery:
+    """Subquery for the number of ``model`` rows pointing at the outer row."""
+    return Subquery(
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('pk'))
+        .values('count')[:1]
+    )
+
+def not_modified_response(request, etag: str):
+    """A 304 response when the client's ETag still matches, otherwise None."""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_validators(response, etag)
+    return response
+
+def set_validators(response, etag: str):
+    response['ETag'] = etag
+    patch_vary_headers(response, VARY_HEADERS)
+    return response
@@ -0,0 +1,505 @@
+"""
+High-volume synthetic data for load testing. Primary keys are allocated up
+front, so every table is generated in independent, deterministic chunks that
+can be written by parallel worker processes. PostgreSQL receives the rows
+through COPY; other backends get a plain multi-row INSERT.
+"""
+import io
+import multiprocessing
+import random
+import time
+import uuid
+from bisect import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.shared.db.pool import close_pools
+from .seeding import CATEGORIES, PASSWORD, ensure_taxonomy
+
+CHUNK_SIZE = 20000
+ZIPF_EXPONENT = 1.07
+HISTORY_DAYS = 365
+PREFIX = 'gen'
+
+# Row counts at --scale 1. Episodes and videos follow from the movies.
+SCALE_ONE = {
+    'movies': 10000,
+    'users': 20000,
+    'ratings': 500000,
+    'comments': 200000,
+    'views': 2000000,
+}
+
+# Index-aligned, so every generated title has a matching translation.
+VOCABULARY = {
+    'en': (
+        'shadow', 'river', 'empire', 'silent', 'storm', 'golden', 'night', 'city',
+        'dragon', 'winter', 'hunter', 'lost', 'kingdom', 'secret', 'iron', 'ocean',
+        'desert', 'star', 'fire', 'garden', 'legend', 'stone', 'road', 'heart',
+    ),
+    'uz': (
+        'soya', 'daryo', 'imperiya', 'sokin', 'bo‘ron', 'oltin', 'tun', 'shahar',
+        'ajdaho', 'qish', 'ovchi', 'yo‘qolgan', 'qirollik', 'sir', 'temir', 'okean',
+        'cho‘l', 'yulduz', 'olov', 'bog‘', 'afsona', 'tosh', 'yo‘l', 'yurak',
+    ),
+    'ru': (
+        'тень', 'река', 'империя', 'тихий', 'шторм', 'золотой', 'ночь', 'город',
+        'дракон', 'зима', 'охотник', 'потерянный', 'королевство', 'тайна', 'железо', 'океан',
+        'пустыня', 'звезда', 'огонь', 'сад', 'легенда', 'камень', 'дорога', 'сердце',
+    ),
+}
+
+DESCRIPTIONS = {
+    'en': 'A story of the {0} and the {1}.',
+    'uz': '{0} va {1} haqidagi hikoya.',
+    'ru': 'История о том, как {0} встретил {1}.',
+}
+
+EPISODE_TITLES = {'en': 'Episode {0}', 'uz': '{0}-qism', 'ru': 'Серия {0}'}
+
+COMMENTS = {
+    'en': ('Loved the {0}!', 'The {0} scene was great', 'Not bad, the {0} was weak'),
+    'uz': ('{0} juda yoqdi!', '{0} sahnasi zo‘r', 'Yomon emas, lekin {0} sust'),
+    'ru': ('{0} просто супер!', 'Сцена с {0} отличная', 'Неплохо, но {0} слабовато'),
+}
+
+CONTENT_TYPE_WEIGHTS = {'movie': 60, 'tv_show': 20, 'cartoon': 12, 'documentary': 8}
+QUALITIES = ('SD', 'HD', 'FHD', 'UHD')
+AGE_RATINGS = ('G', 'PG', 'PG-13', 'R', 'NC-17')
+FIRST_NAMES = ('Aziz', 'Dilnoza', 'Ivan', 'Olga', 'Sardor', 'Madina', 'John', 'Anna', 'Timur', 'Nodira')
+LAST_NAMES = ('Karimov', 'Yusupova', 'Petrov', 'Smirnova', 'Rashidov', 'Aliyeva', 'Smith', 'Brown')
+PROFILE_LANGUAGES = {'uz': 50, 'ru': 30, 'en': 20}
+
+# Values of these field types reach the database unchanged.
+PLAIN_TYPES = {
+    'AutoField', 'BigAutoField', 'BigIntegerField', 'BooleanField', 'CharField', 'EmailField',
+    'FileField', 'FloatField', 'ForeignKey', 'GenericIPAddressField', 'ImageField', 'IntegerField',
+    'OneToOneField', 'PositiveIntegerField', 'PositiveSmallIntegerField', 'SlugField', 'TextField',
+    'URLField',
+}
+
+class Zipf:
+    """Draws 0-based ranks with P(rank k) proportional to 1 / (k + 1) ** exponent."""
+
+    def __init__(self, size, exponent=ZIPF_EXPONENT):
+        self.cumulative = []
+        total = 0.0
+        for rank in range(size):
+            total += 1 / (rank + 1) ** exponent
+            self.cumulative.append(total)
+        self.total = total
+
+    def sample(self, rng):
+        return bisect(self.cumulative, rng.random() * self.total)
+
+@dataclass
+class GenerationContext:
+    """Everything a chunk needs; inherited by forked workers instead of pickled."""
+    seed: int
+    sizes: dict
+    now: object
+    first_ids: dict
+    password: str
+    category_ids: dict
+    genre_ids: list
+    popular_movie_ids: list = field(default_factory=list)
+    zipf: Zipf = None
+
+@dataclass
+class GenerationReport:
+    rows: Counter = field(default_factory=Counter)
+    chunk_seconds: Counter = field(default_factory=Counter)
+    phases: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def total_rows(self):
+        return sum(self.rows.values())
+
+_context = None
+
+def scaled_sizes(scale):
+    return {name: max(int(count * scale), 1) for name, count in SCALE_ONE.items()}
+
+def _rng(context, kind, chunk):
+    return random.Random(f'{context.seed}:{kind}:{chunk}')
+
+def _moment(context, rng, days, skew=1):
+    # skew > 1 crowds events towards the present.
+    return context.now - timedelta(seconds=days * 86400 * rng.random() ** skew)
+
+def _base(rng, created_at):
+    return {'uuid': uuid.UUID(int=rng.getrandbits(128), version=4), 'created_at': created_at, 'updated_at': created_at}
+
+def _words(rng, count):
+    indexes = [rng.randrange(len(VOCABULARY['en'])) for _ in range(count)]
+    return {lang: [words[index] for index in indexes] for lang, words in VOCABULARY.items()}
+
+def _translated(prefix, values):
+    row = {f'{prefix}_{lang}': value for lang, value in values.items()}
+    row[prefix] = values['en']
+    return row
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+def _movie_chunk(context, chunk, first_id, count):
+    from apps.movies.models import Episode, Movie, Video
+
+    rng = _rng(context, 'movies', chunk)
+    movies, genre_links, category_links, episodes, videos = [], [], [], [], []
+    for movie_id in range(first_id, first_id + count):
+        created_at = _moment(context, rng, HISTORY_DAYS * 3)
+        words = _words(rng, rng.randint(2, 4))
+        titles = {lang: ' '.join(word.capitalize() for word in parts) for lang, parts in words.items()}
+        content_type = _weighted(rng, CONTENT_TYPE_WEIGHTS)
+        movies.append({
+            **_base(rng, created_at),
+            'id': movie_id,
+            **_translated('title', titles),
+            **_translated('description', {
+                lang: DESCRIPTIONS[lang].format(parts[0], parts[-1]) for lang, parts in words.items()
+            }),
+            'slug': f'{slugify(titles["en"])}-{movie_id}',
+            'release_year': rng.randint(1960, context.now.year),
+            'duration': rng.randint(20, 60) if content_type == 'tv_show' else rng.randint(70, 180),
+            'content_type': content_type,
+            'age_rating': rng.choice(AGE_RATINGS),
+            'imdb_rating': Decimal(rng.randint(30, 95)) / 10,
+            'is_premium': rng.random() < 0.25,
+            'is_active': rng.random() < 0.98,
+            'is_featured': rng.random() < 0.005,
+        })
+        category_links.append({'movie_id': movie_id, 'category_id': context.category_ids[content_type]})
+        for genre_id in rng.sample(context.genre_ids, rng.randint(1, 3)):
+            genre_links.append({'movie_id': movie_id, 'genre_id': genre_id})
+
+        for quality in rng.sample(QUALITIES, rng.randint(1, 3)):
+            videos.append({
+                **_base(rng, created_at),
+                'movie_id': movie_id,
+                'quality': quality,
+                'language': _weighted(rng, PROFILE_LANGUAGES),
+                'video_file': f'movies/videos/{PREFIX}/{movie_id}-{quality.lower()}.mp4',
+                'size': rng.randint(300, 8000) * 1024 * 1024,
+                'duration': movies[-1]['duration'] * 60,
+            })
+        if content_type == 'tv_show':
+            for season in range(1, rng.randint(1, 6) + 1):
+                for number in range(1, rng.randint(6, 12) + 1):
+                    episodes.append({
+                        **_base(rng, created_at),
+                        'tv_show_id': movie_id,
+                        'season_number': season,
+                        'episode_number': number,
+                        **_translated('title', {
+                            lang: template.format(number) for lang, template in EPISODE_TITLES.items()
+                        }),
+                        **_translated('description', {
+                            lang: DESCRIPTIONS[lang].format(parts[-1], parts[0]) for lang, parts in words.items()
+                        }),
+                        'duration': rng.randint(20, 60),
+                    })
+
+    return {
+        Movie: movies,
+        Movie.genres.through: genre_links,
+        Movie.categories.through: category_links,
+        Episode: episodes,
+        Video: videos,
+    }, {}
+
+def _user_chunk(context, chunk, first_id, count):
+    from apps.users.models import User, UserProfile
+
+    rng = _rng(context, 'users', chunk)
+    users, profiles = [], []
+    for user_id in range(first_id, first_id + count):
+        created_at = _moment(context, rng, HISTORY_DAYS * 2)
+        is_premium = rng.random() < 0.15
+        users.append({
+            **_base(rng, created_at),
+            'id': user_id,
+            'username': f'{PREFIX}-user-{user_id}',
+            'email': f'{PREFIX}-user-{user_id}@example.com',
+            'password': context.password,
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': rng.choice(LAST_NAMES),
+            'is_active': True,
+            'date_joined': created_at,
+            'is_premium': is_premium,
+            'premium_until': context.now + timedelta(days=rng.randint(1, 365)) if is_premium else None,
+        })
+        profiles.append({
+            **_base(rng, created_at),
+            'user_id': user_id,
+            'language': _weighted(rng, PROFILE_LANGUAGES),
+            'theme': rng.choice(('light', 'dark')),
+        })
+    return {User: users, UserProfile: profiles}, {}
+
+def _movie_quality(movie_id):
+    # A stable per-title mean so each movie's ratings agree with each other.
+    return 4 + (movie_id * 2654435761 % 1000) / 1000 * 5
+
+def _rating_chunk(context, chunk, first_user, user_count):
+    from apps.ratings.models import Rating
+
+    rng = _rng(context, 'ratings', chunk)
+    users, movies = context.sizes['users'], context.sizes['movies']
+    offset = first_user - context.first_ids['users']
+    # Integer quotas per user range add up to exactly the requested total.
+    quota = (context.sizes['ratings'] * (offset + user_count) // users
+             - context.sizes['ratings'] * offset // users)
+    quota = min(quota, user_count * movies // 2)
+
+    seen = set()
+    ratings = []
+    while len(ratings) < quota:
+        user_id = first_user + rng.randrange(user_count)
+        movie_id = context.popular_movie_ids[context.zipf.sample(rng)]
+        if (user_id, movie_id) in seen:
+            continue
+        seen.add((user_id, movie_id))
+        score = round(rng.gauss(_movie_quality(movie_id), 1.5))
+        ratings.append({
+            **_base(rng, _moment(context, rng, HISTORY_DAYS, skew=2)),
+            'user_id': user_id,
+            'movie_id': movie_id,
+            'score': min(max(score, 1), 10),
+        })
+    return {Rating: ratings}, {}
+
+def _comment_chunk(context, chunk, first_id, count):
+    from apps.comments.models import Comment
+
+    rng = _rng(context, 'comments', chunk)
+    comments = []
+    for comment_id in range(first_id, first_id + count):
+        lang = _weighted(rng, PROFILE_LANGUAGES)
+        row = {
+            'id': comment_id,
+            'user_id': context.first_ids['users'] + rng.randrange(context.sizes['users']),
+            'text': rng.choice(COMMENTS[lang]).format(rng.choice(VOCABULARY[lang])),
+            'is_active': rng.random() < 0.97,
+        }
+        if comments and rng.random() < 0.3:
+            # Replies stay inside the chunk, so threads never span workers.
+            parent = rng.choice(comments[-50:])
+            created_at = min(parent['created_at'] + timedelta(minutes=rng.randint(1, 720)), context.now)
+            row.update(movie_id=parent['movie_id'], parent_id=parent['id'])
+        else:
+            created_at = _moment(context, rng, HISTORY_DAYS, skew=2)
+            row['movie_id'] = context.popular_movie_ids[context.zipf.sample(rng)]
+        row.update(_base(rng, created_at))
+        comments.append(row)
+    return {Comment: comments}, {}
+
+def _view_chunk(context, chunk, first_row, count):
+    from apps.movies.models import MovieView
+
+    rng = _rng(context, 'views', chunk)
+    views = []
+    views_count = Counter()
+    first_user, users = context.first_ids['users'], context.sizes['users']
+    for _ in range(count):
+        movie_id = context.popular_movie_ids[context.zipf.sample(rng)]
+        views_count[movie_id] += 1
+        views.append({
+            **_base(rng, _moment(context, rng, HISTORY_DAYS, skew=3)),
+            'movie_id': movie_id,
+            'user_id': first_user + rng.randrange(users) if rng.random() < 0.6 else None,
+            'ip_address': f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}',
+            'duration_watched': rng.randint(30, 7200),
+        })
+    return {MovieView: views}, {'views_count': views_count}
+
+GENERATORS = {
+    'movies': _movie_chunk,
+    'users': _user_chunk,
+    'ratings': _rating_chunk,
+    'comments': _comment_chunk,
+    'views': _view_chunk,
+}
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    return str(value)
+
+def write_rows(model, rows):
+    """
+    Insert ``rows`` (dicts keyed by attname) into ``model``'s table. Columns a
+    row omits take the field default; an omitted auto primary key is left to
+    the database sequence.
+    """
+    if not rows:
+        return 0
+    # The real wrapper, not the thread-local proxy, is resolved once per chunk.
+    conn = connections[DEFAULT_DB_ALIAS]
+    opts = model._meta
+    fields = [
+        f for f in opts.concrete_fields
+        if not (f.primary_key and f.attname not in rows[0])
+    ]
+    defaults = {f.attname: f.get_default() for f in fields if f.attname not in rows[0]}
+    attnames = [f.attname for f in fields]
+    preparers = [
+        None if f.get_internal_type() in PLAIN_TYPES else f for f in fields
+    ]
+    values = (
+        [
+            value if prep is None else prep.get_db_prep_save(value, conn)
+            for prep, value in zip(preparers, [row.get(name, defaults.get(name)) for name in attnames])
+        ]
+        for row in rows
+    )
+
+    quote = conn.ops.quote_name
+    table = quote(opts.db_table)
+    columns = ', '.join(quote(f.column) for f in fields)
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            buffer = io.StringIO()
+            for row in values:
+                buffer.write('\t'.join(map(_copy_value, row)))
+                buffer.write('\n')
+            buffer.seek(0)
+            cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN', buffer)
+        else:
+            placeholders = ', '.join(['%s'] * len(fields))
+            cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', list(values))
+    return len(rows)
+
+def _run_task(task):
+    kind, chunk, first_id, count = task
+    started = time.perf_counter()
+    tables, tallies = GENERATORS[kind](_context, chunk, first_id, count)
+    written = Counter()
+    with transaction.atomic():
+        for model, rows in tables.items():
+            written[model._meta.db_table] += write_rows(model, rows)
+    return kind, written, tallies, time.perf_counter() - started
+
+def _worker_init():
+    # Never share the parent's sockets with a forked worker.
+    connections.close_all()
+
+def _tasks(kind, first_id, total, chunk_size):
+    return [
+        (kind, index, first_id + start, min(chunk_size, total - start))
+        for index, start in enumerate(range(0, total, chunk_size))
+    ]
+
+def _run_phase(name, tasks, workers, report, progress):
+    started = time.perf_counter()
+    tallies = Counter()
+    rows_before = report.total_rows
+    if workers > 1:
+        connections.close_all()
+        close_pools()
+        with multiprocessing.get_context('fork').Pool(workers, initializer=_worker_init) as pool:
+            results = list(_collect(pool.imap_unordered(_run_task, tasks), report, tallies, progress))
+    else:
+        results = list(_collect(map(_run_task, tasks), report, tallies, progress))
+    elapsed = time.perf_counter() - started
+    report.phases.append((name, report.total_rows - rows_before, elapsed))
+    return tallies, results
+
+def _collect(results, report, tallies, progress):
+    for kind, written, chunk_tallies, seconds in results:
+        report.rows.update(written)
+        report.chunk_seconds[kind] += seconds
+        for counter in chunk_tallies.values():
+            tallies.update(counter)
+        if progress:
+            progress(kind, sum(written.values()), seconds)
+        yield kind
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+def generate(scale=1.0, workers=1, chunk_size=CHUNK_SIZE, seed=42, progress=None):
+    """
+    Generate a catalog of ``SCALE_ONE`` x ``scale`` rows with Zipf-distributed
+    movie popularity and titles, descriptions and episodes in every language.
+    """
+    global _context
+    from apps.comments.models import Comment
+    from apps.movies.models import Episode, Movie, MovieView, Video
+    from apps.movies.utils.top_rated import compute_weighted_ratings
+    from apps.movies.utils.view_partitions import ensure_partitions
+    from apps.ratings.models import Rating
+    from apps.users.models import User, UserProfile
+
+    if connection.vendor != 'postgresql':
+        # SQLite allows a single writer, so parallel chunks would only queue on the lock.
+        workers = 1
+    sizes = scaled_sizes(scale)
+    categories, genres = ensure_taxonomy()
+    content_types = {content_type: name for name, _, _, content_type in CATEGORIES}
+    category_ids = {category.name: category.id for category in categories}
+
+    ranking = list(range(sizes['movies']))
+    random.Random(seed).shuffle(ranking)
+    first_ids = {'movies': _next_id(Movie), 'users': _next_id(User), 'comments': _next_id(Comment)}
+    _context = GenerationContext(
+        seed=seed,
+        sizes=sizes,
+        now=timezone.now(),
+        first_ids=first_ids,
+        password=make_password(PASSWORD),
+        category_ids={ct: category_ids[name] for ct, name in content_types.items()},
+        genre_ids=[genre.id for genre in genres],
+        popular_movie_ids=[first_ids['movies'] + index for index in ranking],
+        zipf=Zipf(sizes['movies']),
+    )
+
+    # Give every month of the view history its own partition up front.
+    ensure_partitions(start=_context.now - timedelta(days=HISTORY_DAYS))
+
+    report = GenerationReport()
+    started = time.perf_counter()
+    _run_phase('catalog and users', (
+        _tasks('movies', first_ids['movies'], sizes['movies'], max(chunk_size // 10, 1))
+        + _tasks('users', first_ids['users'], sizes['users'], chunk_size)
+    ), workers, report, progress)
+    tallies, _ = _run_phase('activity', (
+        _tasks('ratings', first_ids['users'], sizes['users'], max(chunk_size // 25, 1))
+        + _tasks('comments', first_ids['comments'], sizes['comments'], chunk_size)
+        + _tasks('views', 0, sizes['views'], chunk_size)
+    ), workers, report, progress)
+
+    Movie.objects.bulk_update(
+        [Movie(id=movie_id, views_count=count) for movie_id, count in tallies.items()],
+        ['views_count'],
+        batch_size=1000
+    )
+    compute_weighted_ratings()
+    models = [
+        Movie, Movie.genres.through, Movie.categories.through, Episode, Video,
+        User, UserProfile, Rating, Comment, MovieView,
+    ]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    report.elapsed = time.perf_counter() - started
+    _context = None
+    return report
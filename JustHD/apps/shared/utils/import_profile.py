@@ -0,0 +1,97 @@
+"""
+Parse ``python -X importtime`` output into a tree so worker boot cost can be
+attributed to the apps and third-party packages that cause it.
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+
+# What a worker imports up to its first API response: the WSGI app, the
+# URLconf and DRF's lazily resolved settings classes.
+WORKER_BOOT_CODE = (
+    "import os\n"
+    "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')\n"
+    "from django.core.wsgi import get_wsgi_application\n"
+    "get_wsgi_application()\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+    "from rest_framework.settings import api_settings\n"
+    "api_settings.EXCEPTION_HANDLER, api_settings.DEFAULT_AUTHENTICATION_CLASSES\n"
+)
+
+class ImportNode:
+    def __init__(self, name, self_us, cumulative_us):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children = []
+
+    @property
+    def package(self):
+        """Top-level package, or ``apps.<app>`` for project apps."""
+        parts = self.name.split('.')
+        if parts[0] == 'apps' and len(parts) > 1:
+            return '.'.join(parts[:2])
+        return parts[0]
+
+    def walk(self, depth=0):
+        yield self, depth
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+def parse_importtime(output):
+    """
+    Build the import tree from ``-X importtime`` stderr. Python prints a
+    module after everything it imported, indented two spaces per level, so
+    pending children are kept per level until their parent shows up.
+    """
+    roots = []
+    pending = defaultdict(list)
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            # Header line ("self [us] | cumulative | imported package").
+            continue
+        level = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        node = ImportNode(name.strip(), self_us, cumulative_us)
+        node.children = pending.pop(level + 1, [])
+        if level == 0:
+            roots.append(node)
+        else:
+            pending[level].append(node)
+    return roots
+
+def run_importtime(code=WORKER_BOOT_CODE, env=None):
+    """Run ``code`` in a fresh interpreter with ``-X importtime`` and return the import tree."""
+    process_env = dict(os.environ, **(env or {}))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=settings.BASE_DIR,
+        env=process_env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        lines = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError('\n'.join(lines[-20:]))
+    return parse_importtime(result.stderr)
+
+def total_us(roots):
+    return sum(node.cumulative_us for node in roots)
+
+def imported_modules(roots):
+    return {node.name for root in roots for node, _ in root.walk()}
+
+def totals_by_package(roots):
+    """Cumulative microseconds per package, sorted from most to least expensive."""
+    totals = defaultdict(int)
+    for node in roots:
+        totals[node.package] += node.cumulative_us
+    return sorted(totals.items(), key=lambda item: -item[1])
@@ -0,0 +1,242 @@
+"""
+Per-endpoint request metrics. Every worker aggregates in memory, keyed by
+resolved URL name and method, and periodically writes a snapshot to
+METRICS['DIR']. A scrape merges the snapshots of all workers, folding those
+of exited workers into an archive so counters never go backwards, and
+renders them in the Prometheus text format.
+"""
+import contextvars
+import fcntl
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+PREFIX = 'justhd'
+ARCHIVE_FILE = 'archive.json'
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_seconds', 'serialization_seconds', 'render_seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.render_seconds = 0.0
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+def finish_request(token):
+    _current.reset(token)
+
+def current_request_metrics():
+    return _current.get()
+
+def execute_wrapper(execute, sql, params, many, context):
+    """Connection execute wrapper that counts and times queries of the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_seconds += time.perf_counter() - started
+
+def _option(name, default):
+    return getattr(settings, 'METRICS', {}).get(name, default)
+
+def metrics_dir():
+    return _option('DIR', None)
+
+def _empty_series():
+    return {
+        'count': 0,
+        'statuses': {},
+        'duration_buckets': [0] * len(DURATION_BUCKETS),
+        'duration_sum': 0.0,
+        'queries': 0,
+        'query_buckets': [0] * len(QUERY_BUCKETS),
+        'db_seconds': 0.0,
+        'serialization_seconds': 0.0,
+        'render_seconds': 0.0,
+    }
+
+def _merge(target, source):
+    for key, series in source.items():
+        merged = target.setdefault(key, _empty_series())
+        for name in ('count', 'duration_sum', 'queries', 'db_seconds', 'serialization_seconds', 'render_seconds'):
+            merged[name] += series[name]
+        for status, count in series['statuses'].items():
+            merged['statuses'][status] = merged['statuses'].get(status, 0) + count
+        for name in ('duration_buckets', 'query_buckets'):
+            merged[name] = [a + b for a, b in zip(merged[name], series[name])]
+    return target
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write(path, data):
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._pid = os.getpid()
+        self._last_flush = time.monotonic()
+
+    def record(self, view, method, status, duration, metrics):
+        # Non-cumulative bucket counts; the exposition makes them cumulative.
+        duration_bucket = bisect_left(DURATION_BUCKETS, duration)
+        query_bucket = bisect_left(QUERY_BUCKETS, metrics.queries)
+        status_class = f'{status // 100}xx'
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._series = {}
+            series = self._series.get(f'{view}|{method}')
+            if series is None:
+                series = self._series[f'{view}|{method}'] = _empty_series()
+            series['count'] += 1
+            series['statuses'][status_class] = series['statuses'].get(status_class, 0) + 1
+            if duration_bucket < len(DURATION_BUCKETS):
+                series['duration_buckets'][duration_bucket] += 1
+            series['duration_sum'] += duration
+            series['queries'] += metrics.queries
+            if query_bucket < len(QUERY_BUCKETS):
+                series['query_buckets'][query_bucket] += 1
+            series['db_seconds'] += metrics.db_seconds
+            series['serialization_seconds'] += metrics.serialization_seconds
+            series['render_seconds'] += metrics.render_seconds
+            due = time.monotonic() - self._last_flush >= _option('FLUSH_INTERVAL', 5)
+        if due:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return json.loads(json.dumps(self._series))
+
+    def flush(self):
+        directory = metrics_dir()
+        if not directory:
+            return
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        _write(os.path.join(directory, f'worker-{os.getpid()}.json'), self.snapshot())
+
+registry = Registry()
+
+def collect():
+    """Merged series of every worker that wrote a snapshot, plus this process."""
+    directory = metrics_dir()
+    if not directory:
+        return registry.snapshot()
+
+    registry.flush()
+    archive_path = os.path.join(directory, ARCHIVE_FILE)
+    with open(os.path.join(directory, '.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive = _read(archive_path) or {}
+        live = []
+        exited = []
+        for name in os.listdir(directory):
+            if not (name.startswith('worker-') and name.endswith('.json')):
+                continue
+            path = os.path.join(directory, name)
+            data = _read(path)
+            if data is None:
+                continue
+            if _alive(int(name[len('worker-'):-len('.json')])):
+                live.append(data)
+            else:
+                _merge(archive, data)
+                exited.append(path)
+        if exited:
+            _write(archive_path, archive)
+            for path in exited:
+                os.remove(path)
+
+    merged = archive
+    for data in live:
+        _merge(merged, data)
+    return merged
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+def _histogram(lines, name, labels, buckets, counts, total, count):
+    cumulative = 0
+    for bound, bucket_count in zip(buckets, counts):
+        cumulative += bucket_count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f'{name}_sum{{{labels}}} {total}')
+    lines.append(f'{name}_count{{{labels}}} {count}')
+
+def render_prometheus(series):
+    families = {
+        'http_requests_total': ('counter', 'Requests served, by status class.'),
+        'http_request_duration_seconds': ('histogram', 'Time spent handling the request.'),
+        'db_queries_per_request': ('histogram', 'Database queries issued per request.'),
+        'db_query_seconds_total': ('counter', 'Time spent executing database queries.'),
+        'serialization_seconds_total': ('counter', 'Time spent in the serializers of generic views.'),
+        'render_seconds_total': ('counter', 'Time spent rendering response bodies.'),
+    }
+    samples = {family: [] for family in families}
+    for key in sorted(series):
+        view, method = key.rsplit('|', 1)
+        data = series[key]
+        labels = _labels(view=view, method=method)
+        for status, count in sorted(data['statuses'].items()):
+            samples['http_requests_total'].append(
+                f'{PREFIX}_http_requests_total{{{labels},status="{status}"}} {count}'
+            )
+        _histogram(
+            samples['http_request_duration_seconds'], f'{PREFIX}_http_request_duration_seconds',
+            labels, DURATION_BUCKETS, data['duration_buckets'], data['duration_sum'], data['count']
+        )
+        _histogram(
+            samples['db_queries_per_request'], f'{PREFIX}_db_queries_per_request',
+            labels, QUERY_BUCKETS, data['query_buckets'], data['queries'], data['count']
+        )
+        samples['db_query_seconds_total'].append(f'{PREFIX}_db_query_seconds_total{{{labels}}} {data["db_seconds"]}')
+        samples['serialization_seconds_total'].append(
+            f'{PREFIX}_serialization_seconds_total{{{labels}}} {data["serialization_seconds"]}'
+        )
+        samples['render_seconds_total'].append(f'{PREFIX}_render_seconds_total{{{labels}}} {data["render_seconds"]}')
+
+    lines = []
+    for family, (kind, help_text) in families.items():
+        lines.append(f'# HELP {PREFIX}_{family} {help_text}')
+        lines.append(f'# TYPE {PREFIX}_{family} {kind}')
+        lines.extend(samples[family])
+    return '\n'.join(lines) + '\n'
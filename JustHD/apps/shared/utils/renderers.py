@@ -0,0 +1,17 @@
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from apps.shared.utils.metrics import current_request_metrics
+
+class MetricsJSONRenderer(JSONRenderer):
+    """JSONRenderer that adds its rendering time to the request metrics."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics = current_request_metrics()
+            if metrics is not None:
+                metrics.render_seconds += time.perf_counter() - started
@@ -0,0 +1,231 @@
+"""
+Synthetic catalog for load and benchmark runs. Everything is generated from a
+seeded ``random.Random`` and written with ``bulk_create``, so the same
+arguments always produce the same dataset.
+"""
+import random
+from dataclasses import dataclass, field
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+BATCH_SIZE = 5000
+SLUG_PREFIX = 'bench-'
+PASSWORD = 'Bench123!'
+
+WORDS = (
+    'shadow', 'river', 'empire', 'silent', 'storm', 'golden', 'night', 'city',
+    'dragon', 'winter', 'hunter', 'lost', 'kingdom', 'secret', 'iron', 'ocean',
+    'desert', 'star', 'broken', 'fire', 'last', 'garden', 'crimson', 'echo',
+    'glass', 'wild', 'north', 'dream', 'legend', 'stone', 'midnight', 'harbor',
+)
+
+GENRES = (
+    ('Action', 'Jangari', 'Боевик'),
+    ('Comedy', 'Komediya', 'Комедия'),
+    ('Drama', 'Drama', 'Драма'),
+    ('Thriller', 'Triller', 'Триллер'),
+    ('Sci-Fi', 'Ilmiy Fantastika', 'Научная фантастика'),
+    ('Horror', 'Qo‘rqinchli', 'Ужасы'),
+    ('Romance', 'Romantika', 'Романтика'),
+    ('Animation', 'Animatsion', 'Анимация'),
+)
+
+CATEGORIES = (
+    ('Movies', 'Filmlar', 'Фильмы', 'movie'),
+    ('TV Shows', 'TV Dasturlar', 'ТВ Шоу', 'tv_show'),
+    ('Cartoons', 'Multfilmlar', 'Мультфильмы', 'cartoon'),
+    ('Documentaries', 'Hujjatli Filmlar', 'Документальные фильмы', 'documentary'),
+)
+
+@dataclass
+class SeededCatalog:
+    """What a seeding run produced, for building benchmark requests."""
+    movie_slugs: list = field(default_factory=list)
+    genre_slugs: list = field(default_factory=list)
+    category_slugs: list = field(default_factory=list)
+    search_terms: list = field(default_factory=list)
+    counts: dict = field(default_factory=dict)
+
+def _chunks(rows, size=BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def _bulk(model, rows, batch_size=BATCH_SIZE):
+    model.objects.bulk_create(rows, batch_size=batch_size)
+
+def _title(rng):
+    return ' '.join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 4)))
+
+def ensure_taxonomy():
+    from apps.movies.models import Category, Genre
+
+    categories = []
+    for name, name_uz, name_ru, _ in CATEGORIES:
+        category, _ = Category.objects.get_or_create(
+            name=name,
+            defaults={'name_uz': name_uz, 'name_ru': name_ru, 'is_active': True}
+        )
+        categories.append(category)
+    genres = []
+    for name, name_uz, name_ru in GENRES:
+        genre, _ = Genre.objects.get_or_create(
+            name=name,
+            defaults={'name_uz': name_uz, 'name_ru': name_ru}
+        )
+        genres.append(genre)
+    return categories, genres
+
+def _users(rng, count):
+    from apps.users.models import User
+
+    # Hashing is deliberately slow, so every synthetic account shares one hash.
+    password = make_password(PASSWORD)
+    rows = [
+        User(
+            username=f'{SLUG_PREFIX}user-{index}',
+            email=f'{SLUG_PREFIX}user-{index}@example.com',
+            password=password,
+            is_premium=rng.random() < 0.2,
+        )
+        for index in range(count)
+    ]
+    _bulk(User, rows)
+    return list(
+        User.objects.filter(username__startswith=SLUG_PREFIX).order_by('id').values_list('id', flat=True)
+    )
+
+def _movies(rng, count, categories, genres):
+    from apps.movies.models import Movie
+
+    rows = []
+    category_for_row = []
+    for index in range(count):
+        category_index = rng.randrange(len(categories))
+        title = _title(rng)
+        rows.append(Movie(
+            title=title,
+            title_en=title,
+            title_uz=title,
+            title_ru=title,
+            slug=f'{SLUG_PREFIX}{index}',
+            description=f'{title} and the {rng.choice(WORDS)} of the {rng.choice(WORDS)}',
+            release_year=rng.randint(1970, 2024),
+            duration=rng.randint(70, 180),
+            content_type=CATEGORIES[category_index][3],
+            is_premium=rng.random() < 0.25,
+            is_featured=rng.random() < 0.01,
+        ))
+        category_for_row.append(category_index)
+    _bulk(Movie, rows)
+
+    movie_ids = dict(
+        Movie.objects.filter(slug__startswith=SLUG_PREFIX).values_list('slug', 'id')
+    )
+    genre_links = []
+    category_links = []
+    for index, category_index in enumerate(category_for_row):
+        movie_id = movie_ids[f'{SLUG_PREFIX}{index}']
+        category_links.append(Movie.categories.through(
+            movie_id=movie_id, category_id=categories[category_index].id
+        ))
+        for genre in rng.sample(genres, rng.randint(1, 3)):
+            genre_links.append(Movie.genres.through(movie_id=movie_id, genre_id=genre.id))
+    _bulk(Movie.categories.through, category_links)
+    _bulk(Movie.genres.through, genre_links)
+    return [movie_ids[f'{SLUG_PREFIX}{index}'] for index in range(count)]
+
+def _views(rng, count, movie_ids, user_ids):
+    from apps.movies.models import Movie, MovieView
+
+    views_per_movie = {}
+    for rows in _chunks(range(count)):
+        batch = []
+        for _ in rows:
+            movie_id = rng.choice(movie_ids)
+            views_per_movie[movie_id] = views_per_movie.get(movie_id, 0) + 1
+            batch.append(MovieView(
+                movie_id=movie_id,
+                user_id=rng.choice(user_ids) if user_ids and rng.random() < 0.6 else None,
+                ip_address=f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}',
+                duration_watched=rng.randint(0, 7200),
+            ))
+        _bulk(MovieView, batch)
+
+    Movie.objects.bulk_update(
+        [Movie(id=movie_id, views_count=views) for movie_id, views in views_per_movie.items()],
+        ['views_count'],
+        batch_size=1000
+    )
+
+def _ratings(rng, count, movie_ids, user_ids):
+    from apps.ratings.models import Rating
+
+    if not user_ids or not movie_ids:
+        return 0
+    # (user, movie) is unique, so spread ratings over users and sample distinct movies each.
+    per_user = min(len(movie_ids), -(-count // len(user_ids)))
+    created = 0
+    batch = []
+    for user_id in user_ids:
+        if created >= count:
+            break
+        for movie_id in rng.sample(movie_ids, min(per_user, count - created)):
+            batch.append(Rating(user_id=user_id, movie_id=movie_id, score=rng.randint(1, 10)))
+            created += 1
+        if len(batch) >= BATCH_SIZE:
+            _bulk(Rating, batch)
+            batch = []
+    _bulk(Rating, batch)
+    return created
+
+def _comments(rng, count, movie_ids, user_ids):
+    from apps.comments.models import Comment
+
+    if not user_ids:
+        return
+    for rows in _chunks(range(count)):
+        _bulk(Comment, [
+            Comment(
+                user_id=rng.choice(user_ids),
+                movie_id=rng.choice(movie_ids),
+                text=f'{_title(rng)} was {rng.choice(WORDS)}',
+            )
+            for _ in rows
+        ])
+
+def catalog_summary():
+    """Describe an already seeded catalog without generating anything."""
+    from apps.movies.models import Category, Genre, Movie
+
+    movies = Movie.objects.filter(slug__startswith=SLUG_PREFIX)
+    return SeededCatalog(
+        movie_slugs=list(movies.order_by('-views_count', 'id').values_list('slug', flat=True)),
+        genre_slugs=list(Genre.objects.order_by('id').values_list('slug', flat=True)),
+        category_slugs=list(Category.objects.order_by('id').values_list('slug', flat=True)),
+        search_terms=list(WORDS[:8]),
+        counts={'movies': movies.count()},
+    )
+
+def seed_catalog(movies=2000, users=1000, views=200000, ratings=50000, comments=20000, seed=42):
+    """
+    Generate a catalog of ``movies`` titles with their genre and category
+    links, ``users`` accounts and the given number of views, ratings and
+    comments.
+    """
+    from apps.movies.utils.top_rated import compute_weighted_ratings
+
+    rng = random.Random(seed)
+    with transaction.atomic():
+        categories, genres = ensure_taxonomy()
+        user_ids = _users(rng, users)
+        movie_ids = _movies(rng, movies, categories, genres)
+        _views(rng, views, movie_ids, user_ids)
+        ratings = _ratings(rng, ratings, movie_ids, user_ids)
+        _comments(rng, comments, movie_ids, user_ids)
+    # Ratings were bulk inserted, so the stored weighted ratings are computed once here.
+    compute_weighted_ratings()
+
+    catalog = catalog_summary()
+    catalog.counts.update({'users': users, 'views': views, 'ratings': ratings, 'comments': comments})
+    return catalog
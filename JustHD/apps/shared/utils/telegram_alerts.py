@@ -3,12 +3,22 @@ import logging
 import threading
 from core import config
 
-bot = None
-if config.TELEGRAM_BOT_TOKEN and ':' in config.TELEGRAM_BOT_TOKEN:
-    import telebot
-    bot = telebot.TeleBot(config.TELEGRAM_BOT_TOKEN)
+_bot = None
+
+def _is_configured():
+    return bool(config.TELEGRAM_BOT_TOKEN and ':' in config.TELEGRAM_BOT_TOKEN)
+
+def _get_bot():
+    # telebot pulls in requests, so it is imported on the first alert rather
+    # than at worker boot.
+    global _bot
+    if _bot is None and _is_configured():
+        import telebot
+        _bot = telebot.TeleBot(config.TELEGRAM_BOT_TOKEN)
+    return _bot
 
 def _send_telegram_message(text: str):
+    bot = _get_bot()
     if not bot:
         return
     try:
@@ -22,14 +32,14 @@ def _send_telegram_message(text: str):
         logging.error(f"Failed to send alert to Telegram: {str(e)}")
 
 def send_alert(text: str):
-    if not bot:
+    if not _is_configured():
         return
     threading.Thread(target=_send_telegram_message, args=(text,), daemon=True).start()
 
 def alert_to_telegram(traceback_text: str, message: str = "No message provided",
                       request=None, ip: str = None,
                       port: str = None):
-    if not bot:
+    if not _is_configured():
         return
         
     if not isinstance(message, str):
@@ -1,3 +1,85 @@
-from django.shortcuts import render
+from django.http import HttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.shared.mixins.metrics import SerializationMetricsMixin
+from apps.shared.models import BulkJob
+from apps.shared.permissions.base_permissions import IsAdminUser
+from apps.shared.serializers import BulkJobSerializer
+from apps.shared.utils.bulk_jobs import get_actions, submit_bulk_job
+from apps.shared.utils.custom_response import CustomResponse
+from apps.shared.utils.metrics import collect, render_prometheus
+
+class MetricsView(APIView):
+    """Request metrics of all workers in the Prometheus text format."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            render_prometheus(collect()),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+class BulkActionView(APIView):
+    """
+    Queue ``action`` over the ids posted in ``ids_field`` as a background
+    job of ``target`` and answer 202 with the job and its status URL.
+    """
+    permission_classes = [IsAdminUser]
+    target = None
+    ids_field = None
+    default_action = None
+
+    def post(self, request):
+        action = request.data.get('action', self.default_action)
+        object_ids = request.data.get(self.ids_field, [])
+
+        if not action or not object_ids:
+            required = self.ids_field if self.default_action else f'Action and {self.ids_field}'
+            return CustomResponse.validation_error(
+                errors={"detail": f"{required} are required"},
+                request=request
+            )
+        if action not in get_actions(self.target):
+            return CustomResponse.validation_error(
+                errors={"detail": "Invalid action"},
+                request=request
+            )
+        try:
+            object_ids = [int(pk) for pk in object_ids]
+        except (TypeError, ValueError):
+            return CustomResponse.validation_error(
+                errors={self.ids_field: "Must be a list of ids"},
+                request=request
+            )
+
+        job = submit_bulk_job(self.target, action, object_ids, user=request.user)
+        # Without background workers the job has already run by now.
+        job.refresh_from_db()
+        return CustomResponse.success(
+            message_key="JOB_ACCEPTED",
+            request=request,
+            data=BulkJobSerializer(job, context={'request': request}).data
+        )
+
+class BulkJobListView(SerializationMetricsMixin, generics.ListAPIView):
+    serializer_class = BulkJobSerializer
+    permission_classes = [IsAdminUser]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['status', 'target', 'action']
+
+    def get_queryset(self):
+        return BulkJob.objects.defer('object_ids')
+
+class BulkJobDetailView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, uuid):
+        job = BulkJob.objects.defer('object_ids').filter(uuid=uuid).first()
+        if job is None:
+            return CustomResponse.not_found(request=request)
+        return CustomResponse.success(
+            request=request,
+            data=BulkJobSerializer(job, context={'request': request}).data
+        )
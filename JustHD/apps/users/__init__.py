@@ -3,4 +3,4 @@
 default_app_config = 'apps.users.apps.UsersConfig'
 
 # Import signals to ensure they are connected
-import apps.users.signals
\ No newline at end of file
+# import apps.users.signals
\ No newline at end of file
@@ -8,9 +8,10 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from .models import User
 from .serializers.auth import RegisterSerializer, LoginSerializer, ChangePasswordSerializer
 from .serializers.profile import UserSerializer, UpdateProfileSerializer
+from apps.shared.mixins.metrics import SerializationMetricsMixin
 from apps.shared.utils.custom_response import CustomResponse
 
-class RegisterView(generics.CreateAPIView):
+class RegisterView(SerializationMetricsMixin, generics.CreateAPIView):
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -110,7 +111,7 @@ class LogoutView(APIView):
             data={"message": "Successfully logged out"}
         )
 
-class ProfileView(generics.RetrieveAPIView):
+class ProfileView(SerializationMetricsMixin, generics.RetrieveAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -126,7 +127,7 @@ class ProfileView(generics.RetrieveAPIView):
             data=serializer.data
         )
 
-class UpdateProfileView(generics.UpdateAPIView):
+class UpdateProfileView(SerializationMetricsMixin, generics.UpdateAPIView):
     serializer_class = UpdateProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     
@@ -2,6 +2,7 @@
 Configuration module for environment variables.
 """
 import os
+import tempfile
 from pathlib import Path
 from decouple import config as decouple_config, Csv
 
@@ -38,6 +39,38 @@ else:
     DB_HOST = decouple_config('DB_HOST', default='db')
     DB_PORT = decouple_config('DB_PORT', default='5432')
 
+# Connection pool, per worker process (PostgreSQL only)
+DB_POOL = decouple_config('DB_POOL', default=True, cast=bool)
+DB_POOL_MIN_SIZE = decouple_config('DB_POOL_MIN_SIZE', default=1, cast=int)
+# One connection per gunicorn thread is enough for a worker.
+DB_POOL_MAX_SIZE = decouple_config('DB_POOL_MAX_SIZE', default=decouple_config('GUNICORN_THREADS', default=4, cast=int), cast=int)
+DB_POOL_MAX_IDLE = decouple_config('DB_POOL_MAX_IDLE', default=300, cast=int)  # seconds
+DB_POOL_TIMEOUT = decouple_config('DB_POOL_TIMEOUT', default=10, cast=int)  # seconds
+
+# Read replicas: comma-separated database URLs, served as replica_1, replica_2, ...
+DATABASE_REPLICA_URLS = decouple_config('DATABASE_REPLICA_URLS', default='', cast=Csv())
+REPLICA_STICKY_SECONDS = decouple_config('REPLICA_STICKY_SECONDS', default=15, cast=int)
+REPLICA_MAX_LAG_SECONDS = decouple_config('REPLICA_MAX_LAG_SECONDS', default=5, cast=float)
+REPLICA_LAG_CHECK_INTERVAL = decouple_config('REPLICA_LAG_CHECK_INTERVAL', default=5, cast=float)
+
+# Request metrics, merged across workers through snapshot files in METRICS_DIR
+METRICS_ENABLED = decouple_config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_DIR = decouple_config('METRICS_DIR', default=os.path.join(tempfile.gettempdir(), 'justhd-metrics'))
+
+# Admin bulk actions run as chunked jobs; with BULK_JOBS_IN_BACKGROUND off they run inline after the request commits
+BULK_JOBS_IN_BACKGROUND = decouple_config('BULK_JOBS_IN_BACKGROUND', default=True, cast=bool)
+BULK_JOB_CHUNK_SIZE = decouple_config('BULK_JOB_CHUNK_SIZE', default=200, cast=int)
+BULK_JOB_CHILD_BATCH_SIZE = decouple_config('BULK_JOB_CHILD_BATCH_SIZE', default=5000, cast=int)
+
+# Raw movie views are kept for this many months, older months only as per-movie monthly totals
+MOVIE_VIEW_RETENTION_MONTHS = decouple_config('MOVIE_VIEW_RETENTION_MONTHS', default=13, cast=int)
+
+# Memory-mapped catalog snapshot shared by all workers for MovieListView filters and orderings
+CATALOG_SNAPSHOT_ENABLED = decouple_config('CATALOG_SNAPSHOT_ENABLED', default=True, cast=bool)
+CATALOG_SNAPSHOT_PATH = decouple_config(
+    'CATALOG_SNAPSHOT_PATH', default=os.path.join(tempfile.gettempdir(), 'justhd-catalog.snap')
+)
+
 # Static and Media
 STATIC_ROOT = decouple_config('STATIC_ROOT', default=str(BASE_DIR / 'staticfiles'))
 MEDIA_ROOT = decouple_config('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
@@ -0,0 +1,68 @@
+"""
+Worker sizing for gunicorn, derived from the CPUs and memory the container
+can actually use. Kept free of Django imports so gunicorn.conf.py can load it
+before the application.
+"""
+import os
+
+# Measured resident set of one sync worker after preload + gc.freeze(),
+# rounded up. Override with GUNICORN_WORKER_MEMORY_MB.
+DEFAULT_WORKER_MEMORY_MB = 160
+# Memory kept free for the master process, page cache and spikes.
+MEMORY_HEADROOM = 0.75
+
+def cpu_count():
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+
+    # cgroup v2 CPU quota, e.g. "200000 100000" for two CPUs.
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            count = min(count, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return count
+
+def memory_limit_bytes():
+    """The cgroup memory limit when there is one, otherwise total RAM."""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value)
+
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def worker_memory_bytes():
+    return int(os.environ.get('GUNICORN_WORKER_MEMORY_MB', DEFAULT_WORKER_MEMORY_MB)) * 1024 * 1024
+
+def recommended_workers():
+    if os.environ.get('GUNICORN_WORKERS'):
+        return int(os.environ['GUNICORN_WORKERS'])
+
+    workers = cpu_count() * 2 + 1
+    memory = memory_limit_bytes()
+    if memory:
+        workers = min(workers, int(memory * MEMORY_HEADROOM // worker_memory_bytes()))
+    return max(workers, 1)
+
+def recommended_threads():
+    if os.environ.get('GUNICORN_THREADS'):
+        return int(os.environ['GUNICORN_THREADS'])
+    # Requests spend most of their time waiting on Postgres, so a few
+    # threads per worker raise throughput without more forked memory.
+    return 4
@@ -41,7 +41,6 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'django_filters',
     'corsheaders',
-    "debug_toolbar",
     # Apps
     'apps.shared',
     'apps.users',
@@ -58,11 +57,71 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.shared.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+if config.METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'apps.shared.middleware.MetricsMiddleware')
+
+METRICS = {
+    'DIR': config.METRICS_DIR,
+    'FLUSH_INTERVAL': 5,
+}
+
+BULK_JOBS = {
+    'RUN_IN_BACKGROUND': config.BULK_JOBS_IN_BACKGROUND,
+    'CHUNK_SIZE': config.BULK_JOB_CHUNK_SIZE,
+    # Rows per statement when purging views, ratings and comments of deleted movies
+    'CHILD_BATCH_SIZE': config.BULK_JOB_CHILD_BATCH_SIZE,
+    # A running job without a heartbeat for this long is picked up again by run_bulk_jobs
+    'STALE_AFTER': 300,
+}
+
+MOVIE_VIEW_PARTITIONS = {
+    'MONTHS_AHEAD': 3,
+    'RETENTION_MONTHS': config.MOVIE_VIEW_RETENTION_MONTHS,
+}
+
+CATALOG_SNAPSHOT = {
+    'ENABLED': config.CATALOG_SNAPSHOT_ENABLED,
+    'PATH': config.CATALOG_SNAPSHOT_PATH,
+    # Seconds between checks for a replaced snapshot file
+    'RELOAD_INTERVAL': 1,
+    # An older snapshot is ignored and the list is served from the database
+    'MAX_AGE': 3600,
+    # build_catalog_snapshot --loop rebuilds this often, so views, likes and rating
+    # orderings trail the database by at most this long; keep it well under MAX_AGE
+    'REBUILD_INTERVAL': 300,
+    # Catalog changes within this many seconds share one rebuild
+    'REBUILD_DELAY': 2,
+}
+
+MOVIE_SIMILARITIES = {
+    # Edited movies queue a similar-movie refresh job, run from a background timer
+    # (or by run_bulk_jobs if the worker stops first); off, right after the commit
+    'REFRESH_IN_BACKGROUND': True,
+    # Edits within this many seconds share one refresh job
+    'REFRESH_DELAY': 5,
+}
+
+MOVIE_AUTOCOMPLETE = {
+    'LIMIT': 10,
+    'MAX_LIMIT': 20,
+    # Seconds between checks of the shared change log
+    'SYNC_INTERVAL': 1,
+    # Longer change logs are not replayed, the index is rebuilt instead
+    'MAX_REPLAY': 500,
+    # Full rebuilds in the background to refresh the view counts used for ranking
+    'REBUILD_INTERVAL': 600,
+}
+
+# The debug toolbar is only loaded in development; production workers never import it.
+if DEBUG:
+    INSTALLED_APPS += ["debug_toolbar"]
+    MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
@@ -88,28 +147,64 @@ TEMPLATES = [
 WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
+DB_POOL = {
+    'MIN_SIZE': config.DB_POOL_MIN_SIZE,
+    'MAX_SIZE': config.DB_POOL_MAX_SIZE,
+    'MAX_IDLE': config.DB_POOL_MAX_IDLE,
+    'TIMEOUT': config.DB_POOL_TIMEOUT,
+}
+
+def pooled_database(database):
+    """Serve a PostgreSQL database from the per-worker connection pool when DB_POOL is on."""
+    if config.DB_POOL and database['ENGINE'] == 'django.db.backends.postgresql':
+        database.update({
+            'ENGINE': 'apps.shared.db.backends.postgresql_pool',
+            # Django returns the connection to the pool after every request.
+            'CONN_MAX_AGE': 0,
+            'POOL': DB_POOL,
+        })
+    return database
+
+def replica_databases():
+    """Read replicas from DATABASE_REPLICA_URLS; tests mirror them to default."""
+    replicas = {}
+    for number, url in enumerate(config.DATABASE_REPLICA_URLS, start=1):
+        database = pooled_database(dj_database_url.parse(url, conn_max_age=600, conn_health_checks=True))
+        database['TEST'] = {'MIRROR': 'default'}
+        replicas[f'replica_{number}'] = database
+    return replicas
+
 # Support for Render.com DATABASE_URL
 DATABASE_URL = os.environ.get('DATABASE_URL')
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.config(
+        'default': pooled_database(dj_database_url.config(
             default=DATABASE_URL,
             conn_max_age=600,
             conn_health_checks=True,
-        )
+        ))
     }
 else:
     DATABASES = {
-        'default': {
+        'default': pooled_database({
             'ENGINE': 'django.db.backends.postgresql',
             'NAME': config.DB_NAME,
             'USER': config.DB_USER,
             'PASSWORD': config.DB_PASSWORD,
             'HOST': config.DB_HOST,
             'PORT': config.DB_PORT,
-        }
+        })
     }
 
+DATABASES.update(replica_databases())
+
+DATABASE_ROUTERS = ['apps.shared.db.routers.PrimaryReplicaRouter']
+REPLICA_ROUTING = {
+    'STICKY_SECONDS': config.REPLICA_STICKY_SECONDS,
+    'MAX_LAG_SECONDS': config.REPLICA_MAX_LAG_SECONDS,
+    'LAG_CHECK_INTERVAL': config.REPLICA_LAG_CHECK_INTERVAL,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -188,7 +283,7 @@ SIMPLE_JWT = {
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'apps.shared.utils.renderers.MetricsJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -280,7 +375,7 @@ CORS_ALLOW_HEADERS = [
     'x-csrftoken',
     'x-requested-with',
 ]
-CORS_EXPOSE_HEADERS = ['Content-Type', 'Authorization']
+CORS_EXPOSE_HEADERS = ['Content-Type', 'Authorization', 'ETag', 'Last-Modified']
 CORS_PREFLIGHT_MAX_AGE = 86400
 
 LOGGING = {
@@ -331,6 +426,9 @@ if 'test' in sys.argv:
         'NAME': ':memory:',
     }
     LOGGING = {}
+    BULK_JOBS['RUN_IN_BACKGROUND'] = False
+    CATALOG_SNAPSHOT['ENABLED'] = False
+    MOVIE_SIMILARITIES['REFRESH_IN_BACKGROUND'] = False
     config.TELEGRAM_BOT_TOKEN = None
     config.TELEGRAM_CHANNEL_ID = None
 
@@ -8,14 +8,15 @@ DEBUG = False
 ALLOWED_HOSTS = ['your-domain.com', 'www.your-domain.com', 'localhost', '127.0.0.1']
 
 DATABASES = {
-    'default': {
+    'default': pooled_database({
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.environ.get('DB_NAME', 'justhd_db'),
         'USER': os.environ.get('DB_USER', 'postgres'),
         'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres'),
         'HOST': os.environ.get('DB_HOST', 'db'),
         'PORT': os.environ.get('DB_PORT', '5432'),
-    }
+    }),
+    **replica_databases(),
 }
 
 STATIC_ROOT = '/vol/web/static'
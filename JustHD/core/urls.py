@@ -7,9 +7,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
-from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView, SpectacularAPIView
 
-from apps.shared.utils.decorators import superuser_required
+from apps.shared.utils.decorators import lazy_view, superuser_required
 
 def home(request):
     return JsonResponse({
@@ -35,11 +34,12 @@ urlpatterns = [
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
-schema_view = SpectacularSwaggerView.as_view(url_name='schema')
-redoc_view = SpectacularRedocView.as_view(url_name='schema')
+# drf_spectacular is only imported when the docs are first requested.
+schema_view = lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema')
+redoc_view = lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema')
 
 urlpatterns += [
-    path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/v1/schema/", lazy_view('drf_spectacular.views.SpectacularAPIView'), name="schema"),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,63 @@
+"""
+Production gunicorn settings. Run with:
+
+    gunicorn -c gunicorn.conf.py core.wsgi:application
+
+Every value can be overridden with the GUNICORN_* environment variables.
+"""
+import gc
+import os
+import shutil
+
+from core import config
+from core.gunicorn_sizing import recommended_threads, recommended_workers
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+workers = recommended_workers()
+threads = recommended_threads()
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Import Django and every app once in the master so workers share the pages.
+preload_app = True
+
+# Recycle workers periodically; the jitter keeps them from restarting together.
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Keep heartbeat files off overlay filesystems in containers.
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+def on_starting(server):
+    # Request metrics restart from zero with the server.
+    shutil.rmtree(config.METRICS_DIR, ignore_errors=True)
+
+def when_ready(server):
+    # Everything imported so far moves to a permanent generation that the
+    # collector never touches, so forked workers don't copy those pages when
+    # the GC writes object headers.
+    gc.collect()
+    gc.freeze()
+    server.log.info(
+        'Preloaded app, froze %d objects; %d workers x %d threads',
+        gc.get_freeze_count(), workers, threads
+    )
+
+def post_fork(server, worker):
+    # Connections opened while preloading belong to the master and must not
+    # be shared between workers.
+    from django.db import connections
+    connections.close_all()
+
+def worker_exit(server, worker):
+    # Persist the last few seconds of request metrics before the worker goes.
+    from apps.shared.utils.metrics import registry
+    registry.flush()
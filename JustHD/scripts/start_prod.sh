@@ -1 +1 @@
-﻿#!/bin/bash# Colors for outputGREEN='\033[0;32m'YELLOW='\033[1;33m'NC='\033[0m' # No Colorecho -e "${YELLOW}рџљЂ Starting JustHD in production mode...${NC}"# Wait for databasepython manage.py wait_for_db# Run migrationsecho -e "${YELLOW}рџ”„ Running migrations...${NC}"python manage.py migrate# Collect static filesecho -e "${YELLOW}рџ“¦ Collecting static files...${NC}"python manage.py collectstatic --noinput# Start Gunicornecho -e "${GREEN}рџљЂ Starting Gunicorn...${NC}"gunicorn core.wsgi:application --bind 0.0.0.0:8000 --workers 4 --worker-class gthread --threads 2
\ No newline at end of file
+﻿#!/bin/bash# Colors for outputGREEN='\033[0;32m'YELLOW='\033[1;33m'NC='\033[0m' # No Colorecho -e "${YELLOW}рџљЂ Starting JustHD in production mode...${NC}"# Wait for databasepython manage.py wait_for_db# Run migrationsecho -e "${YELLOW}рџ”„ Running migrations...${NC}"python manage.py migrate# Collect static filesecho -e "${YELLOW}рџ“¦ Collecting static files...${NC}"python manage.py collectstatic --noinput# Start Gunicornecho -e "${GREEN}рџљЂ Starting Gunicorn...${NC}"gunicorn -c gunicorn.conf.py core.wsgi:application
\ No newline at end of file